@@ -0,0 +1,55 @@
+from robustsecretsharing import rss
+import asyncio
+import functools
+
+
+async def reconstruct_authenticated_secret(players, reconstruction_threshold, max_secret_length, fetches, timeout=None):
+    '''
+    Robust reconstruction from shares fetched concurrently from their holders
+    Every fetch is started at once and its share is added to an rss.Reconstructor as soon as it arrives,
+    so the secret is decided by the fastest sufficient quorum, after which the outstanding fetches are cancelled
+    Args:
+        players, the list of unique string ids for all players passed to rss.share_authenticated_secret
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        fetches, a map of player string ids to awaitables (such as coroutines) that produce that player's robust share string
+            a fetch that fails or times out is treated as a player who never responded
+        timeout, an optional number of seconds to wait for each fetch
+    Returns:
+        the tuple returned by rss.reconstruct_authenticated_secret
+        cancelling the reconstruction cancels the outstanding fetches
+    Raises:
+        ValueError, a player in fetches is not one of the players
+        rss.FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+    '''
+    if any(player not in players for player in fetches):
+        raise ValueError("unknown player")
+    if not fetches:  # no shares can arrive
+        raise rss.FatalReconstructionFailure()
+
+    loop = asyncio.get_running_loop()
+    reconstructor = rss.Reconstructor(players, reconstruction_threshold, max_secret_length)
+    outcome = loop.create_future()
+    tasks = {player: loop.create_task(asyncio.wait_for(fetch, timeout)) for player, fetch in fetches.items()}
+
+    def on_fetched(player, task):
+        if outcome.done():
+            return
+        if not task.cancelled() and task.exception() is None:
+            reconstructor.add_share(player, task.result())
+        if not reconstructor.decided and all(other.done() for other in tasks.values()):
+            reconstructor.finish()  # every holder has responded, failed or timed out
+
+        if reconstructor.decided:
+            try:
+                outcome.set_result(reconstructor.result())
+            except rss.FatalReconstructionFailure as failure:
+                outcome.set_exception(failure)
+
+    for player, task in tasks.items():
+        task.add_done_callback(functools.partial(on_fetched, player))
+    try:
+        return await outcome
+    finally:
+        for task in tasks.values():
+            task.cancel()
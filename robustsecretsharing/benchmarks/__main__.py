@@ -0,0 +1,60 @@
+'''
+Run the benchmark suite and gate on regressions against a stored baseline
+
+    python -m robustsecretsharing.benchmarks run --output baseline.json
+    python -m robustsecretsharing.benchmarks run --output current.json
+    python -m robustsecretsharing.benchmarks compare baseline.json current.json
+'''
+from robustsecretsharing.benchmarks import cases, runner
+import argparse
+import sys
+
+
+def _run(args):
+    sweep = cases.QUICK_SWEEP if args.quick else cases.FULL_SWEEP
+    run_results = runner.run(cases.get_cases(sweep, args.filter), args.repeats, args.min_time, sys.stdout)
+    runner.save(run_results, args.output)
+    return 0
+
+
+def _compare(args):
+    baseline, current = runner.load(args.baseline), runner.load(args.current)
+    comparisons = runner.compare(baseline, current, args.alpha, args.tolerance)
+    regressions = 0
+    for case_id, ratio, p_value, regressed in comparisons:
+        regressions += regressed
+        sys.stdout.write("%-96s %6.3fx  p=%.4f%s\n" % (case_id, ratio, p_value, "  REGRESSION" if regressed else ""))
+    missing = runner.get_missing_cases(baseline, current)
+    for case_id in missing:
+        sys.stdout.write("%-96s MISSING\n" % case_id)
+    sys.stdout.write("%d of %d cases regressed, %d missing\n" % (regressions, len(comparisons), len(missing)))
+    return 1 if regressions or missing else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m robustsecretsharing.benchmarks")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True  # not the default on Python 3
+
+    run = subparsers.add_parser("run", help="time every case and store the samples as a JSON baseline")
+    run.add_argument("--output", required=True, help="the JSON file to write")
+    run.add_argument("--quick", action="store_true", help="cover a single configuration instead of the full sweep")
+    run.add_argument("--filter", help="only run cases whose id contains this substring")
+    run.add_argument("--repeats", type=int, default=runner.DEFAULT_REPEATS, help="timing samples per case")
+    run.add_argument("--min-time", type=float, default=runner.DEFAULT_MIN_TIME, help="minimum seconds per sample")
+    run.set_defaults(function=_run)
+
+    compare = subparsers.add_parser("compare", help="exit with status 1 if any case is significantly slower or missing")
+    compare.add_argument("baseline", help="the JSON baseline")
+    compare.add_argument("current", help="the JSON run to check")
+    compare.add_argument("--alpha", type=float, default=runner.DEFAULT_ALPHA, help="significance level")
+    compare.add_argument("--tolerance", type=float, default=runner.DEFAULT_TOLERANCE,
+                         help="relative slowdown that is never reported")
+    compare.set_defaults(function=_compare)
+
+    args = parser.parse_args(argv)
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
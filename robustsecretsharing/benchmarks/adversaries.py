@@ -0,0 +1,97 @@
+'''
+Robust share sets under parameterized adversary strategies, for timing reconstruction in the worst case as well as
+the honest one
+
+Every strategy has the largest number of cheaters that robust reconstruction tolerates (reconstruction_threshold - 1),
+so reconstruction always recovers the secret, but the work it takes to do so depends on how the cheaters behave
+'''
+from robustsecretsharing import rss
+from robustsecretsharing.schemes import authentication
+import json
+import os
+
+STRATEGIES = ["honest", "corrupt_shares", "corrupt_keys", "corrupt_vectors", "collusion", "garbage"]
+GARBAGE = ['{"share": ', '[' * 10000, '{"share": 1%s}' % ('0' * 100000), '{"keys": {}, "vectors": {}}']  # cycled
+
+
+def _corrupt_shares(robust_shares, cheaters, honest, max_secret_length):
+    '''
+    Each cheater sends a share off the sharing polynomial, which no honest verifier authenticates
+    '''
+    for cheater in cheaters:
+        robust_shares[cheater]["share"] += 1
+
+
+def _corrupt_keys(robust_shares, cheaters, honest, max_secret_length):
+    '''
+    Each cheater holds keys that authenticate no share, so its verified set is empty
+    '''
+    for cheater in cheaters:
+        keys = robust_shares[cheater]["keys"]
+        for player in keys:
+            keys[player] += 1
+
+
+def _corrupt_vectors(robust_shares, cheaters, honest, max_secret_length):
+    '''
+    Cheater i corrupts its vectors for the honest verifiers whose index has bit i set, so that as many honest verifiers
+    as possible see distinct verified sets, and each distinct set is interpolated separately
+    '''
+    for bit, cheater in enumerate(cheaters):
+        for index, verifier in enumerate(honest):
+            if index >> bit & 1:
+                robust_shares[cheater]["vectors"][verifier][1] += 1
+
+
+def _collude(robust_shares, cheaters, honest, max_secret_length):
+    '''
+    The cheaters replace their shares and authenticate each other's replacements, so that every cheater verifies a set
+    of shares that passes authentication but does not lie on a single polynomial
+    '''
+    for cheater in cheaters:
+        robust_shares[cheater]["share"] //= 2
+        for verifier in cheaters:
+            key, vector = authentication.generate_check_vector(robust_shares[cheater]["share"], max_secret_length + 1)
+            robust_shares[verifier]["keys"][cheater] = key
+            robust_shares[cheater]["vectors"][verifier] = list(vector)
+
+
+STRATEGY_FUNCTIONS = {"corrupt_shares": _corrupt_shares, "corrupt_keys": _corrupt_keys,
+                      "corrupt_vectors": _corrupt_vectors, "collusion": _collude}
+
+
+def make_shares(strategy, num_players, reconstruction_threshold, max_secret_length):
+    '''
+    Args:
+        strategy, one of STRATEGIES
+        num_players, the number of players to share across
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the length of the random secret to share
+    Returns:
+        a tuple of
+            the random bytestring secret
+            the list of player ids
+            a dictionary of player ids to serialized robust shares, of which reconstruction_threshold - 1 are
+            those of cheaters who follow the strategy
+    Raises:
+        ValueError, the strategy is unknown or the players cannot outnumber the cheaters
+    '''
+    if strategy not in STRATEGIES:
+        raise ValueError("unknown adversary strategy: %s" % strategy)
+    if num_players < 2 * reconstruction_threshold - 1:
+        raise ValueError("the honest players must be able to outvote the cheaters")
+
+    secret = os.urandom(max_secret_length)
+    players = ["player%d" % i for i in range(num_players)]
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+    cheaters, honest = players[:reconstruction_threshold - 1], players[reconstruction_threshold - 1:]
+
+    if strategy == "garbage":
+        for index, cheater in enumerate(cheaters):
+            shares_map[cheater] = GARBAGE[index % len(GARBAGE)]
+    elif strategy != "honest":
+        robust_shares = {player: json.loads(shares_map[player]) for player in players}
+        STRATEGY_FUNCTIONS[strategy](robust_shares, cheaters, honest, max_secret_length)
+        for cheater in cheaters:
+            shares_map[cheater] = json.dumps(robust_shares[cheater])
+    return secret, players, shares_map
@@ -0,0 +1,125 @@
+from robustsecretsharing import rss
+from robustsecretsharing.benchmarks import adversaries
+from robustsecretsharing.crypto_tools import polynomials, primes, serialization
+from robustsecretsharing.schemes import authentication, pairing, sss
+import os
+
+# the largest secret, in bytes, whose robust shares fit in the largest (4423-bit) field once the conversion
+# to an integer and the robust layer have each added a byte
+MAX_SECRET_LENGTH = 4423 // 8 - 2
+
+FULL_SWEEP = {"num_players": [3, 5, 10], "thresholds": ["min", "majority"], "secret_lengths": [16, 128, MAX_SECRET_LENGTH],
+              "adversaries": adversaries.STRATEGIES}
+QUICK_SWEEP = {"num_players": [5], "thresholds": ["majority"], "secret_lengths": [32], "adversaries": adversaries.STRATEGIES}
+
+
+def _get_threshold(num_players, threshold):
+    '''
+    Returns:
+        the reconstruction threshold named by threshold ("min" or "majority") for num_players players
+    '''
+    return 2 if threshold == "min" else num_players // 2 + 1
+
+
+def _case_id(name, params):
+    '''
+    Returns:
+        a readable id for the case of the named function with the given parameters, such as name[length=32,n=5,t=3]
+    '''
+    return name + "[" + ",".join("%s=%s" % (key, params[key]) for key in sorted(params)) + "]"
+
+
+def _counted(function):
+    '''
+    Marks a function of an optional stats dictionary as one whose work counters the runner records
+    '''
+    function.counts_work = True
+    return function
+
+
+def _sss_cases(num_players, reconstruction_threshold, secret_length):
+    '''
+    Yields:
+        tuples of (function name, function of no arguments to time) for standard Shamir secret sharing
+    '''
+    secret = os.urandom(secret_length)
+    shares = sss.share_secret(num_players, reconstruction_threshold, secret_length, secret)
+    yield "sss.share_secret", lambda: sss.share_secret(num_players, reconstruction_threshold, secret_length, secret)
+    yield "sss.reconstruct_secret", lambda: sss.reconstruct_secret(num_players, secret_length, shares[:reconstruction_threshold])
+
+
+def _rss_cases(num_players, reconstruction_threshold, secret_length):
+    '''
+    Yields:
+        tuples of (function name, function of no arguments to time) for robust secret sharing
+    '''
+    secret = os.urandom(secret_length)
+    players = ["player%d" % i for i in range(num_players)]
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, secret_length, secret)
+    yield "rss.share_authenticated_secret", \
+        lambda: rss.share_authenticated_secret(players, reconstruction_threshold, secret_length, secret)
+    yield "rss.reconstruct_authenticated_secret", _counted(
+        lambda stats=None: rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, secret_length,
+                                                                shares_map, stats=stats))
+    yield "rss.reconstruct_error_corrected_secret", \
+        lambda: rss.reconstruct_error_corrected_secret(num_players, reconstruction_threshold, secret_length, shares_map)
+
+
+def _primitive_cases(num_players, reconstruction_threshold, secret_length):
+    '''
+    Yields:
+        tuples of (function name, function of no arguments to time) for the primitives beneath robust secret sharing
+    '''
+    secret_int = serialization.convert_bytestring_to_int(os.urandom(secret_length))
+    points = sss._share_secret_int(num_players, reconstruction_threshold, secret_length + 1, secret_int)
+    share = pairing.elegant_pair(*points[-1])
+    prime = primes.get_prime_by_bitlength(max(num_players.bit_length(), (secret_length + 1) * 8))
+    yield "authentication.generate_batch", lambda: authentication.generate_batch(num_players, share, secret_length + 1)
+    yield "pairing.elegant_unpair", lambda: pairing.elegant_unpair(share)
+    yield "polynomials.interpolate", lambda: polynomials.interpolate(points[:reconstruction_threshold], prime)(0)
+
+
+def _adversary_cases(num_players, reconstruction_threshold, secret_length, strategy):
+    '''
+    Yields:
+        tuples of (function name, function of an optional stats dictionary to time) for robust reconstruction
+        of the shares built by adversaries.make_shares for the strategy, eagerly and lazily
+        nothing when the players cannot outnumber reconstruction_threshold - 1 cheaters
+    '''
+    if num_players < 2 * reconstruction_threshold - 1:
+        return
+    _, _, shares_map = adversaries.make_shares(strategy, num_players, reconstruction_threshold, secret_length)
+    yield "rss.reconstruct_authenticated_secret", _counted(
+        lambda stats=None: rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, secret_length,
+                                                                shares_map, stats=stats))
+    yield "rss.reconstruct_authenticated_secret_lazy", _counted(
+        lambda stats=None: rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, secret_length,
+                                                                shares_map, lazy=True, stats=stats))
+
+
+def get_cases(sweep, pattern=None):
+    '''
+    Args:
+        sweep, a dictionary of the lists of num_players, thresholds ("min" or "majority") and secret_lengths to cover,
+            and optionally of the adversaries.STRATEGIES to reconstruct under (see FULL_SWEEP and QUICK_SWEEP)
+        pattern, an optional substring that the ids of the returned cases must contain
+    Returns:
+        a sorted list of tuples of (case id, dictionary of parameters, function of no arguments to time)
+    '''
+    cases = {}
+    for num_players in sweep["num_players"]:
+        for reconstruction_threshold in sorted({_get_threshold(num_players, threshold) for threshold in sweep["thresholds"]}):
+            for secret_length in sweep["secret_lengths"]:
+                params = {"n": num_players, "t": reconstruction_threshold, "length": secret_length}
+                for make_cases in (_sss_cases, _rss_cases, _primitive_cases):
+                    for name, function in make_cases(num_players, reconstruction_threshold, secret_length):
+                        case_id = _case_id(name, params)
+                        if pattern is None or pattern in case_id:
+                            cases[case_id] = (case_id, params, function)
+                for strategy in sweep.get("adversaries", []):
+                    adversary_params = dict(params, adversary=strategy)
+                    for name, function in _adversary_cases(num_players, reconstruction_threshold, secret_length, strategy):
+                        case_id = _case_id(name, adversary_params)
+                        if pattern is None or pattern in case_id:
+                            cases[case_id] = (case_id, adversary_params, function)
+    return [cases[case_id] for case_id in sorted(cases)]
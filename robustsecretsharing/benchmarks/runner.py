@@ -0,0 +1,129 @@
+from robustsecretsharing.benchmarks import stats
+import json
+import platform
+import sys
+import timeit
+
+DEFAULT_REPEATS = 7  # timing samples per case
+DEFAULT_MIN_TIME = 0.05  # seconds that each sample runs its case for at least
+DEFAULT_ALPHA = 0.01  # significance level of the regression test
+DEFAULT_TOLERANCE = 0.05  # relative slowdown that is never reported as a regression
+
+
+def measure(function, repeats=DEFAULT_REPEATS, min_time=DEFAULT_MIN_TIME):
+    '''
+    Args:
+        function, a function of no arguments
+        repeats, the number of timing samples to take
+        min_time, the minimum number of seconds each sample should take
+    Returns:
+        a list of repeats samples of the seconds taken by one call of function,
+        each averaged over enough calls to take at least min_time
+    '''
+    timer = timeit.Timer(function)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return [seconds / number for seconds in timer.repeat(repeats, number)]
+
+
+def count_work(function):
+    '''
+    Args:
+        function, a function of no arguments, marked with counts_work if it also takes an optional stats dictionary
+    Returns:
+        the counters of the work done by a single call of function, or None if it does not count its work
+    '''
+    if not getattr(function, "counts_work", False):
+        return None
+    work = {}
+    function(stats=work)
+    return work
+
+
+def _format_work(work):
+    '''
+    Returns:
+        the counters of work as a string to follow the time of a case in a progress report
+    '''
+    if not work:
+        return ""
+    return "  " + " ".join("%s=%d" % (name, work[name]) for name in sorted(work))
+
+
+def run(cases, repeats=DEFAULT_REPEATS, min_time=DEFAULT_MIN_TIME, stream=None):
+    '''
+    Args:
+        cases, a list of tuples as returned by cases.get_cases
+        repeats, min_time, see measure
+        stream, an optional file to report progress to
+    Returns:
+        a dictionary with the environment of the run and, under "results",
+        a dictionary of case ids to their parameters and timing samples
+        (and, for cases that count their work, the counters of a single call under "work")
+    '''
+    results = {}
+    for case_id, params, function in cases:
+        samples = measure(function, repeats, min_time)
+        results[case_id] = {"params": params, "samples": samples}
+        work = count_work(function)
+        if work is not None:
+            results[case_id]["work"] = work
+        if stream is not None:
+            stream.write("%-96s %12.1f us%s\n" % (case_id, stats.mean(samples) * 1e6, _format_work(work)))
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "results": results}
+
+
+def save(run_results, path):
+    '''
+    Writes a run as returned by run to path as JSON, to serve as a baseline for compare
+    '''
+    with open(path, "w") as stream:
+        json.dump(run_results, stream, indent=2, sort_keys=True)
+
+
+def load(path):
+    '''
+    Returns:
+        the run saved at path by save
+    Raises:
+        ValueError, the file is not a saved run
+    '''
+    with open(path, "r") as stream:
+        run_results = json.load(stream)
+    if not isinstance(run_results, dict) or not isinstance(run_results.get("results"), dict):
+        raise ValueError("not a benchmark results file: %s" % path)
+    return run_results
+
+
+def compare(baseline, current, alpha=DEFAULT_ALPHA, tolerance=DEFAULT_TOLERANCE):
+    '''
+    Args:
+        baseline, a run as returned by run or load
+        current, a run as returned by run or load
+        alpha, the significance level below which a slowdown is considered real
+        tolerance, the relative slowdown below which a case is never reported
+    Returns:
+        a sorted list of tuples of (case id, ratio of current to baseline mean time, one-sided p-value, regressed)
+        for every case in both runs, where regressed is True if current is significantly slower (by Welch's t-test)
+    '''
+    comparisons = []
+    for case_id in sorted(set(baseline["results"]) & set(current["results"])):
+        baseline_samples = baseline["results"][case_id]["samples"]
+        current_samples = current["results"][case_id]["samples"]
+        ratio = stats.mean(current_samples) / stats.mean(baseline_samples)
+        _, _, p_value = stats.welch_t_test(baseline_samples, current_samples)
+        comparisons.append((case_id, ratio, p_value, ratio > 1 + tolerance and p_value < alpha))
+    return comparisons
+
+
+def get_missing_cases(baseline, current):
+    '''
+    Args:
+        baseline, a run as returned by run or load
+        current, a run as returned by run or load
+    Returns:
+        a sorted list of the ids of cases in baseline that current did not time (because they crashed, were renamed
+        or were filtered out), which compare cannot check for regressions
+    '''
+    return sorted(set(baseline["results"]) - set(current["results"]))
@@ -0,0 +1,82 @@
+import math
+
+
+def mean(samples):
+    '''
+    Returns:
+        the arithmetic mean of a nonempty list of samples
+    '''
+    return sum(samples) / float(len(samples))
+
+
+def variance(samples):
+    '''
+    Returns:
+        the unbiased sample variance of samples (zero for a single sample)
+    '''
+    if len(samples) < 2:
+        return 0.0
+    center = mean(samples)
+    return sum((sample - center) ** 2 for sample in samples) / (len(samples) - 1)
+
+
+def _betacf(a, b, x, iterations=200, epsilon=3e-16):
+    '''
+    Returns:
+        the continued fraction of the regularized incomplete beta function, evaluated with the modified Lentz method
+    '''
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, iterations + 1):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= d * c
+        if abs(d * c - 1.0) < epsilon:
+            break
+    return result
+
+
+def betainc(a, b, x):
+    '''
+    Returns:
+        the regularized incomplete beta function I_x(a, b) for 0 <= x <= 1
+
+    See Press et al., "Numerical Recipes", section 6.4
+    '''
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1.0 - x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(baseline, current):
+    '''
+    Args:
+        baseline, a list of at least two timing samples
+        current, a list of at least two timing samples
+    Returns:
+        a tuple of (t statistic, degrees of freedom, one-sided p-value)
+        where the p-value is the probability of a t statistic at least this large if current is not slower than baseline
+    '''
+    variance_baseline = variance(baseline) / len(baseline)
+    variance_current = variance(current) / len(current)
+    standard_error = math.sqrt(variance_baseline + variance_current)
+    difference = mean(current) - mean(baseline)
+    if standard_error == 0.0:
+        return (float("inf") if difference > 0 else 0.0), float("inf"), (0.0 if difference > 0 else 1.0)
+
+    t = difference / standard_error
+    df = (variance_baseline + variance_current) ** 2 / \
+        (variance_baseline ** 2 / max(len(baseline) - 1, 1) + variance_current ** 2 / max(len(current) - 1, 1))
+    tail = 0.5 * betainc(df / 2.0, 0.5, df / (df + t * t))  # the probability of exceeding |t|
+    return t, df, (tail if t > 0 else 1.0 - tail)
@@ -0,0 +1,128 @@
+from robustsecretsharing import rss
+from robustsecretsharing.benchmarks import adversaries, cases, runner, stats, __main__ as benchmarks
+import pytest
+
+
+def test_betainc_edges():
+    assert stats.betainc(2.0, 3.0, 0.0) == 0.0
+    assert stats.betainc(2.0, 3.0, 1.0) == 1.0
+    assert stats.betainc(1.0, 1.0, 0.3) == pytest.approx(0.3)  # the uniform distribution
+    assert stats.betainc(2.0, 3.0, 0.4) == pytest.approx(0.5248)
+
+
+def test_welch_t_test_critical_values():
+    # samples with equal variances and sizes reduce to Student's t-test with 2n - 2 degrees of freedom
+    baseline = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    spread = stats.variance(baseline)
+    shift = 2.228 * (2 * spread / len(baseline)) ** 0.5  # the two-sided 5% critical value for 10 degrees of freedom
+    t, df, p_value = stats.welch_t_test(baseline, [sample + shift for sample in baseline])
+    assert t == pytest.approx(2.228) and df == pytest.approx(10)
+    assert p_value == pytest.approx(0.025, abs=1e-4)
+
+    _, _, p_value = stats.welch_t_test([sample + shift for sample in baseline], baseline)
+    assert p_value == pytest.approx(0.975, abs=1e-4)
+
+
+def test_welch_t_test_no_variance():
+    assert stats.welch_t_test([1.0, 1.0], [2.0, 2.0])[2] == 0.0
+    assert stats.welch_t_test([1.0, 1.0], [1.0, 1.0])[2] == 1.0
+
+
+def make_run(samples_by_case):
+    return {"results": {case_id: {"params": {}, "samples": samples} for case_id, samples in samples_by_case.items()}}
+
+
+def test_compare():
+    baseline = make_run({"fast": [1.0, 1.01, 0.99, 1.0], "slow": [1.0, 1.01, 0.99, 1.0],
+                         "noisy": [1.0, 2.0, 0.5, 1.5], "removed": [1.0, 1.0]})
+    current = make_run({"fast": [0.5, 0.51, 0.49, 0.5], "slow": [1.5, 1.51, 1.49, 1.5],
+                        "noisy": [1.2, 2.2, 0.7, 1.7], "added": [1.0, 1.0]})
+    comparisons = {case_id: (ratio, regressed) for case_id, ratio, _, regressed in runner.compare(baseline, current)}
+    assert sorted(comparisons) == ["fast", "noisy", "slow"]
+    assert comparisons["fast"] == (pytest.approx(0.5), False)
+    assert comparisons["slow"] == (pytest.approx(1.5), True)
+    assert comparisons["noisy"][1] is False  # slower on average, but not significantly
+    assert runner.get_missing_cases(baseline, current) == ["removed"]
+
+
+def test_cases_cover_sweep():
+    case_ids = [case_id for case_id, _, _ in cases.get_cases(cases.FULL_SWEEP, "length=16,n=5,")]
+    # every benchmarked function at both thresholds, and eager and lazy reconstruction under every adversary
+    assert len(case_ids) == 8 * 2 + 2 * len(adversaries.STRATEGIES) * 2
+    assert "rss.reconstruct_authenticated_secret[length=16,n=5,t=2]" in case_ids
+    assert "rss.reconstruct_authenticated_secret_lazy[adversary=collusion,length=16,n=5,t=3]" in case_ids
+
+    # ten players cannot outnumber the five cheaters of a threshold of six
+    assert not cases.get_cases(cases.FULL_SWEEP, "adversary=honest,length=16,n=10,t=6")
+
+
+def test_largest_field_cases_run():
+    sweep = {"num_players": [3], "thresholds": ["min"], "secret_lengths": [cases.MAX_SECRET_LENGTH]}
+    for _, _, function in cases.get_cases(sweep):
+        function()
+
+
+def test_run_save_compare(tmpdir):
+    baseline_path, current_path = str(tmpdir.join("baseline.json")), str(tmpdir.join("current.json"))
+    for path in (baseline_path, current_path):
+        assert benchmarks.main(["run", "--quick", "--filter", "pairing", "--repeats", "3", "--min-time", "0.001",
+                                "--output", path]) == 0
+
+    baseline = runner.load(baseline_path)
+    assert list(baseline["results"]) == ["pairing.elegant_unpair[length=32,n=5,t=3]"]
+    assert len(baseline["results"]["pairing.elegant_unpair[length=32,n=5,t=3]"]["samples"]) == 3
+    assert benchmarks.main(["compare", baseline_path, current_path, "--tolerance", "10"]) == 0
+
+    current = runner.load(current_path)
+    current["results"] = {}  # as if the case had crashed or been filtered out
+    runner.save(current, current_path)
+    assert benchmarks.main(["compare", baseline_path, current_path, "--tolerance", "10"]) == 1
+
+
+def test_no_command():
+    with pytest.raises(SystemExit) as excinfo:
+        benchmarks.main([])
+    assert excinfo.value.code == 2
+
+
+def test_load_not_results(tmpdir):
+    path = tmpdir.join("other.json")
+    path.write("[1, 2, 3]")
+    with pytest.raises(ValueError):
+        runner.load(str(path))
+
+
+@pytest.mark.parametrize("strategy", adversaries.STRATEGIES)
+def test_adversaries_are_tolerated(strategy):
+    secret, players, shares_map = adversaries.make_shares(strategy, 7, 3, 16)
+    recovered_secret, valid_players, _ = rss.reconstruct_authenticated_secret(7, 3, 16, shares_map)
+    assert recovered_secret == secret
+    assert sorted(valid_players) == sorted(players if strategy in ("honest", "corrupt_keys", "corrupt_vectors") else players[2:])
+
+
+def test_adversary_work():
+    work = {}
+    for strategy in ("honest", "corrupt_vectors", "garbage"):
+        _, _, shares_map = adversaries.make_shares(strategy, 7, 3, 16)
+        work[strategy] = {}
+        rss.reconstruct_authenticated_secret(7, 3, 16, shares_map, stats=work[strategy])
+    assert work["honest"]["interpolations"] == 1
+    assert work["corrupt_vectors"]["interpolations"] == 4  # the five honest verifiers see four distinct sets
+    assert work["garbage"]["mac_checks"] == 5 * 5
+
+
+def test_bad_adversary():
+    with pytest.raises(ValueError):
+        adversaries.make_shares("bribery", 5, 3, 16)
+    with pytest.raises(ValueError):
+        adversaries.make_shares("honest", 4, 3, 16)
+
+
+def test_run_counts_work():
+    adversary_cases = cases.get_cases(cases.QUICK_SWEEP, "adversary=corrupt_vectors")
+    assert len(adversary_cases) == 2
+    run_results = runner.run(adversary_cases, repeats=2, min_time=0.001)
+    for case_id, _, _ in adversary_cases:
+        assert run_results["results"][case_id]["work"]["mac_checks"] > 0
+    assert "work" not in runner.run(cases.get_cases(cases.QUICK_SWEEP, "pairing"), repeats=2, min_time=0.001)["results"][
+        "pairing.elegant_unpair[length=32,n=5,t=3]"]
@@ -0,0 +1,433 @@
+from robustsecretsharing import rss
+import argparse
+import collections
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+CHUNK_SIZE = 32  # bytes of input shared as each secret
+BATCH_SIZE = 256  # chunks handed to a worker at a time
+SHARE_FILE_SUFFIX = ".shares"
+SHARE_FILE_MODE = 0o600  # share files are readable by their owner only
+
+
+class Report(object):
+    '''
+    Accumulates the time spent in each phase of a command and the number of bytes processed
+    '''
+
+    def __init__(self):
+        self.timings = {}
+        self.num_bytes = 0
+        self._start = time.time()
+
+    def timed(self, phase, iterable):
+        '''
+        Args:
+            phase, the name of the phase to charge the time spent producing each item to
+            iterable, any iterable
+        Returns:
+            an iterator over iterable
+            time already charged to another phase while producing an item (such as reading its input) is not charged twice
+        '''
+        iterator = iter(iterable)
+        while True:
+            start, charged = time.time(), sum(self.timings.values())
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                nested = sum(self.timings.values()) - charged
+                self.add_time(phase, time.time() - start - nested)
+            yield item
+
+    def add_time(self, phase, seconds):
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def write(self, stream):
+        '''
+        Writes the throughput, per-phase timing and peak memory of the command to stream
+        '''
+        elapsed = time.time() - self._start
+        stream.write("processed %d bytes in %.3f s (%.1f bytes/s)\n" %
+                     (self.num_bytes, elapsed, self.num_bytes / elapsed if elapsed > 0 else 0.0))
+        for phase, seconds in sorted(self.timings.items()):
+            stream.write("  %-12s %.3f s\n" % (phase, seconds))
+        stream.write("peak memory: %s\n" % _get_peak_memory())
+
+
+def _get_peak_memory():
+    '''
+    Returns:
+        a description of the peak resident memory of this process and its workers
+    '''
+    if resource is None:
+        return "unavailable"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024  # reported in bytes rather than kilobytes
+    return "%d KiB" % peak
+
+
+def _read_chunks(stream, chunk_size):
+    '''
+    Yields:
+        successive bytestrings of at most chunk_size bytes read from stream
+    '''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _batches(iterable, batch_size):
+    '''
+    Yields:
+        successive lists of at most batch_size items of iterable
+    '''
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _share_batch(args):
+    '''
+    Args:
+        args, a tuple of (players, reconstruction_threshold, chunk_size, list of bytestring chunks)
+    Returns:
+        a dictionary of player ids to the list of that player's serialized robust shares, one for each chunk
+    Raises:
+        ValueError, the chunks could not be dealt to every player
+    '''
+    players, reconstruction_threshold, chunk_size, chunks = args
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, chunk_size, chunks)
+    shares = {player: [json.dumps(robust_share) for robust_share in json.loads(bundle)] for player, bundle in bundles.items()}
+    if sorted(shares) != sorted(players) or any(len(robust_shares) != len(chunks) for robust_shares in shares.values()):
+        raise ValueError("a batch of %d chunks was not dealt to every player" % len(chunks))
+    return shares
+
+
+def _reconstruct_batch(args):
+    '''
+    Args:
+        args, a tuple of (number of players, reconstruction_threshold, chunk_size, list of maps of player ids to shares)
+    Returns:
+        a list parallel to the maps of the tuples returned by rss.reconstruct_authenticated_secret, or None on failure
+    '''
+    num_players, reconstruction_threshold, chunk_size, shares_maps = args
+    results = []
+    for shares_map in shares_maps:
+        try:
+            results.append(rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, chunk_size, shares_map))
+        except rss.FatalReconstructionFailure:
+            results.append(None)
+    return results
+
+
+def _map(function, items, workers):
+    '''
+    Yields:
+        function applied to each of items in order, computed by a pool of worker processes if workers > 1
+        at most two items per worker are in flight at once, so items are read only as fast as they are processed
+    '''
+    if workers <= 1:
+        for item in items:
+            yield function(item)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        pending = collections.deque()
+        for item in items:
+            pending.append(pool.apply_async(function, (item,)))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def _open_share_file(path):
+    '''
+    Returns:
+        path opened for writing, created or truncated with SHARE_FILE_MODE regardless of the umask
+    '''
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SHARE_FILE_MODE)
+    if hasattr(os, "fchmod"):  # an existing file keeps its mode through os.open
+        os.fchmod(fd, SHARE_FILE_MODE)
+    return os.fdopen(fd, "w")
+
+
+def _share(args, report):
+    '''
+    Streams the input file in chunks to one share file per player in args.out_dir
+    if any chunk cannot be dealt, the share files are removed rather than left holding part of the input
+    '''
+    players = args.players.split(",")
+    if len(set(players)) != len(players):
+        raise ValueError("player ids must be unique")
+    if not os.path.isdir(args.out_dir):
+        os.makedirs(args.out_dir)
+
+    outputs, complete = {}, False  # share file paths to a tuple of (player id, open file)
+    try:
+        for player in players:
+            path = os.path.join(args.out_dir, player + SHARE_FILE_SUFFIX)
+            outputs[path] = player, _open_share_file(path)
+            header = {"player": player, "players": players, "threshold": args.threshold, "chunk_size": args.chunk_size}
+            outputs[path][1].write(json.dumps(header) + "\n")
+
+        with open(args.input, "rb") as stream:
+            def jobs():
+                for batch in _batches(report.timed("read", _read_chunks(stream, args.chunk_size)), args.batch_size):
+                    report.num_bytes += sum(len(chunk) for chunk in batch)
+                    yield players, args.threshold, args.chunk_size, batch
+
+            for shares in report.timed("share", _map(_share_batch, jobs(), args.workers)):
+                start = time.time()
+                for player, output in outputs.values():
+                    output.writelines(robust_share + "\n" for robust_share in shares[player])
+                report.add_time("write", time.time() - start)
+        complete = True
+    finally:
+        for path, (_, output) in outputs.items():
+            output.close()
+            if not complete:
+                os.remove(path)
+    return 0
+
+
+def _read_header(stream):
+    '''
+    Returns:
+        a tuple of (the player id a share file claims, the rest of the header) read from the first line of stream
+    Raises:
+        ValueError, the header is malformed
+    '''
+    try:
+        header = json.loads(stream.readline())
+        player = header.pop("player")
+        hash(player)  # the id must be usable as a dictionary key
+        players, threshold, chunk_size = header["players"], header["threshold"], header["chunk_size"]
+        valid = (isinstance(players, list) and len(set(players)) == len(players) and
+                 isinstance(threshold, int) and isinstance(chunk_size, int) and threshold > 0 and chunk_size > 0)
+    except (ValueError, KeyError, TypeError, AttributeError):
+        valid = False
+    if not valid:
+        raise ValueError("malformed header")
+    return player, header
+
+
+def _read_share_files(paths):
+    '''
+    Args:
+        paths, the share files written by the share command
+    Returns:
+        a tuple of (the header shared by the most files, a dictionary of player ids to open files positioned after the header)
+        a file is skipped, and named on stderr, if its header is malformed or differs from the agreed one,
+        if it claims a player id that is not one of the players, or if another file claims the same id
+    Raises:
+        ValueError, no header is shared by more files than any other and by at least its threshold of files
+    '''
+    groups, skipped = collections.defaultdict(list), []  # serialized headers to lists of (path, player id, open file)
+    for path in paths:
+        stream = open(path, "r")
+        try:
+            player, header = _read_header(stream)
+        except ValueError as error:
+            stream.close()
+            skipped.append((path, str(error)))
+            continue
+        groups[json.dumps(header, sort_keys=True)].append((path, player, stream))
+
+    counts = sorted((len(files), key) for key, files in groups.items())
+    agreed = counts[-1][1] if counts and (len(counts) == 1 or counts[-2][0] < counts[-1][0]) else None
+    if agreed is not None and counts[-1][0] < json.loads(agreed)["threshold"]:
+        agreed = None
+
+    streams, claims = {}, collections.Counter(player for _, player, _ in groups.get(agreed, []))
+    header = json.loads(agreed) if agreed is not None else None
+    for key, files in groups.items():
+        for path, player, stream in files:
+            if key != agreed:
+                skipped.append((path, "header differs from the one shared by the most files"))
+            elif player not in header["players"]:
+                skipped.append((path, "unknown player id %s" % player))
+            elif claims[player] > 1:
+                skipped.append((path, "player id %s is claimed by several files" % player))
+            else:
+                streams[player] = stream
+                continue
+            stream.close()
+
+    for path, reason in skipped:
+        sys.stderr.write("skipping share file %s: %s\n" % (path, reason))
+    if header is None:
+        raise ValueError("no header is shared by at least its threshold of share files")
+    return header, streams
+
+
+def _iter_shares_maps(streams):
+    '''
+    Yields:
+        for each chunk, a map of player ids to that player's serialized robust share
+        a player whose file ends early is missing from the maps of the remaining chunks
+    '''
+    while True:
+        shares_map = {}
+        for player, stream in streams.items():
+            line = stream.readline()
+            if line:
+                shares_map[player] = line.rstrip("\n")
+        if not shares_map:
+            return
+        yield shares_map
+
+
+def _reconstruct(args, report, output=None):
+    '''
+    Reconstructs the original file from the given share files, writing it to output if one is given
+    Returns:
+        0 if every chunk was reconstructed, 1 otherwise
+    '''
+    header, streams = _read_share_files(args.share_files)
+    num_players, threshold, chunk_size = len(header["players"]), header["threshold"], header["chunk_size"]
+
+    failures, invalid_players = 0, set()
+    try:
+        jobs = ((num_players, threshold, chunk_size, shares_maps) for shares_maps in
+                _batches(report.timed("read", _iter_shares_maps(streams)), args.batch_size))
+        for batch in report.timed("reconstruct", _map(_reconstruct_batch, jobs, args.workers)):
+            start = time.time()
+            for result in batch:
+                if result is None:
+                    failures += 1
+                    continue
+                secret, _, invalid = result
+                invalid_players.update(invalid)
+                report.num_bytes += len(secret)
+                if output is not None:
+                    output.write(secret)
+            report.add_time("write", time.time() - start)
+    finally:
+        for stream in streams.values():
+            stream.close()
+
+    if invalid_players:
+        sys.stderr.write("players with malformed shares: %s\n" % ", ".join(sorted(invalid_players)))
+    if failures:
+        sys.stderr.write("%d chunks could not be reconstructed\n" % failures)
+        return 1
+    return 0
+
+
+def _reconstruct_command(args, report):
+    with open(args.output, "wb") as output:
+        return _reconstruct(args, report, output)
+
+
+def _verify_command(args, report):
+    return _reconstruct(args, report)
+
+
+def _bench(args, report):
+    '''
+    Shares and reconstructs args.size random bytes in memory, reporting the throughput of each direction
+    '''
+    players = ["player%d" % i for i in range(args.num_players)]
+    data = os.urandom(args.size)
+    chunks = [data[start:start + args.chunk_size] for start in range(0, len(data), args.chunk_size)]
+    report.num_bytes = len(data)
+
+    start = time.time()
+    jobs = ((players, args.threshold, args.chunk_size, batch) for batch in _batches(chunks, args.batch_size))
+    shares = list(_map(_share_batch, jobs, args.workers))
+    report.add_time("share", time.time() - start)
+
+    start = time.time()
+    jobs = ((len(players), args.threshold, args.chunk_size,
+             [dict(zip(players, robust_shares)) for robust_shares in zip(*[batch[player] for player in players])])
+            for batch in shares)
+    recovered = [result and result[0] for batch in _map(_reconstruct_batch, jobs, args.workers) for result in batch]
+    report.add_time("reconstruct", time.time() - start)
+
+    if None in recovered or b"".join(recovered) != data:
+        sys.stderr.write("reconstructed data does not match\n")
+        return 1
+    return 0
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(prog="rss", description="Robust secret sharing of files")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True  # not the default on Python 3
+
+    def add_common(subparser):
+        subparser.add_argument("--workers", type=int, default=1, help="number of worker processes")
+        subparser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="chunks per unit of work")
+
+    share = subparsers.add_parser("share", help="share a file into one share file per player")
+    share.add_argument("input", help="the file to share")
+    share.add_argument("--players", required=True, help="comma-separated unique player ids")
+    share.add_argument("--threshold", type=int, required=True, help="the number of shares needed for reconstruction")
+    share.add_argument("--out-dir", required=True, help="the directory for the share files")
+    share.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes of input per secret")
+    add_common(share)
+    share.set_defaults(function=_share)
+
+    reconstruct = subparsers.add_parser("reconstruct", help="reconstruct a file from share files")
+    reconstruct.add_argument("share_files", nargs="+", help="the share files to reconstruct from")
+    reconstruct.add_argument("--output", required=True, help="the file to write")
+    add_common(reconstruct)
+    reconstruct.set_defaults(function=_reconstruct_command)
+
+    verify = subparsers.add_parser("verify", help="check that share files reconstruct, without writing the file")
+    verify.add_argument("share_files", nargs="+", help="the share files to check")
+    add_common(verify)
+    verify.set_defaults(function=_verify_command)
+
+    bench = subparsers.add_parser("bench", help="measure sharing and reconstruction throughput in memory")
+    bench.add_argument("--num-players", type=int, default=5, help="the number of players")
+    bench.add_argument("--threshold", type=int, default=3, help="the number of shares needed for reconstruction")
+    bench.add_argument("--size", type=int, default=64 * 1024, help="bytes of random data to share")
+    bench.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="bytes of input per secret")
+    add_common(bench)
+    bench.set_defaults(function=_bench)
+    return parser
+
+
+def main(argv=None):
+    '''
+    Entry point of the rss console script
+    Args:
+        argv, the command line arguments (sys.argv[1:] by default)
+    Returns:
+        the exit status of the command
+    '''
+    args = _get_parser().parse_args(argv)
+    report = Report()
+    try:
+        status = args.function(args, report)
+    except (ValueError, IOError, OSError) as error:
+        sys.stderr.write("rss: error: %s\n" % error)
+        return 2
+    report.write(sys.stderr)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+'''
+Backends for the big-integer field arithmetic of polynomials, authentication and pairing
+
+A backend converts integers into its own representation with integer(value), which supports the usual
+arithmetic operators and mixes freely with ints, and provides inverse(k, prime) and isqrt(value), which return ints.
+Values in a backend's representation never leave the module that created them: results are converted with int()
+
+BACKEND is selected once, at import: gmpy2 when it can be imported and the pure Python implementation otherwise,
+unless the environment variable named by BACKEND_VARIABLE names one of them
+'''
+import math
+import os
+
+BACKEND_VARIABLE = "RSS_ARITHMETIC_BACKEND"
+
+
+def _egcd(a, b):
+    '''
+    Implements the extended euclidean algorithm
+    Returns:
+        the tuple (g, x, y), such that ax + by = g = gcd(a, b)
+    '''
+    if a == 0:
+        return b, 0, 1
+    else:
+        g, y, x = _egcd(b % a, a)
+        return g, x - (b // a) * y, y
+
+
+def _has_native_inverse():
+    '''
+    Returns:
+        True if pow computes modular inverses from a negative exponent (Python 3.8 and later)
+    '''
+    try:
+        return pow(2, -1, 3) == 2
+    except (TypeError, ValueError):
+        return False
+
+
+_NATIVE_INVERSE = _has_native_inverse()
+_NATIVE_ISQRT = hasattr(math, 'isqrt')  # exact integer square roots (Python 3.8 and later)
+
+
+def _newton_isqrt(value):
+    '''
+    Returns:
+        floor(sqrt(value)) for a nonnegative integer value, by Newton's method from an overestimate
+    Raises:
+        ValueError, value is negative
+    '''
+    if value < 0:
+        raise ValueError("square root of a negative number")
+    if value == 0:
+        return 0
+    root = 1 << ((value.bit_length() + 1) // 2)
+    while True:
+        estimate = (root + value // root) // 2
+        if estimate >= root:
+            return root
+        root = estimate
+
+
+class PythonBackend(object):
+    '''
+    Field arithmetic on the interpreter's own integers
+    '''
+    name = "python"
+
+    def integer(self, value):
+        return value
+
+    def inverse(self, k, prime):
+        '''
+        Returns:
+            the inverse mod of k within the field defined by the prime, or 0 if k is a multiple of the prime
+        '''
+        k = k % prime
+        if _NATIVE_INVERSE and k:
+            return pow(k, -1, prime)
+        return (prime + _egcd(prime, k)[2]) % prime
+
+    def isqrt(self, value):
+        '''
+        Returns:
+            floor(sqrt(value)) for a nonnegative integer value
+        Raises:
+            ValueError, value is negative
+        '''
+        if _NATIVE_ISQRT:
+            return math.isqrt(value)
+        return _newton_isqrt(value)
+
+
+class GMPBackend(object):
+    '''
+    Field arithmetic on the multiple-precision integers of gmpy2
+    '''
+    name = "gmpy2"
+
+    def __init__(self, gmpy2):
+        self._gmpy2 = gmpy2
+
+    def integer(self, value):
+        return self._gmpy2.mpz(value)
+
+    def inverse(self, k, prime):
+        '''
+        See PythonBackend.inverse
+        '''
+        k = k % prime
+        if not k:
+            return 0
+        return int(self._gmpy2.invert(k, prime))
+
+    def isqrt(self, value):
+        '''
+        See PythonBackend.isqrt
+        '''
+        return int(self._gmpy2.isqrt(value))
+
+
+def _import_gmpy2():
+    '''
+    Returns:
+        the gmpy2 module, or None if it cannot be imported
+    '''
+    try:
+        import gmpy2
+    except ImportError:
+        return None
+    return gmpy2
+
+
+def get_backend(name=None):
+    '''
+    Args:
+        name, "python", "gmpy2", or None for gmpy2 when it can be imported and python otherwise
+    Returns:
+        a new backend of the given name
+    Raises:
+        ValueError, the name is unknown or names a backend whose module cannot be imported
+    '''
+    if name not in (None, PythonBackend.name, GMPBackend.name):
+        raise ValueError("unknown arithmetic backend: %s" % name)
+    gmpy2 = None if name == PythonBackend.name else _import_gmpy2()
+    if gmpy2 is not None:
+        return GMPBackend(gmpy2)
+    if name == GMPBackend.name:
+        raise ValueError("the gmpy2 arithmetic backend requires the gmpy2 module")
+    return PythonBackend()
+
+
+BACKEND = get_backend(os.environ.get(BACKEND_VARIABLE) or None)
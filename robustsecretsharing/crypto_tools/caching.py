@@ -0,0 +1,190 @@
+from collections import OrderedDict
+import json
+import sqlite3
+import threading
+
+
+class LRUCache(object):
+    '''
+    A bounded mapping that evicts its least recently used entry once it grows past capacity
+    Lookups made through get are counted as hits or misses
+    '''
+
+    def __init__(self, capacity):
+        '''
+        Args:
+            capacity, the maximum number of entries to hold (a capacity of zero disables caching)
+        Raises:
+            ValueError, capacity is negative
+        '''
+        if capacity < 0:
+            raise ValueError("cache capacity must be nonnegative")
+        self.capacity = capacity
+        self.hits, self.misses = 0, 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        '''
+        Args:
+            key, any hashable value
+            default, the value to return if key is not cached
+        Returns:
+            the cached value for key (marking it as most recently used) or default
+        '''
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        '''
+        Args:
+            key, any hashable value
+            value, the value to cache for key
+        Stores the value as the most recently used entry, evicting the least recently used entries if needed
+        '''
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+            self._evict()
+
+    def resize(self, capacity):
+        '''
+        Args:
+            capacity, the new maximum number of entries to hold
+        Raises:
+            ValueError, capacity is negative
+        '''
+        if capacity < 0:
+            raise ValueError("cache capacity must be nonnegative")
+        with self._lock:
+            self.capacity = capacity
+            self._evict()
+
+    def clear(self):
+        '''
+        Removes all entries and resets the hit and miss counters
+        '''
+        with self._lock:
+            self._entries.clear()
+            self.hits, self.misses = 0, 0
+
+    def _evict(self):
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+class SQLiteCache(object):
+    '''
+    A bounded, persistent mapping backed by an SQLite database that evicts its least recently used entries
+    Values must be JSON serializable and lookups made through get are counted as hits or misses
+    '''
+
+    def __init__(self, path, capacity):
+        '''
+        Args:
+            path, the file path of the database (created if it does not exist)
+            capacity, the maximum number of entries to hold (a capacity of zero disables caching)
+        Raises:
+            ValueError, capacity is negative
+        '''
+        if capacity < 0:
+            raise ValueError("cache capacity must be nonnegative")
+        self.capacity = capacity
+        self.hits, self.misses = 0, 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS entries "
+                                     "(key TEXT PRIMARY KEY, value TEXT NOT NULL, used INTEGER NOT NULL)")
+        self._clock = self._connection.execute("SELECT COALESCE(MAX(used), 0) FROM entries").fetchone()[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, key, default=None):
+        '''
+        Args:
+            key, a string key
+            default, the value to return if key is not cached
+        Returns:
+            the cached value for key (marking it as most recently used) or default
+        '''
+        with self._lock:
+            row = self._connection.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            with self._connection:
+                self._connection.execute("UPDATE entries SET used = ? WHERE key = ?", (self._tick(), key))
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key, value):
+        '''
+        Args:
+            key, a string key
+            value, a JSON serializable value to cache for key
+        Stores the value as the most recently used entry, evicting the least recently used entries if needed
+        '''
+        with self._lock:
+            with self._connection:
+                self._connection.execute("INSERT OR REPLACE INTO entries (key, value, used) VALUES (?, ?, ?)",
+                                         (key, json.dumps(value), self._tick()))
+                self._evict()
+
+    def resize(self, capacity):
+        '''
+        Args:
+            capacity, the new maximum number of entries to hold
+        Raises:
+            ValueError, capacity is negative
+        '''
+        if capacity < 0:
+            raise ValueError("cache capacity must be nonnegative")
+        with self._lock:
+            self.capacity = capacity
+            with self._connection:
+                self._evict()
+
+    def clear(self):
+        '''
+        Removes all entries and resets the hit and miss counters
+        '''
+        with self._lock:
+            with self._connection:
+                self._connection.execute("DELETE FROM entries")
+            self.hits, self.misses = 0, 0
+
+    def close(self):
+        '''
+        Closes the underlying database connection
+        '''
+        self._connection.close()
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def _evict(self):
+        excess = self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0] - self.capacity
+        if excess > 0:
+            self._connection.execute("DELETE FROM entries WHERE key IN "
+                                     "(SELECT key FROM entries ORDER BY used ASC LIMIT ?)", (excess,))
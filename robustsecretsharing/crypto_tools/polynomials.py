@@ -1,27 +1,37 @@
-def _egcd(a, b):
+from robustsecretsharing.crypto_tools import arithmetic, caching
+import operator
+import threading
+
+WEIGHT_CACHE_CAPACITY = 128  # distinct (x-values, prime) combinations to remember
+VANDERMONDE_CACHE_CAPACITY = 32  # distinct (x-values, number of coefficients, prime) combinations to remember
+VANDERMONDE_CACHE_MAX_CELLS = 1024  # largest n * t matrix cached, so the cache holds at most 32 * 1024 field elements
+
+# Lagrange weights at zero for recently seen sets of x-values, keyed by (sorted x-values, prime)
+WEIGHT_CACHE = caching.LRUCache(WEIGHT_CACHE_CAPACITY)
+
+# Vandermonde matrices of recently dealt x-values, keyed by (x-values, number of coefficients, prime)
+VANDERMONDE_CACHE = caching.LRUCache(VANDERMONDE_CACHE_CAPACITY)
+
+# the number of modular inversions performed by each thread, for instrumentation (see tracing.py)
+_COUNTERS = threading.local()
+
+
+def get_inversion_count():
     '''
-    Implements the extended euclidean algorithm
     Returns:
-        the tuple (g, x, y), such that ax + by = g = gcd(a, b)
+        the number of modular inversions performed so far by the calling thread
+        (inversions in other threads, such as those of concurrent reconstructions, are not included)
     '''
-    if a == 0:
-        return b, 0, 1
-    else:
-        g, y, x = _egcd(b % a, a)
-        return g, x - (b // a) * y, y
+    return getattr(_COUNTERS, "inversions", 0)
 
 
 def _inverse_mod(k, prime):
     '''
     Returns:
-        the inverse mod of k within the field defined by the prime
+        the inverse mod of k within the field defined by the prime, or 0 if k is a multiple of the prime
     '''
-    k = k % prime
-    if k < 0:
-        r = _egcd(prime, -k)[2]
-    else:
-        r = _egcd(prime, k)[2]
-    return (prime + r) % prime
+    _COUNTERS.inversions = getattr(_COUNTERS, "inversions", 0) + 1
+    return arithmetic.BACKEND.inverse(k, prime)
 
 
 def get_polynomial(coefficients, prime):
@@ -37,11 +47,13 @@ def get_polynomial(coefficients, prime):
     if len(coefficients) <= 1:
         raise ValueError("too few coefficients to construct a polynomial")
 
+    coefficients = [arithmetic.BACKEND.integer(coefficient) for coefficient in coefficients]
+
     def P(x):
         sum = 0
-        for i in xrange(len(coefficients)):
+        for i in range(len(coefficients)):
             sum += (coefficients[i] * pow(x, i, prime)) % prime
-        return sum % prime
+        return int(sum % prime)
     return P
 
 
@@ -60,6 +72,56 @@ def evaluate(coefficients, xlist, prime):
     return [(x, f(x)) for x in xlist]
 
 
+def get_vandermonde_matrix(x_vals, num_coefficients, prime):
+    '''
+    Args:
+        x_vals: a tuple of the integer points at which polynomials will be evaluated
+        num_coefficients: the number of coefficients of the polynomials
+        prime: arithmetic is done mod this prime
+    Returns:
+        a list parallel to x_vals of the rows [1, x, x^2, ..., x^(num_coefficients - 1)] mod prime,
+        as integers of the arithmetic backend
+        matrices of at most VANDERMONDE_CACHE_MAX_CELLS entries are served from VANDERMONDE_CACHE
+        when the same x-values, size and prime were seen recently
+    '''
+    key = (x_vals, num_coefficients, prime)
+    matrix = VANDERMONDE_CACHE.get(key)
+    if matrix is None:
+        matrix = [[arithmetic.BACKEND.integer(pow(x, i, prime)) for i in range(num_coefficients)] for x in x_vals]
+        if len(x_vals) * num_coefficients <= VANDERMONDE_CACHE_MAX_CELLS:
+            VANDERMONDE_CACHE.put(key, matrix)
+    return matrix
+
+
+def evaluate_many(coefficient_lists, xlist, prime):
+    '''
+    Args:
+        coefficient_lists: a list of lists of integers, each holding the coefficients of a polynomial
+                           every polynomial must have the same number of coefficients
+        xlist: a list of integer points at which to evaluate every polynomial
+        prime: arithmetic is done mod this prime
+    Returns:
+        a list parallel to coefficient_lists of the lists of points that evaluate returns for each polynomial
+        each point is the product of a cached Vandermonde row with the coefficients, reduced once at the end
+    Raises:
+        ValueError, the coefficient lists are too short to construct a polynomial or differ in length
+    '''
+    if not coefficient_lists:
+        return []
+    num_coefficients = len(coefficient_lists[0])
+    if num_coefficients <= 1:
+        raise ValueError("too few coefficients to construct a polynomial")
+    if any(len(coefficients) != num_coefficients for coefficients in coefficient_lists):
+        raise ValueError("polynomials evaluated together must have the same number of coefficients")
+
+    rows = list(zip(xlist, get_vandermonde_matrix(tuple(xlist), num_coefficients, prime)))
+    evaluations = []
+    for coefficients in coefficient_lists:
+        coefficients = [arithmetic.BACKEND.integer(coefficient) for coefficient in coefficients]
+        evaluations.append([(x, int(sum(map(operator.mul, row, coefficients)) % prime)) for x, row in rows])
+    return evaluations
+
+
 def interpolate(points, prime):
     '''
     Args:
@@ -79,19 +141,77 @@ def interpolate(points, prime):
 
     # convert t + 1 data points, (x_0, y_0),...,(x_{t+1}, y_{t+1}) into lists of x and y
     x_vals, y_vals = map(list, zip(*points))
+    y_vals = [arithmetic.BACKEND.integer(y) for y in y_vals]
 
     def P(x):
-        basis = []
-        for j in xrange(degree):  # the jth basis is the product over m from 0 to degree with m != j
-            numerator, denominator = 1, 1   # of (x - x_m) / (x_j - x_m)
-            for m in range(j) + range(j + 1, degree):
-                numerator = (numerator * (x - x_vals[m])) % prime
-                denominator = (denominator * (x_vals[j] - x_vals[m])) % prime
-            basis.append((numerator * _inverse_mod(denominator, prime)) % prime)
+        basis = _lagrange_basis(x, x_vals, prime)
 
         # return the sum of the product of each y value which its corresponding basis polynomial
         result = 0
-        for i in xrange(degree):
+        for i in range(degree):
             result += y_vals[i] * basis[i]
-        return result % prime
+        return int(result % prime)
     return P
+
+
+def _lagrange_basis(x, x_vals, prime):
+    '''
+    Args:
+        x: the integer point at which to evaluate the basis polynomials
+        x_vals: a list of the integer x-coordinates of the interpolation points
+        prime: arithmetic is done mod this prime
+    Returns:
+        a list holding the evaluation at x of the Lagrange basis polynomial for each x-coordinate
+    '''
+    degree = len(x_vals)
+    basis = []
+    for j in range(degree):  # the jth basis is the product over m from 0 to degree with m != j
+        numerator, denominator = 1, 1   # of (x - x_m) / (x_j - x_m)
+        for m in range(degree):
+            if m == j:
+                continue
+            numerator = (numerator * (x - x_vals[m])) % prime
+            denominator = (denominator * (x_vals[j] - x_vals[m])) % prime
+        basis.append((numerator * _inverse_mod(denominator, prime)) % prime)
+    return basis
+
+
+def get_lagrange_weights(x_vals, prime):
+    '''
+    Args:
+        x_vals: a sorted tuple of the integer x-coordinates of the interpolation points
+        prime: arithmetic is done mod this prime
+    Returns:
+        a list of the Lagrange basis polynomials evaluated at zero, parallel to x_vals,
+        in the integer representation of arithmetic.BACKEND
+        weights are served from WEIGHT_CACHE when the same x-values and prime were seen recently
+    '''
+    key = (x_vals, prime)
+    weights = WEIGHT_CACHE.get(key)
+    if weights is None:
+        weights = [arithmetic.BACKEND.integer(weight) for weight in _lagrange_basis(0, x_vals, prime)]
+        WEIGHT_CACHE.put(key, weights)
+    return weights
+
+
+def interpolate_at_zero(points, prime):
+    '''
+    Args:
+        points: list of tuples, (x, f(x)), where both values are integers
+                the number of points given is assumed to be the degree of the polynomial
+        prime: arithmetic is done mod this prime
+    Returns:
+        the evaluation at zero of the polynomial through the given points, equal to interpolate(points, prime)(0)
+    Raises:
+        ValueError, passed too few points
+    '''
+    if len(points) <= 1:
+        raise ValueError("too few points to recover a polynomial")
+
+    x_vals, y_vals = zip(*sorted(points))  # order the points so that any ordering of a set of x-values shares weights
+    weights = get_lagrange_weights(x_vals, prime)
+
+    result = 0
+    for y, weight in zip(y_vals, weights):
+        result += y * weight
+    return int(result % prime)
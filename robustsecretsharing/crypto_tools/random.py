@@ -1,5 +1,6 @@
 import os
 import math
+import binascii
 from robustsecretsharing.crypto_tools import serialization
 
 
@@ -53,3 +54,49 @@ def get_distinct_positive_random_ints_in_field(num_ints, prime):
     while len(random_values) < num_ints:
         random_values.add(get_random_positive_int_in_field(prime))
     return list(random_values)
+
+
+def get_random_ints_in_field(num_ints, prime):
+    '''
+    Args:
+        num_ints, the number of random values to return
+        prime, specifies the upper bound (exclusive) for the random values
+    Returns:
+        a list of cryptographically-secure random integers within the specified field,
+        drawn with a single read from the source of entropy
+    Raises:
+        ValueError, OS does not provide a source of entropy
+    '''
+    try:
+        bytelength = _get_byte_length(prime)
+        random_hex = binascii.hexlify(os.urandom(bytelength * num_ints))
+    except NotImplementedError:
+        raise ValueError("no found implementation for entropy")
+
+    hexlength = 2 * bytelength
+    return [int(random_hex[start:start + hexlength], 16) % prime for start in range(0, hexlength * num_ints, hexlength)]
+
+
+def get_distinct_positive_random_int_lists_in_field(num_lists, num_ints, prime):
+    '''
+    Args:
+        num_lists, the number of lists to return
+        num_ints, the number of random values in each list
+        prime, specifies the upper bound (exclusive) for the random values
+    Returns:
+        a list of num_lists lists, each as returned by get_distinct_positive_random_ints_in_field,
+        drawn with a single read from the source of entropy
+    '''
+    if num_ints >= prime:
+        raise ValueError("selected field is too small")
+    if num_ints == 0:
+        return [[] for _ in range(num_lists)]
+
+    random_values = get_random_ints_in_field(num_lists * num_ints, prime)
+    random_lists = []
+    for start in range(0, num_lists * num_ints, num_ints):
+        random_list = random_values[start:start + num_ints]
+        if 0 in random_list or len(set(random_list)) < num_ints:  # rare for any sizable field, so redraw the whole list
+            random_list = get_distinct_positive_random_ints_in_field(num_ints, prime)
+        random_lists.append(random_list)
+    return random_lists
@@ -0,0 +1,266 @@
+from robustsecretsharing.crypto_tools import arithmetic, polynomials, caching
+from collections import defaultdict
+
+PARITY_CACHE_CAPACITY = 128  # distinct (x-values, number of coefficients, prime) combinations to remember
+
+# parity-check vectors of recently seen codes, keyed by (sorted x-values, number of coefficients, prime)
+PARITY_CACHE = caching.LRUCache(PARITY_CACHE_CAPACITY)
+
+# polynomials in this module are lists of integer coefficients, lowest degree first, without trailing zeros
+# so that the zero polynomial is the empty list and len(p) - 1 is the degree of p
+
+
+def _trim(p):
+    '''
+    Returns:
+        the polynomial p with its trailing (highest degree) zero coefficients removed
+    '''
+    while p and p[-1] == 0:
+        p.pop()
+    return p
+
+
+def _degree(p):
+    '''
+    Returns:
+        the degree of the polynomial p, or -1 for the zero polynomial
+    '''
+    return len(p) - 1
+
+
+def _subtract(p, q, prime):
+    '''
+    Returns:
+        the polynomial p - q
+    '''
+    result = [0] * max(len(p), len(q))
+    for i, coefficient in enumerate(p):
+        result[i] = coefficient
+    for i, coefficient in enumerate(q):
+        result[i] = (result[i] - coefficient) % prime
+    return _trim(result)
+
+
+def _multiply(p, q, prime):
+    '''
+    Returns:
+        the polynomial p * q
+    '''
+    if not p or not q:
+        return []
+    result = [0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        for j, b in enumerate(q):
+            result[i + j] += a * b
+    return _trim([coefficient % prime for coefficient in result])
+
+
+def _divmod(p, q, prime):
+    '''
+    Returns:
+        a tuple of polynomials (quotient, remainder) such that p = quotient * q + remainder
+        and the degree of remainder is less than the degree of q
+    Raises:
+        ZeroDivisionError, q is the zero polynomial
+    '''
+    if not q:
+        raise ZeroDivisionError("polynomial division by zero")
+
+    remainder = [coefficient % prime for coefficient in p]
+    quotient = [0] * max(len(p) - len(q) + 1, 0)
+    lead_inverse = polynomials._inverse_mod(q[-1], prime)
+    for shift in range(len(quotient) - 1, -1, -1):
+        factor = (remainder[shift + len(q) - 1] * lead_inverse) % prime
+        quotient[shift] = factor
+        if factor:
+            for i, coefficient in enumerate(q):
+                remainder[shift + i] = (remainder[shift + i] - factor * coefficient) % prime
+    return _trim(quotient), _trim(remainder[:len(q) - 1])
+
+
+def _evaluate(p, x, prime):
+    '''
+    Returns:
+        the evaluation of the polynomial p at x (using Horner's rule)
+    '''
+    result = 0
+    for coefficient in reversed(p):
+        result = (result * x + coefficient) % prime
+    return result
+
+
+def _vanishing_polynomial(x_vals, prime):
+    '''
+    Returns:
+        the polynomial (x - x_1) * ... * (x - x_n) for the given x values
+    '''
+    result = [1]
+    for x in x_vals:
+        result = _multiply(result, [-x % prime, 1], prime)
+    return result
+
+
+def _interpolate_coefficients(points, vanishing, prime):
+    '''
+    Args:
+        points: list of tuples, (x, f(x)), with distinct x values
+        vanishing: the polynomial returned by _vanishing_polynomial for the x values of points
+        prime: arithmetic is done mod this prime
+    Returns:
+        the coefficients of the unique polynomial of degree less than len(points) through the given points
+    '''
+    result = [0] * len(points)
+    for x, y in points:
+        basis, _ = _divmod(vanishing, [-x % prime, 1], prime)  # the product of (x - x_m) over m != j
+        weight = (y * polynomials._inverse_mod(_evaluate(basis, x, prime), prime)) % prime
+        for i, coefficient in enumerate(basis):
+            result[i] = (result[i] + weight * coefficient) % prime
+    return _trim(result)
+
+
+def _barycentric_weights(x_vals, prime):
+    '''
+    Args:
+        x_vals: a list of distinct integer x values
+        prime: arithmetic is done mod this prime
+    Returns:
+        the list of weights 1 / ((x_i - x_1) * ... * (x_i - x_n)) over every m != i, computed with a single inversion
+    '''
+    denominators = []
+    for i, x in enumerate(x_vals):
+        denominator = 1
+        for m, other in enumerate(x_vals):
+            if m != i:
+                denominator = (denominator * (x - other)) % prime
+        denominators.append(denominator)
+
+    # invert the product of all denominators once and peel off each weight from the prefix products
+    prefixes = [1]
+    for denominator in denominators:
+        prefixes.append((prefixes[-1] * denominator) % prime)
+    inverse = polynomials._inverse_mod(prefixes[-1], prime)
+
+    weights = [0] * len(x_vals)
+    for i in range(len(x_vals) - 1, -1, -1):
+        weights[i] = (inverse * prefixes[i]) % prime
+        inverse = (inverse * denominators[i]) % prime
+    return weights
+
+
+def get_parity_checks(x_vals, num_coefficients, prime):
+    '''
+    Args:
+        x_vals: a sorted tuple of distinct integer x values
+        num_coefficients: the number of coefficients of the polynomials in the code (one more than their degree)
+        prime: arithmetic is done mod this prime
+    Returns:
+        a list of len(x_vals) - num_coefficients parity-check vectors, each parallel to x_vals,
+        such that the y values of points at x_vals lie on one polynomial with num_coefficients coefficients
+        exactly when their dot product with every parity-check vector is zero
+        vectors are served from PARITY_CACHE when the same code was seen recently
+    '''
+    key = (x_vals, num_coefficients, prime)
+    checks = PARITY_CACHE.get(key)
+    if checks is None:
+        # the jth check is w_i * x_i^j, which sums to zero against any polynomial of degree below len(x_vals) - j - 1
+        checks = []
+        check = _barycentric_weights(x_vals, prime)
+        for _ in range(len(x_vals) - num_coefficients):
+            checks.append(check)
+            check = [(weight * x) % prime for weight, x in zip(check, x_vals)]
+        PARITY_CACHE.put(key, checks)
+    return checks
+
+
+def is_consistent(points, num_coefficients, prime):
+    '''
+    Args:
+        points: list of tuples, (x, f(x)), where both values are integers
+        num_coefficients: the number of coefficients of f (one more than its degree)
+        prime: arithmetic is done mod this prime
+    Returns:
+        True if all points lie on a single polynomial with num_coefficients coefficients, False otherwise
+        points that repeat an x value are never consistent
+        with cached parity checks this costs len(points) * (len(points) - num_coefficients) multiply-adds and no inversions
+    '''
+    points = sorted((x % prime, y % prime) for x, y in points)
+    x_vals = tuple(x for x, _ in points)
+    if len(set(x_vals)) != len(x_vals):
+        return False
+    if len(points) <= num_coefficients:
+        return True
+
+    for check in get_parity_checks(x_vals, num_coefficients, prime):
+        total = 0
+        for weight, (_, y) in zip(check, points):
+            total += weight * y
+        if total % prime != 0:
+            return False
+    return True
+
+
+def _classify(f, points, num_coefficients, prime):
+    '''
+    Returns:
+        the tuple returned by decode for the recovered polynomial f
+    '''
+    errors = [(x, y) for x, y in points if _evaluate(f, x, prime) != y % prime]
+    return [int(coefficient) for coefficient in f] + [0] * (num_coefficients - len(f)), errors
+
+
+def decode(points, num_coefficients, prime):
+    '''
+    Recover a polynomial from evaluations that may include errors, using Gao's Reed-Solomon decoding algorithm
+    Args:
+        points: list of tuples, (x, f(x)), where both values are integers
+                points that share an x value with another point are treated as erasures
+        num_coefficients: the number of coefficients of f (one more than its degree)
+        prime: arithmetic is done mod this prime
+    Returns:
+        a tuple of
+            the list of num_coefficients coefficients of f, lowest degree first
+            the list of given points that do not lie on f
+        decoding succeeds whenever, among the m points with distinct x values,
+        at most (m - num_coefficients) / 2 are in error
+    Raises:
+        ValueError, too few points were given or too many points are in error to recover f
+
+    See Shuhong Gao, "A New Algorithm for Decoding Reed-Solomon Codes" (2002)
+    '''
+    occurrences = defaultdict(int)
+    for x, _ in points:
+        occurrences[x % prime] += 1
+    distinct = [(x % prime, arithmetic.BACKEND.integer(y) % prime) for x, y in points if occurrences[x % prime] == 1]
+
+    num_points = len(distinct)
+    if num_coefficients < 1 or num_points < num_coefficients:
+        raise ValueError("too few points to recover a polynomial")
+
+    if is_consistent(distinct, num_coefficients, prime):  # no errors, so any num_coefficients points determine f
+        f = _interpolate_coefficients(distinct[:num_coefficients],
+                                      _vanishing_polynomial([x for x, _ in distinct[:num_coefficients]], prime), prime)
+        return _classify(f, points, num_coefficients, prime)
+
+    # g0 vanishes on every x value and g1 interpolates every point, errors included
+    g0 = _vanishing_polynomial([x for x, _ in distinct], prime)
+    g1 = _interpolate_coefficients(distinct, g0, prime)
+
+    # run the extended euclidean algorithm on (g0, g1) until the remainder has degree below (n + k) / 2,
+    # tracking only the cofactor v of g1
+    previous_remainder, remainder = g0, g1
+    previous_v, v = [], [1]
+    while 2 * _degree(remainder) >= num_points + num_coefficients:
+        quotient, next_remainder = _divmod(previous_remainder, remainder, prime)
+        previous_remainder, remainder = remainder, next_remainder
+        previous_v, v = v, _subtract(previous_v, _multiply(quotient, v, prime), prime)
+
+    # v is the error locator polynomial and remainder = f * v
+    f, leftover = _divmod(remainder, v, prime)
+    if leftover or _degree(f) >= num_coefficients:
+        raise ValueError("too many errors to recover a polynomial")
+
+    num_errors = len([x for x, y in distinct if _evaluate(f, x, prime) != y])
+    if 2 * num_errors > num_points - num_coefficients:
+        raise ValueError("too many errors to recover a polynomial")
+
+    return _classify(f, points, num_coefficients, prime)
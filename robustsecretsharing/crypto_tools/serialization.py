@@ -1,6 +1,8 @@
 import codecs
 
-MAGIC = '*'
+MAGIC = b'*'
+
+_NATIVE_BYTES = hasattr(int, 'from_bytes')  # Python 3 converts between integers and bytes natively
 
 
 def _convert_hex_to_int(hex_string):
@@ -56,6 +58,8 @@ def convert_bytestring_to_int(byte_string):
         an integer that can be passed to convert_int_to_bytestring
     Note that this integer will be larger by a byte than the value of the bytestring
     '''
+    if _NATIVE_BYTES:
+        return int.from_bytes(MAGIC + byte_string, 'big')
     hex_string = _convert_bytestring_to_hex(byte_string)
     return _convert_hex_to_int(hex_string)
 
@@ -69,5 +73,9 @@ def convert_int_to_bytestring(int_val):
     Raises:
         ValueError, resultant bytestring is not of the correct form
     '''
+    if _NATIVE_BYTES:
+        if int_val < 0:
+            raise ValueError("cannot convert a negative integer to a bytestring")
+        return int_val.to_bytes(max(1, (int_val.bit_length() + 7) // 8), 'big')[len(MAGIC):]
     hex_string = _convert_int_to_hex(int_val)
     return _convert_hex_to_bytestring(hex_string)
@@ -0,0 +1,98 @@
+from robustsecretsharing import rss
+from robustsecretsharing.crypto_tools import arithmetic, caching, polynomials, reed_solomon
+import pytest
+
+PRIME = 2**4423 - 1
+INTEGER_TYPES = (int, type(PRIME))  # Python 2 holds large values as longs
+VALUES = [0, 1, 2, 3, PRIME - 1, PRIME + 5, -7, 2**4000 + 12345, 123456789]
+
+
+@pytest.fixture(params=["python", "gmpy2"])
+def backend(request, monkeypatch):
+    if request.param == "gmpy2":
+        pytest.importorskip("gmpy2")
+    backend = arithmetic.get_backend(request.param)
+    # swap in the backend and fresh caches, so that no values from another backend are reused
+    monkeypatch.setattr(arithmetic, "BACKEND", backend)
+    monkeypatch.setattr(polynomials, "WEIGHT_CACHE", caching.LRUCache(polynomials.WEIGHT_CACHE_CAPACITY))
+    monkeypatch.setattr(polynomials, "VANDERMONDE_CACHE", caching.LRUCache(polynomials.VANDERMONDE_CACHE_CAPACITY))
+    monkeypatch.setattr(reed_solomon, "PARITY_CACHE", caching.LRUCache(reed_solomon.PARITY_CACHE_CAPACITY))
+    return backend
+
+
+def test_inverse(backend):
+    for k in VALUES:
+        inverse = backend.inverse(k, PRIME)
+        assert type(inverse) in INTEGER_TYPES
+        if k % PRIME == 0:
+            assert inverse == 0  # multiples of the prime have no inverse
+        else:
+            assert (k * inverse) % PRIME == 1
+
+
+def test_inverse_fallback(monkeypatch):
+    backend = arithmetic.PythonBackend()
+    inverses = [backend.inverse(k, PRIME) for k in VALUES]
+    monkeypatch.setattr(arithmetic, "_NATIVE_INVERSE", False)
+    assert [backend.inverse(k, PRIME) for k in VALUES] == inverses
+
+
+def test_isqrt(backend):
+    for value in VALUES[:-3] + [PRIME**2, PRIME**2 - 1, PRIME**2 + 2 * PRIME]:
+        root = backend.isqrt(value)
+        assert type(root) in INTEGER_TYPES
+        assert root**2 <= value < (root + 1)**2
+
+
+def test_isqrt_negative(backend):
+    with pytest.raises(ValueError):
+        backend.isqrt(-1)
+
+
+def test_isqrt_fallback():
+    for value in VALUES[:-3] + [PRIME**2, PRIME**2 - 1, PRIME**2 + 2 * PRIME, 15, 16, 17]:
+        root = arithmetic._newton_isqrt(value)
+        assert root**2 <= value < (root + 1)**2
+    with pytest.raises(ValueError):
+        arithmetic._newton_isqrt(-1)
+
+
+def test_integer_mixes_with_ints(backend):
+    a, b = backend.integer(2**4000 + 1), 2**3000 + 7
+    assert int((a * b + 5) % PRIME) == ((2**4000 + 1) * b + 5) % PRIME
+    assert a == 2**4000 + 1
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        arithmetic.get_backend("float")
+
+
+def test_default_backend():
+    try:
+        import gmpy2  # noqa: F401
+    except ImportError:
+        assert arithmetic.get_backend().name == "python"
+    else:
+        assert arithmetic.get_backend().name == "gmpy2"
+
+
+def test_evaluate_many(backend):
+    coefficient_lists = [[PRIME - 1, 2**4000 + 12345, 7], [123456789, 0, PRIME - 2]]
+    xlist = [1, 2, 3, 4, 5]
+    points_lists = polynomials.evaluate_many(coefficient_lists, xlist, PRIME)
+    assert points_lists == [polynomials.evaluate(coefficients, xlist, PRIME) for coefficients in coefficient_lists]
+    assert all(type(y) in INTEGER_TYPES for points in points_lists for _, y in points)
+
+
+def test_sharing(backend):
+    players = ["alice", "bob", "carol", "dave", "erin"]
+    secret = b'\x00secret\xff' * 60
+    shares_map = rss.share_authenticated_secret(players, 3, len(secret), secret)
+
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(5, 3, len(secret), shares_map)
+    assert recovered_secret == secret
+    assert sorted(valid_players) == sorted(players) and not invalid_players
+
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_error_corrected_secret(5, 3, len(secret), shares_map)
+    assert recovered_secret == secret
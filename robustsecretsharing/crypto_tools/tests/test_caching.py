@@ -0,0 +1,114 @@
+import pytest
+from robustsecretsharing.crypto_tools import caching
+
+
+def test_get_miss():
+    cache = caching.LRUCache(2)
+    assert cache.get("a") is None
+    assert cache.hits == 0 and cache.misses == 1
+
+
+def test_get_hit():
+    cache = caching.LRUCache(2)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    assert cache.hits == 1 and cache.misses == 0
+
+
+def test_evicts_least_recently_used():
+    cache = caching.LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert len(cache) == 2
+
+
+def test_put_existing_key():
+    cache = caching.LRUCache(2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    assert cache.get("a") == 2 and len(cache) == 1
+
+
+def test_zero_capacity():
+    cache = caching.LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+
+
+def test_resize_evicts():
+    cache = caching.LRUCache(3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.resize(1)
+    assert len(cache) == 1 and "c" in cache
+
+
+def test_clear():
+    cache = caching.LRUCache(2)
+    cache.put("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0 and cache.misses == 0
+
+
+# error cases
+
+def test_negative_capacity():
+    with pytest.raises(ValueError):
+        caching.LRUCache(-1)
+
+
+def test_resize_negative_capacity():
+    cache = caching.LRUCache(1)
+    with pytest.raises(ValueError):
+        cache.resize(-1)
+
+
+def test_sqlite_get_put(tmpdir):
+    cache = caching.SQLiteCache(str(tmpdir.join("cache.db")), 2)
+    assert cache.get("a") is None
+    cache.put("a", [1, 2])
+    assert cache.get("a") == [1, 2]
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_sqlite_evicts_least_recently_used(tmpdir):
+    cache = caching.SQLiteCache(str(tmpdir.join("cache.db")), 2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" is now the least recently used entry
+    cache.put("c", 3)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert len(cache) == 2
+
+
+def test_sqlite_persists(tmpdir):
+    path = str(tmpdir.join("cache.db"))
+    cache = caching.SQLiteCache(path, 2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.close()
+
+    cache = caching.SQLiteCache(path, 2)
+    cache.put("c", 3)  # recency survives reopening, so "b" is evicted
+    assert cache.get("a") == 1 and "b" not in cache
+
+
+def test_sqlite_resize_and_clear(tmpdir):
+    cache = caching.SQLiteCache(str(tmpdir.join("cache.db")), 3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.resize(1)
+    assert len(cache) == 1 and "c" in cache
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_sqlite_negative_capacity(tmpdir):
+    with pytest.raises(ValueError):
+        caching.SQLiteCache(str(tmpdir.join("cache.db")), -1)
@@ -1,5 +1,6 @@
 import pytest
 from robustsecretsharing.crypto_tools import polynomials
+import threading
 
 
 # test standard cases #
@@ -128,6 +129,34 @@ def test_evaluate_neg_result_above_p():
     assert polynomials.evaluate(polynomial, xlist, p) == [(10, 773), (11, 976)]
 
 
+    # evaluate_many tests #
+
+def test_evaluate_many_matches_evaluate():
+    polynomials_list = [[9, 7, 4, 2], [-36, 88, -5, -33], [0, 0, 0, 1], [70, 70, 70, 70]]
+    xlist = [1, 2, 3, 5, 11]
+    p = 71
+    assert polynomials.evaluate_many(polynomials_list, xlist, p) == \
+        [polynomials.evaluate(polynomial, xlist, p) for polynomial in polynomials_list]
+
+
+def test_evaluate_many_no_polynomials():
+    assert polynomials.evaluate_many([], [1, 2, 3], 71) == []
+
+
+def test_vandermonde_matrix():
+    p = 7
+    # rows of [1, x, x^2] mod 7 for x = 1, 2, 3
+    assert polynomials.get_vandermonde_matrix((1, 2, 3), 3, p) == [[1, 1, 1], [1, 2, 4], [1, 3, 2]]
+    assert ((1, 2, 3), 3, p) in polynomials.VANDERMONDE_CACHE
+
+
+def test_large_vandermonde_matrix_not_cached():
+    x_vals = tuple(range(1, polynomials.VANDERMONDE_CACHE_MAX_CELLS // 2 + 2))
+    matrix = polynomials.get_vandermonde_matrix(x_vals, 2, 7919)
+    assert matrix[2] == [1, 3]
+    assert (x_vals, 2, 7919) not in polynomials.VANDERMONDE_CACHE
+
+
     # interpolate tests #
 
 def test_interpolate_simple():
@@ -265,6 +294,45 @@ def test_interpolate_result_prime_above():
     assert f(10) == 643 % prime
 
 
+    # interpolate_at_zero tests #
+
+def test_interpolate_at_zero_matches_interpolate():
+    # polynomial: 9 * x^3 + 4 * x^2 + 3 * x + 11
+    coefficients = [11, 3, 4, 9]
+    prime = 71
+    xlist = [-2, 4, 5, 9, 11]
+
+    points = polynomials.evaluate(coefficients, xlist, prime)
+    assert polynomials.interpolate_at_zero(points, prime) == polynomials.interpolate(points, prime)(0) == 11
+
+
+def test_interpolate_at_zero_point_order():
+    coefficients = [43, 10, 5]
+    prime = 71
+    xlist = [2, 4, 5]
+
+    points = polynomials.evaluate(coefficients, xlist, prime)
+    assert polynomials.interpolate_at_zero(points, prime) == polynomials.interpolate_at_zero(points[::-1], prime) == 43
+
+
+def test_interpolate_at_zero_reuses_weights():
+    coefficients = [43, 10, 5]
+    other_coefficients = [7, 88, 33]
+    prime = 1013
+    xlist = [3, 6, 7]
+    polynomials.WEIGHT_CACHE.clear()
+
+    assert polynomials.interpolate_at_zero(polynomials.evaluate(coefficients, xlist, prime), prime) == 43
+    assert polynomials.interpolate_at_zero(polynomials.evaluate(other_coefficients, xlist, prime), prime) == 7
+    assert polynomials.WEIGHT_CACHE.misses == 1 and polynomials.WEIGHT_CACHE.hits == 1
+
+
+def test_get_lagrange_weights():
+    prime = 71
+    # weights at zero for x = 1, 2: (0 - 2) / (1 - 2) = 2 and (0 - 1) / (2 - 1) = -1
+    assert polynomials.get_lagrange_weights((1, 2), prime) == [2, prime - 1]
+
+
 # test error cases #
 
     # evaluate tests #
@@ -277,6 +345,16 @@ def test_evaluate_empty_coef():
         polynomials.evaluate(polynomial, xlist, p)
 
 
+def test_evaluate_many_single_coef():
+    with pytest.raises(ValueError):
+        polynomials.evaluate_many([[5]], [1, 2], 71)
+
+
+def test_evaluate_many_mixed_lengths():
+    with pytest.raises(ValueError):
+        polynomials.evaluate_many([[1, 2, 3], [1, 2]], [1, 2], 71)
+
+
     # interpolate tests #
 
 def test_interpolate_empty_points():
@@ -284,3 +362,21 @@ def test_interpolate_empty_points():
     p = 71
     with pytest.raises(ValueError):
         polynomials.interpolate(points, p)
+
+
+def test_interpolate_at_zero_too_few_points():
+    points = [(5, 39)]
+    p = 71
+    with pytest.raises(ValueError):
+        polynomials.interpolate_at_zero(points, p)
+
+
+def test_inversion_count_is_per_thread():
+    before = polynomials.get_inversion_count()
+    thread = threading.Thread(target=lambda: [polynomials._inverse_mod(k, 2**13 - 1) for k in range(1, 100)])
+    thread.start()
+    thread.join()
+    assert polynomials.get_inversion_count() == before
+
+    polynomials._inverse_mod(3, 2**13 - 1)
+    assert polynomials.get_inversion_count() == before + 1
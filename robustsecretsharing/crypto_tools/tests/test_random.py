@@ -15,7 +15,7 @@ def test_random_small_single():
     random_values = random.get_distinct_positive_random_ints_in_field(1, prime)
     assert len(random_values) == 1 and \
         random_values[0] < prime and\
-        random_values[0].bit_length > 0 and \
+        random_values[0].bit_length() > 0 and \
         len(random_values) == len(set(random_values))  # check distinct
 
 
@@ -83,3 +83,39 @@ def test_random_too_many():
     num = 10  # test the case where there are too many requested integers for the prime selected
     with pytest.raises(ValueError):
         random.get_distinct_positive_random_ints_in_field(num, prime)
+
+
+def test_random_ints_in_field():
+    prime = 2**521 - 1
+    num = 50
+    random_values = random.get_random_ints_in_field(num, prime)
+    assert len(random_values) == num and \
+        len([value for value in random_values if 0 <= value < prime]) == num and \
+        len(set(random_values)) == num  # collisions are negligible in this field
+
+
+def test_random_ints_in_field_empty():
+    prime = 2**521 - 1
+    assert random.get_random_ints_in_field(0, prime) == []
+
+
+def test_random_int_lists_in_field():
+    prime = 2**3 - 1
+    num_lists, num = 20, 5
+    random_lists = random.get_distinct_positive_random_int_lists_in_field(num_lists, num, prime)
+    assert len(random_lists) == num_lists
+    for random_values in random_lists:
+        assert len(random_values) == num and \
+            len([value for value in random_values if 0 < value < prime]) == num and \
+            len(random_values) == len(set(random_values))  # check distinct
+
+
+def test_random_int_lists_in_field_empty_lists():
+    prime = 2**3 - 1
+    assert random.get_distinct_positive_random_int_lists_in_field(3, 0, prime) == [[], [], []]
+
+
+def test_random_int_lists_in_field_too_small():
+    prime = 2**3 - 1
+    with pytest.raises(ValueError):
+        random.get_distinct_positive_random_int_lists_in_field(3, prime, prime)
@@ -0,0 +1,138 @@
+import pytest
+from robustsecretsharing.crypto_tools import reed_solomon, polynomials
+
+
+def corrupt(points, indices, prime):
+    '''
+    Args:
+        points, a list of (x, y) tuples
+        indices, the positions of the points to corrupt
+        prime, arithmetic is done mod this prime
+    Returns:
+        a copy of points where the y value of each point at the given indices has been changed
+    '''
+    return [(x, (y + 1) % prime) if i in indices else (x, y) for i, (x, y) in enumerate(points)]
+
+
+def test_decode_no_errors():
+    # polynomial: 9 * x^3 + 4 * x^2 + 3 * x + 11
+    coefficients = [11, 3, 4, 9]
+    prime = 71
+    points = polynomials.evaluate(coefficients, [1, 2, 3, 4, 5, 6], prime)
+    assert reed_solomon.decode(points, len(coefficients), prime) == (coefficients, [])
+
+
+def test_decode_max_errors():
+    coefficients = [11, 3, 4, 9]
+    prime = 1013
+    points = polynomials.evaluate(coefficients, range(1, 11), prime)
+    received = corrupt(points, [0, 4, 9], prime)  # (10 - 4) / 2 = 3 errors can be corrected
+    decoded, errors = reed_solomon.decode(received, len(coefficients), prime)
+    assert decoded == coefficients
+    assert sorted(errors) == sorted([received[0], received[4], received[9]])
+
+
+def test_decode_zero_coefficients():
+    coefficients = [5, 0, 0]
+    prime = 71
+    points = polynomials.evaluate(coefficients, [1, 2, 3, 4, 5], prime)
+    decoded, errors = reed_solomon.decode(corrupt(points, [2], prime), len(coefficients), prime)
+    assert decoded == coefficients and len(errors) == 1
+
+
+def test_decode_zero_polynomial():
+    prime = 71
+    points = [(x, 0) for x in range(1, 6)]
+    assert reed_solomon.decode(corrupt(points, [3], prime), 2, prime) == ([0, 0], [(4, 1)])
+
+
+def test_decode_repeated_x_values():
+    coefficients = [11, 3]
+    prime = 71
+    points = polynomials.evaluate(coefficients, [1, 2, 3, 4, 5], prime)
+    received = points + [(2, 7)]  # the two points at x = 2 are erased, the honest one still lies on the polynomial
+    decoded, errors = reed_solomon.decode(received, len(coefficients), prime)
+    assert decoded == coefficients and errors == [(2, 7)]
+
+
+def test_divmod():
+    prime = 71
+    # (x^2 + 3x + 2) = (x + 1)(x + 2)
+    assert reed_solomon._divmod([2, 3, 1], [1, 1], prime) == ([2, 1], [])
+    assert reed_solomon._divmod([3, 3, 1], [1, 1], prime) == ([2, 1], [1])
+
+
+def test_interpolate_coefficients():
+    coefficients = [11, 3, 4, 9]
+    prime = 71
+    points = polynomials.evaluate(coefficients, [2, 4, 5, 9], prime)
+    vanishing = reed_solomon._vanishing_polynomial([2, 4, 5, 9], prime)
+    assert reed_solomon._interpolate_coefficients(points, vanishing, prime) == coefficients
+
+
+# error cases
+
+def test_decode_too_many_errors():
+    coefficients = [11, 3, 4, 9]
+    prime = 1013
+    points = polynomials.evaluate(coefficients, range(1, 11), prime)
+    with pytest.raises(ValueError):
+        reed_solomon.decode(corrupt(points, [0, 1, 2, 3], prime), len(coefficients), prime)
+
+
+def test_decode_too_few_points():
+    coefficients = [11, 3, 4, 9]
+    prime = 71
+    points = polynomials.evaluate(coefficients, [1, 2, 3], prime)
+    with pytest.raises(ValueError):
+        reed_solomon.decode(points, len(coefficients), prime)
+
+
+def test_divmod_by_zero():
+    with pytest.raises(ZeroDivisionError):
+        reed_solomon._divmod([1, 2], [], 71)
+
+
+def test_is_consistent():
+    coefficients = [11, 3, 4]
+    prime = 1013
+    points = polynomials.evaluate(coefficients, range(1, 8), prime)
+    assert reed_solomon.is_consistent(points, len(coefficients), prime) is True
+    assert reed_solomon.is_consistent(points[::-1], len(coefficients), prime) is True
+    assert reed_solomon.is_consistent(points, len(coefficients) - 1, prime) is False
+
+
+def test_is_consistent_corrupted():
+    coefficients = [11, 3, 4]
+    prime = 1013
+    points = polynomials.evaluate(coefficients, range(1, 8), prime)
+    for i in range(len(points)):
+        assert reed_solomon.is_consistent(corrupt(points, [i], prime), len(coefficients), prime) is False
+
+
+def test_is_consistent_few_points():
+    prime = 71
+    assert reed_solomon.is_consistent([(1, 5), (2, 9)], 2, prime) is True
+    assert reed_solomon.is_consistent([(1, 5)], 2, prime) is True
+
+
+def test_is_consistent_repeated_x():
+    prime = 71
+    assert reed_solomon.is_consistent([(1, 5), (2, 9), (2, 9)], 2, prime) is False
+
+
+def test_parity_checks_cached():
+    prime = 1013
+    x_vals = (1, 2, 3, 4, 5)
+    reed_solomon.PARITY_CACHE.clear()
+    checks = reed_solomon.get_parity_checks(x_vals, 2, prime)
+    assert len(checks) == len(x_vals) - 2
+    assert reed_solomon.get_parity_checks(x_vals, 2, prime) is checks
+    assert reed_solomon.PARITY_CACHE.hits == 1 and reed_solomon.PARITY_CACHE.misses == 1
+
+
+def test_barycentric_weights():
+    prime = 71
+    # 1 / ((1 - 2)(1 - 3)) = 1 / 2, 1 / ((2 - 1)(2 - 3)) = -1, 1 / ((3 - 1)(3 - 2)) = 1 / 2
+    half = polynomials._inverse_mod(2, prime)
+    assert reed_solomon._barycentric_weights([1, 2, 3], prime) == [half, prime - 1, half]
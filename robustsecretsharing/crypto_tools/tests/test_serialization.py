@@ -2,60 +2,68 @@ from robustsecretsharing.crypto_tools import serialization
 
 
 def test_encode_decode_small():
-    bytestring = '123'
+    bytestring = b'123'
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_encode_decode_large():
-    bytestring = ('123456789012345678901234567890123456789012345678901234567890'
-                  '123456789012345678901234567890123456789012345678901234567890'
-                  '123456789012345678901234567890123456789012345678901234567890'
-                  '123456789012345678901234567890123456789012345678901234567890'
-                  '123456789012345678901234567890123456789012345678901234567890'
-                  '123456789012345678901234567890123456789012345678901234567890'
-                  '123456789012345678901234567890123456789012345678901234567890')
+    bytestring = (b'123456789012345678901234567890123456789012345678901234567890'
+                  b'123456789012345678901234567890123456789012345678901234567890'
+                  b'123456789012345678901234567890123456789012345678901234567890'
+                  b'123456789012345678901234567890123456789012345678901234567890'
+                  b'123456789012345678901234567890123456789012345678901234567890'
+                  b'123456789012345678901234567890123456789012345678901234567890'
+                  b'123456789012345678901234567890123456789012345678901234567890')
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_encode_decode_standard():
-    bytestring = 'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
+    bytestring = b'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_encode_decode_leading_zeros():
-    bytestring = '\x00\x00e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
+    bytestring = b'\x00\x00e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_encode_decode_leading_star():
-    bytestring = '**e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
+    bytestring = b'**e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_encode_decode_trailing_L():
-    bytestring = 'e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcdLL'
+    bytestring = b'e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcdLL'
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_encode_decode_trailing_zeros():
-    bytestring = 'e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM\x00\x00'
+    bytestring = b'e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM\x00\x00'
     int_result = serialization.convert_bytestring_to_int(bytestring)
     assert serialization.convert_int_to_bytestring(int_result) == bytestring
 
 
 def test_small_mutation():
-    bytestring = '\x00\x9c\x9e\x16\xe9'
+    bytestring = b'\x00\x9c\x9e\x16\xe9'
     int_result = serialization.convert_bytestring_to_int(bytestring) + 100  # small relative to bytestring length
     serialization.convert_int_to_bytestring(int_result)
 
 
 def test_large_mutation():
-    bytestring = '\x00\x9c\x9e\x16\xe9'
+    bytestring = b'\x00\x9c\x9e\x16\xe9'
     int_result = serialization.convert_bytestring_to_int(bytestring) + 1000000000000000000  # large relative to bytestring length
     serialization.convert_int_to_bytestring(int_result)
+
+
+def test_encoding_is_stable():
+    # integers produced by earlier releases must keep decoding to the same bytestrings
+    assert serialization.convert_bytestring_to_int(b'123') == 0x2a313233
+    assert serialization.convert_int_to_bytestring(0x2a00ff) == b'\x00\xff'
+    assert serialization.convert_bytestring_to_int(b'') == 0x2a
+    assert serialization.convert_int_to_bytestring(0x2a) == b''
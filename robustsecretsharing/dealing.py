@@ -0,0 +1,210 @@
+'''
+Offline/online dealing of robust secret shares
+
+A DealingPool precomputes, ahead of time and optionally in a background thread, everything about a deal that does not
+depend on the secret: the evaluations of a random polynomial with a zero constant term and the keys, b values and
+products b * key of the n * n check vectors. Dealing a secret s then takes a single field addition per share
+(f(x) = s + r(x)) and a single field addition per check vector
+'''
+from robustsecretsharing import rss
+from robustsecretsharing.crypto_tools import primes, serialization
+from robustsecretsharing.schemes import authentication, pairing, sss
+from collections import defaultdict, deque
+import os
+import threading
+
+DEFAULT_CAPACITY = 64  # precomputed deals to hold
+REFILL_BATCH_SIZE = 16  # precomputed deals generated together, with a single read from the source of entropy
+
+
+class DealingPool(object):
+    '''
+    A bounded pool of precomputed material for dealing secrets to a fixed number of players
+    Every precomputed deal is used at most once, and a pool that finds itself in a forked child process
+    discards the material it inherited, so that no masking polynomial or MAC key is ever used twice
+    '''
+
+    def __init__(self, num_players, reconstruction_threshold, max_secret_length,
+                 capacity=DEFAULT_CAPACITY, low_water=None, background=True):
+        '''
+        Args:
+            num_players, the number of players each secret is dealt to
+            reconstruction_threshold, the number of shares needed for reconstruction
+            max_secret_length, the maximum length of the secrets represented as bytestrings (ie, len(secret))
+            capacity, the maximum number of precomputed deals to hold
+            low_water, the number of precomputed deals at or below which the pool is refilled
+                (a quarter of capacity by default)
+            background, if True, a daemon thread refills the pool, otherwise it is refilled only by refill
+                and deals made while the pool is empty are precomputed on demand
+        Raises:
+            ValueError, the sharing parameters or the capacity and low_water are invalid
+        '''
+        low_water = capacity // 4 if low_water is None else low_water
+        if capacity < 1 or not 0 <= low_water < capacity:
+            raise ValueError("the pool needs a positive capacity and a low water mark below it")
+        self.num_players = num_players
+        self.reconstruction_threshold = reconstruction_threshold
+        self.max_secret_length = max_secret_length
+        self.capacity, self.low_water, self.background = capacity, low_water, background
+
+        # the primes used by rss.share_authenticated_secret, whose conversion to an integer adds one byte
+        self._share_prime = primes.get_prime_by_bitlength(max(num_players.bit_length(), (max_secret_length + 1) * 8))
+        self._mac_prime = authentication.get_large_prime(max_secret_length + 1)
+        if not sss._verify_parameters(num_players, reconstruction_threshold, 0, self._share_prime) \
+                or reconstruction_threshold < 2:
+            raise ValueError("invalid secret sharing parameters")
+
+        self._closed = False
+        self._reset()
+        if background:
+            with self._condition:
+                self._wake_refill()
+
+    def _reset(self):
+        '''
+        Starts the pool afresh in the current process, without any precomputed deals or refill thread
+        '''
+        self._pid = os.getpid()
+        self._deals = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def _check_process(self):
+        '''
+        Discards the state inherited from a parent process, whose precomputed deals the parent may also use
+        '''
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def __len__(self):
+        self._check_process()
+        return len(self._deals)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    def _precompute(self, count):
+        '''
+        Returns:
+            a list of count precomputed deals, each a tuple of
+                the list of (x, r(x)) points of a random polynomial r with r(0) = 0
+                the list of num_players lists of num_players tuples returned by authentication.precompute_check_vectors
+        '''
+        num_players = self.num_players
+        points_list = sss._share_secrets_int(num_players, self.reconstruction_threshold, self.max_secret_length + 1,
+                                             [0] * count)
+        masks = authentication.precompute_check_vectors(count * num_players * num_players, self.max_secret_length + 1)
+        deals = []
+        for index, points in enumerate(points_list):
+            offset = index * num_players * num_players
+            deals.append((points, [masks[start:start + num_players]
+                                   for start in range(offset, offset + num_players * num_players, num_players)]))
+        return deals
+
+    def refill(self):
+        '''
+        Precomputes deals in the calling thread until the pool is at capacity
+        Raises:
+            ValueError, the pool was closed
+        '''
+        self._check_process()
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise ValueError("the dealing pool is closed")
+                count = min(REFILL_BATCH_SIZE, self.capacity - len(self._deals))
+            if count <= 0:
+                return
+            self._add(self._precompute(count))
+
+    def _add(self, deals):
+        '''
+        Adds as many of the given precomputed deals as fit below capacity, unless the pool was closed
+        '''
+        with self._condition:
+            if not self._closed:
+                self._deals.extend(deals[:self.capacity - len(self._deals)])
+
+    def _refill_in_background(self):
+        '''
+        The body of the refill thread, which sleeps until the pool drops to the low water mark
+        '''
+        while True:
+            with self._condition:
+                while not self._closed and len(self._deals) > self.low_water:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                count = self.capacity - len(self._deals)
+            for start in range(0, count, REFILL_BATCH_SIZE):
+                self._add(self._precompute(min(REFILL_BATCH_SIZE, count - start)))
+
+    def _wake_refill(self):
+        '''
+        Starts the refill thread of this process if needed and wakes it, with the condition held by the caller
+        '''
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._refill_in_background)
+            self._thread.daemon = True
+            self._thread.start()
+        self._condition.notify()
+
+    def _take(self):
+        '''
+        Returns:
+            a precomputed deal, removed from the pool, computed on demand if the pool is empty
+        Raises:
+            ValueError, the pool was closed
+        '''
+        self._check_process()
+        with self._condition:
+            if self._closed:
+                raise ValueError("the dealing pool is closed")
+            deal = self._deals.popleft() if self._deals else None
+            if self.background and len(self._deals) <= self.low_water:
+                self._wake_refill()
+        return deal if deal is not None else self._precompute(1)[0]
+
+    def deal(self, players, secret):
+        '''
+        Args:
+            players, a list of num_players unique string ids
+            secret, a bytestring of at most max_secret_length bytes to be shared
+        Returns:
+            the dictionary of player ids to serialized robust shares that rss.share_authenticated_secret returns
+        Raises:
+            ValueError, the number of players or the secret does not match the pool, or the pool was closed
+        '''
+        if len(players) != self.num_players or len(set(players)) != self.num_players:
+            raise ValueError("the pool deals to exactly %d unique players" % self.num_players)
+        secret_int = serialization.convert_bytestring_to_int(secret)
+        if secret_int >= self._share_prime:
+            raise ValueError("invalid secret sharing parameters")
+
+        points, masks = self._take()
+        share_prime, mac_prime = self._share_prime, self._mac_prime
+
+        # f(x) = s + r(x) is a random polynomial of the same degree with f(0) = s
+        shares = [pairing.elegant_pair(x, (secret_int + y) % share_prime) for x, y in points]
+
+        batch_keys, batch_vectors = defaultdict(dict), defaultdict(dict)
+        for player, share, row in zip(players, shares, masks):
+            message = share % mac_prime  # the paired share is wider than the MAC field, so reduce it once per player
+            for player_id, mask in zip(players, row):
+                batch_keys[player][player_id], batch_vectors[player][player_id] = \
+                    authentication.complete_check_vector(message, mask, mac_prime)
+        return rss._make_robust_shares(dict(zip(players, shares)), batch_keys, batch_vectors)
+
+    def close(self):
+        '''
+        Stops the refill thread and discards the precomputed deals
+        '''
+        self._check_process()
+        with self._condition:
+            self._closed = True
+            self._deals.clear()
+            self._condition.notify_all()
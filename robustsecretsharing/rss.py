@@ -1,8 +1,18 @@
-from robustsecretsharing.crypto_tools import serialization
+from robustsecretsharing import tracing
+from robustsecretsharing.crypto_tools import serialization, polynomials, primes
 from robustsecretsharing.schemes import authentication, sss, pairing
 from collections import defaultdict
+import hashlib
 import json
 
+REFRESH_CHUNK_SIZE = 256  # number of secrets whose refresh randomness is drawn together
+SHARE_DIGEST_LENGTH = 32  # hex digits of the share digests in a verification (128 bits)
+
+try:
+    _INTEGER_TYPES = (int, long)
+except NameError:  # Python 3 has a single integer type
+    _INTEGER_TYPES = (int,)
+
 
 class FatalReconstructionFailure(Exception):
     """
@@ -10,6 +20,44 @@ class FatalReconstructionFailure(Exception):
     """
 
 
+class BudgetExceeded(FatalReconstructionFailure):
+    """
+    Raised when reconstruction would exceed a limit of the ReconstructionBudget passed as its stats
+    """
+
+
+class ReconstructionBudget(tracing.Tracer):
+    '''
+    A tracing.Tracer that also caps the work of reconstruction when passed as its stats argument
+    Shares that would take the bytes parsed over their limit are not parsed, and their players are treated as dishonest
+    Exceeding the limit of authentication checks or interpolations aborts reconstruction with BudgetExceeded
+    '''
+
+    def __init__(self, bytes_parsed=None, mac_checks=None, interpolations=None):
+        '''
+        Args:
+            bytes_parsed, the maximum number of bytes of serialized shares to parse, or None for no limit
+            mac_checks, the maximum number of authentication checks, or None for no limit
+            interpolations, the maximum number of candidate secrets to reconstruct, or None for no limit
+        '''
+        tracing.Tracer.__init__(self)
+        self.limits = {name: limit for name, limit in
+                       [("bytes_parsed", bytes_parsed), ("mac_checks", mac_checks), ("interpolations", interpolations)]
+                       if limit is not None}
+
+    def allows(self, name, amount=1):
+        '''
+        Returns:
+            True if the counter name can grow by amount without exceeding its limit, False otherwise
+        '''
+        return name not in self.limits or self.get(name, 0) + amount <= self.limits[name]
+
+    def __setitem__(self, name, value):
+        if name in self.limits and value > self.limits[name]:
+            raise BudgetExceeded("the %s budget of %d was exceeded" % (name, self.limits[name]))
+        tracing.Tracer.__setitem__(self, name, value)
+
+
 def _serialize_robust_share(share, keys, vectors):
     '''
     Args:
@@ -23,17 +71,103 @@ def _serialize_robust_share(share, keys, vectors):
     return json.dumps({'share': share, 'keys': keys, 'vectors': vectors})
 
 
-def _deserialize_robust_share(serialized_dump):
+def _get_field_bounds(num_players, max_secret_length):
+    '''
+    Args:
+        num_players, the number of players passed to share_authenticated_secret
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+    Returns:
+        a tuple of
+            the bound that every paired share (x, f(x)) with x and f(x) in the sharing field is below
+            the maximum number of decimal digits of any share, key or vector value
+    '''
+    share_prime = primes.get_prime_by_bitlength(max(num_players.bit_length(), (max_secret_length + 1) * 8))
+    share_bound = (share_prime + 1) ** 2
+    largest = max(share_bound, authentication.get_large_prime(max_secret_length + 1))
+    return share_bound, largest.bit_length() * 30103 // 100000 + 1  # an upper bound on log10(largest) + 1
+
+
+def _make_int_parser(max_digits):
+    '''
+    Returns:
+        a parse_int hook for json.loads that rejects integers of more than max_digits digits before converting them,
+        so that an oversized value costs no more than scanning its digits
+    '''
+    def parse_int(digits):
+        if len(digits) > max_digits + 1 or len(digits.lstrip('-')) > max_digits:
+            raise ValueError("integer beyond the size of the field")
+        return int(digits)
+    return parse_int
+
+
+def _loads(serialized, max_digits):
+    '''
+    Args:
+        serialized, a JSON string
+        max_digits, an optional maximum number of digits of any integer in serialized
+    Returns:
+        the deserialized value
+    Raises:
+        ValueError, the string is malformed, too deeply nested, or holds an integer of more than max_digits digits
+    '''
+    try:
+        if max_digits is None:
+            return json.loads(serialized)
+        return json.loads(serialized, parse_int=_make_int_parser(max_digits))
+    except RuntimeError:  # the nesting exceeded the recursion limit
+        raise ValueError("serialized value is nested too deeply")
+
+
+def _deserialize_robust_share(serialized_dump, max_digits=None):
     '''
     Args:
         serialized_dump, a string created by _serialize_robust_share
+        max_digits, an optional maximum number of digits of any integer in serialized_dump (see _get_field_bounds)
     Returns:
         a dictionary of the arguments passed to _serialize_robust_share
         with keys (share, keys, vectors)
     Raises:
         ValueError
     '''
-    return json.loads(serialized_dump)
+    return _loads(serialized_dump, max_digits)
+
+
+def _serialize_robust_bundle(robust_shares):
+    '''
+    Args:
+        robust_shares, a list of dictionaries with keys (share, keys, vectors) as passed to _serialize_robust_share
+    Returns:
+        a serialized bundle string that encodes the list of robust shares
+    '''
+    return json.dumps(robust_shares)
+
+
+def _deserialize_robust_bundle(serialized_bundle, max_digits=None):
+    '''
+    Args:
+        serialized_bundle, a string created by _serialize_robust_bundle
+        max_digits, an optional maximum number of digits of any integer in serialized_bundle (see _get_field_bounds)
+    Returns:
+        the list of robust share dictionaries passed to _serialize_robust_bundle
+    Raises:
+        ValueError
+    '''
+    return _loads(serialized_bundle, max_digits)
+
+
+def _make_robust_share_dicts(shares_map, batch_keys, batch_vectors):
+    '''
+    Args:
+        see _make_robust_shares
+    Returns:
+        a dictionary of player ids to unserialized robust shares, which are
+            dictionaries with the keys (share, keys, vectors) described by _make_robust_shares
+    '''
+    robust_shares_map = {}
+    for player, share in shares_map.items():
+        keys_for_players = {other: batch_keys[other][player] for other in shares_map.keys()}
+        robust_shares_map[player] = {'share': share, 'keys': keys_for_players, 'vectors': batch_vectors[player]}
+    return robust_shares_map
 
 
 def _make_robust_shares(shares_map, batch_keys, batch_vectors):
@@ -51,14 +185,12 @@ def _make_robust_shares(shares_map, batch_keys, batch_vectors):
             a map of player ids to vectors for this share
                 that can be verified by keys held by those players
     '''
-    robust_shares_map = {}
-    for player, share in shares_map.items():
-        keys_for_players = {other: batch_keys[other][player] for other in shares_map.keys()}
-        robust_shares_map[player] = _serialize_robust_share(share, keys_for_players, batch_vectors[player])
-    return robust_shares_map
+    robust_shares_map = _make_robust_share_dicts(shares_map, batch_keys, batch_vectors)
+    return {player: _serialize_robust_share(robust_share['share'], robust_share['keys'], robust_share['vectors'])
+            for player, robust_share in robust_shares_map.items()}
 
 
-def share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret):
+def share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret, stats=None):
     '''
     Args:
         players, a list of unique string ids for all players
@@ -66,6 +198,9 @@ def share_authenticated_secret(players, reconstruction_threshold, max_secret_len
             any collection of fewer shares will reveal no information about the secret
         max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
         secret, a bytestring to be Shamir secret shared
+        stats, an optional dictionary that is updated with the counts "mac_generations" and "bytes_serialized"
+            if stats is a tracing.Tracer, the wall time of the phases "share", "authenticate" and "serialize"
+            is also recorded in stats.timings
     Returns:
         a dictionary of ids (from the players argument) to robust secret shares, which consist of
             a share
@@ -76,26 +211,369 @@ def share_authenticated_secret(players, reconstruction_threshold, max_secret_len
         ValueError, the input parameters fail validation (see share_secret of schemes/sss.py)
     '''
     num_players = len(players)
+
+    with tracing.phase(stats, "share"):
+        secret_int = serialization.convert_bytestring_to_int(secret)
+
+        # generate shares of the secret s: ((x_1, s_1), . . . , (x_n, s_n))
+        int_shares = [pairing.elegant_pair(*share) for share in
+                      sss._share_secret_int(num_players,
+                                            reconstruction_threshold,
+                                            max_secret_length + 1,  # conversion to an integer adds one byte
+                                            secret_int)]
+
+        # assign shares to players
+        shares_map = {player: share for (player, share) in zip(players, int_shares)}
+
+    with tracing.phase(stats, "authenticate"):
+        batch_keys, batch_vectors = defaultdict(dict), defaultdict(dict)
+        for player in players:  # generate n MAC keys k_ij and vectors t_ij = MAC(k_ij, s_j) per share s_j
+            keys, vectors = authentication.generate_batch(num_players, shares_map[player], max_secret_length + 1)
+            for player_id, key, vector in zip(players, keys, vectors):
+                batch_keys[player][player_id] = key
+                batch_vectors[player][player_id] = vector
+    _count(stats, "mac_generations", num_players * num_players)
+
+    with tracing.phase(stats, "serialize"):
+        robust_shares = _make_robust_shares(shares_map, batch_keys, batch_vectors)
+    if stats is not None:
+        _count(stats, "bytes_serialized", sum(len(robust_share) for robust_share in robust_shares.values()))
+    return robust_shares
+
+
+def _iter_robust_shares(players, shares_map, max_secret_length):
+    '''
+    Args:
+        players, a list of unique string ids for all players, in the order to emit their robust shares
+        shares_map, a map of player ids to integer-valued shares
+        max_secret_length, the max length of the share if it were represented as a bytestring
+    Yields:
+        tuples of (player id, serialized robust share) as described by _make_robust_shares
+        the two MACs between a pair of players are generated when the first of them is emitted and dropped when the second is,
+        so only the keys and vectors linking emitted players to players still waiting are held in memory
+    '''
+    # the columns still needed: a waiting player to the emitted players to the tuples of
+    # (the key the waiting player holds for the emitted player's share, the vector of the waiting player's share for it)
+    pending = defaultdict(dict)
+    for player in players:
+        keys, vectors = {}, {}
+        columns = pending.pop(player, {})
+        for other in players:
+            if other in columns:  # generated when other was emitted
+                keys[other], vectors[other] = columns[other]
+                continue
+
+            key, vector = authentication.generate_check_vector(shares_map[other], max_secret_length + 1)
+            keys[other] = key
+            if other == player:
+                vectors[player] = vector
+                continue
+
+            other_key, other_vector = authentication.generate_check_vector(shares_map[player], max_secret_length + 1)
+            vectors[other] = other_vector
+            pending[other][player] = (other_key, vector)
+        yield player, _serialize_robust_share(shares_map[player], keys, vectors)
+
+
+def iter_authenticated_shares(players, reconstruction_threshold, max_secret_length, secret):
+    '''
+    Streaming form of share_authenticated_secret, for dealing straight into network sends or share storage
+    Args:
+        see share_authenticated_secret
+    Returns:
+        an iterator of tuples of (player id, serialized robust share), in the order of players,
+        where the robust shares are those share_authenticated_secret would return
+        each robust share is built only when requested, and the keys and vectors held between requests
+        are limited to the MACs linking players already emitted to players still waiting
+    Raises:
+        ValueError, the input parameters fail validation (see share_secret of schemes/sss.py)
+    '''
+    num_players = len(players)
     secret_int = serialization.convert_bytestring_to_int(secret)
 
-    # generate shares of the secret s: ((x_1, s_1), . . . , (x_n, s_n))
+    # the shares themselves are dealt up front so that invalid parameters are reported before any share is emitted
     int_shares = [pairing.elegant_pair(*share) for share in
                   sss._share_secret_int(num_players,
                                         reconstruction_threshold,
                                         max_secret_length + 1,  # conversion to an integer adds one byte
                                         secret_int)]
-
-    # assign shares to players
     shares_map = {player: share for (player, share) in zip(players, int_shares)}
+    return _iter_robust_shares(players, shares_map, max_secret_length)
+
+
+def share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets):
+    '''
+    Batch form of share_authenticated_secret for many secrets shared among the same players
+    The prime, the alphas and the MAC field are selected once, all randomness is drawn with a single read
+    from the source of entropy, and each player's robust shares are serialized together into one bundle.
+    The throughput target is at least 2000 secrets per second on one core for 5 players, a threshold of 3
+    and 32-byte secrets (about 1.4 times that of calling share_authenticated_secret in a loop).
+    Args:
+        players, a list of unique string ids for all players
+        reconstruction_threshold, the number of shares needed for reconstruction
+            any collection of fewer shares will reveal no information about any secret
+        max_secret_length, the maximum length of any secret represented as a bytestring (ie, len(secret))
+        secrets, an iterable of bytestrings to be Shamir secret shared
+    Returns:
+        a dictionary of ids (from the players argument) to serialized bundles of that player's robust shares,
+        where the ith robust share in the bundle belongs to the ith secret (see reconstruct_authenticated_secrets)
+    Raises:
+        ValueError, the input parameters fail validation (see share_secret of schemes/sss.py)
+    '''
+    num_players = len(players)
+    secret_ints = [serialization.convert_bytestring_to_int(secret) for secret in secrets]
 
-    batch_keys, batch_vectors = defaultdict(dict), defaultdict(dict)
-    for player in players:  # generate n MAC keys k_ij and vectors t_ij = MAC(k_ij, s_j) per share s_j
-        keys, vectors = authentication.generate_batch(num_players, shares_map[player], max_secret_length + 1)
-        for player_id, key, vector in zip(players, keys, vectors):
-            batch_keys[player][player_id] = key
-            batch_vectors[player][player_id] = vector
+    # generate shares of every secret under the same prime and alphas
+    int_shares_list = [[pairing.elegant_pair(*share) for share in shares] for shares in
+                       sss._share_secrets_int(num_players,
+                                              reconstruction_threshold,
+                                              max_secret_length + 1,  # conversion to an integer adds one byte
+                                              secret_ints)]
 
-    return _make_robust_shares(shares_map, batch_keys, batch_vectors)
+    # generate n MAC keys and vectors for each share of each secret at once
+    all_shares = [share for int_shares in int_shares_list for share in int_shares]
+    macs = authentication.generate_batches(num_players, all_shares, max_secret_length + 1)
+
+    bundles = {player: [] for player in players}
+    for index, int_shares in enumerate(int_shares_list):
+        shares_map = {player: share for (player, share) in zip(players, int_shares)}
+
+        batch_keys, batch_vectors = {}, {}
+        for player, (keys, vectors) in zip(players, macs[index * num_players:(index + 1) * num_players]):
+            batch_keys[player] = dict(zip(players, keys))
+            batch_vectors[player] = dict(zip(players, vectors))
+
+        for player, robust_share in _make_robust_share_dicts(shares_map, batch_keys, batch_vectors).items():
+            bundles[player].append(robust_share)
+
+    return {player: _serialize_robust_bundle(bundle) for player, bundle in bundles.items()}
+
+
+def _make_refresh_updates(players, reconstruction_threshold, max_secret_length, num_secrets, alphas=None):
+    '''
+    Args:
+        players, the list of unique string ids for all players, in the order passed to share_authenticated_secret
+        reconstruction_threshold, the threshold used for sharing
+        max_secret_length, the maximum length of the secrets represented as a bytestring (ie, len(secret))
+        num_secrets, the number of secrets to refresh
+        alphas, see generate_refresh
+    Returns:
+        a list of num_secrets dictionaries of player ids to unserialized refresh updates, which are
+            dictionaries with the keys (alpha, delta, keys, vectors) described by generate_refresh
+    '''
+    # shares of zero: adding them changes every share but not the secret
+    zero_shares_list = sss._share_secrets_int(len(players), reconstruction_threshold, max_secret_length + 1,
+                                              [0] * num_secrets, alphas)
+
+    # the MAC is linear in the message, so a fresh MAC of zero plus the refreshed share is a fresh MAC of that share
+    macs = authentication.generate_batches(len(players), [0] * (num_secrets * len(players)), max_secret_length + 1)
+
+    updates_list = []
+    for index, zero_shares in enumerate(zero_shares_list):
+        batch_keys, batch_vectors = {}, {}
+        for player, (keys, vectors) in zip(players, macs[index * len(players):(index + 1) * len(players)]):
+            batch_keys[player] = dict(zip(players, keys))
+            batch_vectors[player] = dict(zip(players, vectors))
+
+        updates = {}
+        for player, (alpha, delta) in zip(players, zero_shares):
+            updates[player] = {'alpha': alpha, 'delta': delta,
+                               'keys': {other: batch_keys[other][player] for other in players},
+                               'vectors': batch_vectors[player]}
+        updates_list.append(updates)
+    return updates_list
+
+
+def generate_refresh(players, reconstruction_threshold, max_secret_length, alphas=None):
+    '''
+    Generate the updates that proactively re-randomize the robust shares of a secret without reconstructing it
+    Each player applies its own update with apply_refresh, so no party ever holds the shares or the secret together
+    Args:
+        players, the list of unique string ids for all players, in the order passed to share_authenticated_secret
+        reconstruction_threshold, the threshold used for sharing
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        alphas, an optional list parallel to players of the x values of their shares,
+            needed once players have been enrolled or revoked (see enroll_player)
+    Returns:
+        a dictionary of player ids to serialized refresh updates, which consist of
+            alpha, the x value of the player's share
+            delta, the value of a random polynomial with a zero constant term at alpha
+            keys, a map of player ids to new keys for the refreshed shares held by those players
+            vectors, a map of player ids to new vectors for the message zero
+    Raises:
+        ValueError, the input parameters fail validation (see share_secret of schemes/sss.py)
+    '''
+    updates = _make_refresh_updates(players, reconstruction_threshold, max_secret_length, 1, alphas)[0]
+    return {player: json.dumps(update) for player, update in updates.items()}
+
+
+def apply_refresh(num_players, max_secret_length, serialized_share, serialized_update):
+    '''
+    Args:
+        num_players, the length of the list of players passed to share_authenticated_secret
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        serialized_share, a robust share string dispersed from share_authenticated_secret (or a previous refresh)
+        serialized_update, the player's refresh update string from generate_refresh
+    Returns:
+        the refreshed robust share string, whose share and MACs are independent of those of serialized_share
+        but which reconstructs the same secret together with the other refreshed shares
+    Raises:
+        ValueError, the share or update is malformed, or the update is for a share at another x
+    '''
+    try:
+        robust_share = _deserialize_robust_share(serialized_share)
+        update = json.loads(serialized_update)
+        share = robust_share['share']
+        _assert_valid_share(share)
+        x, y = sss._add_shares_int(num_players, max_secret_length + 1,
+                                   pairing.elegant_unpair(share), (update['alpha'], update['delta']))
+        share = pairing.elegant_pair(x, y)
+
+        mac_prime = authentication.get_large_prime(max_secret_length + 1)
+        vectors = {other: (b, (share + tag) % mac_prime) for other, (b, tag) in update['vectors'].items()}
+        keys = update['keys']
+    except (KeyError, TypeError, AttributeError, AssertionError):
+        raise ValueError("malformed robust share or refresh update")
+    return _serialize_robust_share(share, keys, vectors)
+
+
+def iter_refresh_updates(players, reconstruction_threshold, max_secret_length, num_secrets, alphas=None):
+    '''
+    Streaming form of generate_refresh for a vault of many secrets shared among the same players
+    Args:
+        see generate_refresh
+        num_secrets, the number of secrets in the vault
+    Returns:
+        an iterator of num_secrets dictionaries of player ids to serialized refresh updates, one for each secret in order
+        randomness is drawn REFRESH_CHUNK_SIZE secrets at a time, so memory does not grow with the size of the vault
+    Raises:
+        ValueError, the input parameters fail validation (see share_secret of schemes/sss.py)
+    '''
+    sss._share_secrets_int(len(players), reconstruction_threshold, max_secret_length + 1, [0], alphas)  # validate up front
+
+    def iter_updates():
+        for start in range(0, num_secrets, REFRESH_CHUNK_SIZE):
+            for updates in _make_refresh_updates(players, reconstruction_threshold, max_secret_length,
+                                                 min(REFRESH_CHUNK_SIZE, num_secrets - start), alphas):
+                yield {player: json.dumps(update) for player, update in updates.items()}
+    return iter_updates()
+
+
+def refresh_vault(num_players, max_secret_length, serialized_shares, serialized_updates):
+    '''
+    Args:
+        num_players, the length of the list of players passed to share_authenticated_secret
+        max_secret_length, the maximum length of any secret represented as a bytestring (ie, len(secret))
+        serialized_shares, an iterable of one player's robust share strings, one for each secret in the vault
+        serialized_updates, an iterable of that player's refresh update strings, in the same order
+    Returns:
+        an iterator of the refreshed robust share strings (see apply_refresh), in the same order
+    Raises:
+        ValueError (while iterating), a share or update is malformed, or the iterables have different lengths
+    '''
+    sentinel = object()
+    shares_iter, updates_iter = iter(serialized_shares), iter(serialized_updates)
+    while True:
+        serialized_share, serialized_update = next(shares_iter, sentinel), next(updates_iter, sentinel)
+        if serialized_share is sentinel and serialized_update is sentinel:
+            return
+        if serialized_share is sentinel or serialized_update is sentinel:
+            raise ValueError("every share in the vault needs exactly one refresh update")
+        yield apply_refresh(num_players, max_secret_length, serialized_share, serialized_update)
+
+
+def enroll_player(players, reconstruction_threshold, max_secret_length, serialized_map, new_player, alpha=None):
+    '''
+    Issue a robust share to a new player without redealing the shares of the existing players
+    Only the 2n + 1 MACs that involve the new player are generated
+    The party running enrollment holds reconstruction_threshold shares, so it must be trusted with the secret
+    Args:
+        players, the list of unique string ids for all current players
+        reconstruction_threshold, the threshold used for sharing
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        serialized_map, a map of player string ids to the current robust share strings of at least
+            reconstruction_threshold players, from which the new share is interpolated
+        new_player, the string id of the player to enroll
+        alpha, the x value of the new share, which must not be used by any current share
+            (by default one more than the number of players and every x value in serialized_map,
+            which is only safe if the shares of all players enrolled earlier are in serialized_map)
+    Returns:
+        a tuple of
+            the serialized robust share of new_player
+            a dictionary of the current player ids to serialized updates for apply_membership_update
+    Raises:
+        ValueError, new_player is already a player or alpha is already in use
+        FatalReconstructionFailure, the shares in serialized_map could not be authenticated
+    '''
+    if new_player in players:
+        raise ValueError("the player is already enrolled")
+
+    _, valid_players, _ = reconstruct_authenticated_secret(len(players), reconstruction_threshold, max_secret_length,
+                                                           serialized_map)
+    points = [pairing.elegant_unpair(_deserialize_robust_share(serialized_map[player])['share']) for player in valid_players]
+    if alpha is None:
+        alpha = max([len(players)] + [x for x, _ in points]) + 1
+    share = pairing.elegant_pair(*sss._extend_shares_int(len(players), reconstruction_threshold, max_secret_length + 1,
+                                                         points, alpha))
+
+    # the new share is authenticated for every player, and every current share for the new player
+    # with MACs of zero that each player completes with its own share (see apply_membership_update)
+    new_keys, new_vectors = authentication.generate_batches(len(players) + 1, [share], max_secret_length + 1)[0]
+    zero_keys, zero_vectors = authentication.generate_batches(len(players), [0], max_secret_length + 1)[0]
+
+    keys = dict(zip(players, zero_keys))
+    keys[new_player] = new_keys[-1]
+    robust_share = {'share': share, 'keys': keys, 'vectors': dict(zip(list(players) + [new_player], new_vectors))}
+    updates = {player: json.dumps({'keys': {new_player: key}, 'vectors': {new_player: vector}, 'revoked': []})
+               for player, key, vector in zip(players, new_keys, zero_vectors)}
+    return json.dumps(robust_share), updates
+
+
+def revoke_player(players, revoked_player):
+    '''
+    Args:
+        players, the list of unique string ids for all current players
+        revoked_player, the string id of the player to remove
+    Returns:
+        a dictionary of the remaining player ids to serialized updates for apply_membership_update,
+        which drop the keys and vectors that involve revoked_player
+        the revoked share still lies on the sharing polynomial, so follow with generate_refresh to invalidate it
+    Raises:
+        ValueError, revoked_player is not a player
+    '''
+    if revoked_player not in players:
+        raise ValueError("unknown player")
+    return {player: json.dumps({'keys': {}, 'vectors': {}, 'revoked': [revoked_player]})
+            for player in players if player != revoked_player}
+
+
+def apply_membership_update(max_secret_length, serialized_share, serialized_update):
+    '''
+    Args:
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        serialized_share, the player's current robust share string
+        serialized_update, the player's update string from enroll_player or revoke_player
+    Returns:
+        the robust share string with the keys and vectors of enrolled players added
+        and those of revoked players removed
+    Raises:
+        ValueError, the share or update is malformed
+    '''
+    try:
+        robust_share = _deserialize_robust_share(serialized_share)
+        update = json.loads(serialized_update)
+        share, keys, vectors = robust_share['share'], robust_share['keys'], robust_share['vectors']
+        _assert_valid_share(share)
+
+        mac_prime = authentication.get_large_prime(max_secret_length + 1)
+        keys.update(update['keys'])
+        vectors.update({other: (b, (share + tag) % mac_prime) for other, (b, tag) in update['vectors'].items()})
+        for player in update['revoked']:
+            keys.pop(player, None)
+            vectors.pop(player, None)
+    except (KeyError, TypeError, AttributeError, AssertionError):
+        raise ValueError("malformed robust share or membership update")
+    return _serialize_robust_share(share, keys, vectors)
 
 
 def _map_player_to_attributes(robust_shares_map, invalid_players):
@@ -117,7 +595,7 @@ def _map_player_to_attributes(robust_shares_map, invalid_players):
             share = robust_shares_map[player]["share"]
             keys = robust_shares_map[player]["keys"]
             vectors = robust_shares_map[player]["vectors"]
-        except KeyError:
+        except (KeyError, TypeError):
             invalid_players.add(player)
         else:
             shares_map[player] = share
@@ -126,13 +604,16 @@ def _map_player_to_attributes(robust_shares_map, invalid_players):
     return shares_map, keys_for_players, vectors_from_players
 
 
-def _assert_valid_share(share):
+def _assert_valid_share(share, share_bound=None):
     '''
     Asserts valid structure for the given share
     Args:
         share, an integer share
+        share_bound, an optional bound (see _get_field_bounds) that the share must be below
     '''
-    assert isinstance(share, (int, long))
+    assert isinstance(share, _INTEGER_TYPES)
+    if share_bound is not None:
+        assert 0 <= share < share_bound
 
 
 def _assert_valid_keys(players, keys):
@@ -145,7 +626,7 @@ def _assert_valid_keys(players, keys):
     assert isinstance(keys, dict)
     for target in players:
         assert target in keys.keys()
-        assert isinstance(keys[target], (int, long))
+        assert isinstance(keys[target], _INTEGER_TYPES)
 
 
 def _assert_valid_vectors(players, vectors):
@@ -159,11 +640,11 @@ def _assert_valid_vectors(players, vectors):
     for target in players:
         assert target in vectors.keys()
         assert len(vectors[target]) == 2
-        assert isinstance(vectors[target][0], (int, long))
-        assert isinstance(vectors[target][1], (int, long))
+        assert isinstance(vectors[target][0], _INTEGER_TYPES)
+        assert isinstance(vectors[target][1], _INTEGER_TYPES)
 
 
-def _validate_attributes(players, shares_map, keys_for_players, vectors_from_players, invalid_players):
+def _validate_attributes(players, shares_map, keys_for_players, vectors_from_players, invalid_players, share_bound=None):
     '''
     Will validate the structure of all shares, keys, and vectors and add violating players to the invalid_players list
     Args:
@@ -172,10 +653,11 @@ def _validate_attributes(players, shares_map, keys_for_players, vectors_from_pla
         keys_for_players, a map of string players ids to keys associated with others players' shares
         vectors_from_players, a map of string players ids to vectors associated with those players shares
         invalid_players, a growing set of players who cause structural errors
+        share_bound, an optional bound (see _get_field_bounds) that every share must be below
     '''
     for player, share, keys, vectors in zip(players, shares_map.values(), keys_for_players.values(), vectors_from_players.values()):
         try:
-            _assert_valid_share(share)
+            _assert_valid_share(share, share_bound)
             _assert_valid_keys(players, keys)
             _assert_valid_vectors(players, vectors)
         except AssertionError:
@@ -199,23 +681,121 @@ def _clean_map(players, shares_map, keys_for_players, vectors_from_players, inva
             del vectors_from_players[player]
 
 
-def _get_player_to_verifies_map(shares_map, keys_for_players, vectors_from_players, max_secret_length):
+def _count(stats, name, amount=1):
+    '''
+    Args:
+        stats, an optional dictionary of counter names to integer counts
+        name, the name of the counter to increment
+        amount, the amount to add to the counter
+    Raises:
+        BudgetExceeded, stats is a ReconstructionBudget whose limit for the counter is exceeded
+    '''
+    if stats is not None:
+        stats[name] = stats.get(name, 0) + amount
+
+
+def _charge_bytes(stats, serialized):
     '''
+    Adds the length of a string that is about to be parsed to the bytes parsed
     Args:
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+        serialized, a string that is about to be parsed
+    Raises:
+        ValueError, stats is a ReconstructionBudget that parsing the string would exceed (nothing is added)
+    '''
+    if isinstance(stats, ReconstructionBudget) and not stats.allows("bytes_parsed", len(serialized)):
+        raise ValueError("parsing the string would exceed the bytes_parsed budget")
+    _count(stats, "bytes_parsed", len(serialized))
+
+
+def _authenticate_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length, stats=None):
+    '''
+    Args:
+        verifier, the string id of the player whose keys are used for authentication
         shares_map, a mapping of player string ids to integer shares
         keys_for_players, a mapping of player string ids to maps of keys to associate with other players
         vectors_from_players, a mapping of player string ids to maps of vectors associated with this player's share
         max_secret_length, the max length of the share if it were represented as a bytestring
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+    Returns:
+        a sorted tuple of the players whose shares are authenticated by the keys of verifier
+    '''
+    _count(stats, "mac_checks", len(shares_map))
+    return tuple(sorted(player for player, share in shares_map.items()
+                        if authentication.validate(keys_for_players[verifier][player], vectors_from_players[player][verifier],
+                                                   share, max_secret_length + 1)))
+
+
+def _get_checks_digest(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length):
+    '''
+    Args:
+        see _get_verified_players
+    Returns:
+        a hex string digest of the key row of verifier along with every player's share and vector for that verifier
+    '''
+    digest = hashlib.sha256(format(max_secret_length, 'x').encode('ascii'))
+    for player in sorted(shares_map.keys()):
+        vector = vectors_from_players[player][verifier]
+        player_id = player.encode('utf-8')
+        values = (len(player_id), keys_for_players[verifier][player], vector[0], vector[1], shares_map[player])
+        digest.update((':'.join(format(value, 'x') for value in values) + ':').encode('ascii') + player_id + b';')
+    return digest.hexdigest()
+
+
+def _get_cached_verified_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length,
+                                 verification_cache, stats=None):
+    '''
+    Args:
+        see _authenticate_players
+        verification_cache, a cache (see crypto_tools/caching.py) of check digests to the players that passed those checks
+    Returns:
+        a sorted tuple of the players whose shares are authenticated by the keys of verifier
+        checks of a key row, shares and vectors that were seen before are answered by verification_cache
+    '''
+    digest = _get_checks_digest(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length)
+    verified = verification_cache.get(digest)
+    if verified is None:
+        verified = _authenticate_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length, stats)
+        verification_cache.put(digest, list(verified))
+    return tuple(verified)
+
+
+def _get_verified_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length,
+                          verification_cache=None, stats=None):
+    '''
+    Args:
+        see _authenticate_players
+        verification_cache, an optional cache (see crypto_tools/caching.py) of previously computed verifications
+    Returns:
+        a sorted tuple of the players whose shares are authenticated by the keys of verifier
+    '''
+    if verification_cache is None:
+        return _authenticate_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length, stats)
+    return _get_cached_verified_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length,
+                                        verification_cache, stats)
+
+
+def _get_player_to_verifies_map(shares_map, keys_for_players, vectors_from_players, max_secret_length,
+                                verification_cache=None, stats=None):
+    '''
+    Args:
+        shares_map, a mapping of player string ids to integer shares
+        keys_for_players, a mapping of player string ids to maps of keys to associate with other players
+        vectors_from_players, a mapping of player string ids to maps of vectors associated with this player's share
+        max_secret_length, the max length of the share if it were represented as a bytestring
+        verification_cache, an optional cache (see crypto_tools/caching.py) of previously computed verifications
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
     Returns:
         a mapping from player string id (verifier) to a tuple of players verified by the verifier
     '''
-    verifies = defaultdict(list)
+    verifies = {}
     for verifier in shares_map.keys():
-        for player, share in shares_map.items():
-            if authentication.validate(keys_for_players[verifier][player], vectors_from_players[player][verifier], share, max_secret_length + 1):
-                verifies[verifier].append(player)
-    # return a dictionary that can be inverted - the value is a tuple (hashable) and sorted (in preparation for equality checks)
-    return {verifier: tuple(sorted(players)) for verifier, players in verifies.items()}
+        verified = _get_verified_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length,
+                                         verification_cache, stats)
+        if verified:
+            # the value is a tuple (hashable) and sorted (in preparation for equality checks) so that it can be inverted
+            verifies[verifier] = verified
+    return verifies
 
 
 def _get_bytestring_secret(shares, num_players, max_secret_length):
@@ -232,7 +812,30 @@ def _get_bytestring_secret(shares, num_players, max_secret_length):
     return serialization.convert_int_to_bytestring(sss._reconstruct_secret_int(num_players, max_secret_length + 1, tuple_shares))
 
 
-def _get_player_to_secret_map(verifies_map, shares_map, num_players, reconstruction_threshold, max_secret_length):
+def _get_quorum_secret(players, shares_map, num_players, reconstruction_threshold, max_secret_length, stats=None):
+    '''
+    Args:
+        players, a sorted tuple of player string ids whose shares were verified together
+        shares_map, a mapping of player string ids to integer shares
+        num_players, the total number of original shares
+        reconstruction_threshold, the number of honest players required for secret reconstruction
+        max_secret_length, the max length of the share if it were represented as a bytestring
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+    Returns:
+        the bytestring secret reconstructed from the shares of the given players,
+        or None if those shares do not lie on a single sharing polynomial (so they cannot all be honest)
+    '''
+    tuple_shares = [pairing.elegant_unpair(shares_map[player]) for player in players]
+    if not sss._shares_are_consistent_int(num_players, reconstruction_threshold, max_secret_length + 1, tuple_shares):
+        return None
+
+    # the shares are consistent, so any reconstruction_threshold of them determine the secret
+    _count(stats, "interpolations")
+    secret_int = sss._reconstruct_secret_int(num_players, max_secret_length + 1, tuple_shares, reconstruction_threshold)
+    return serialization.convert_int_to_bytestring(secret_int)
+
+
+def _get_player_to_secret_map(verifies_map, shares_map, num_players, reconstruction_threshold, max_secret_length, stats=None):
     '''
     Args:
         verifies_map, a mapping from player string id (verifier) to a tuple of players verified by the verifier
@@ -240,17 +843,56 @@ def _get_player_to_secret_map(verifies_map, shares_map, num_players, reconstruct
         num_players, the total number of original shares (may be greater than or equal to len(verifies_map))
         reconstruction_threshold, the number of honest players required for secret reconstruction
         max_secret_length, the max length of the share if it were represented as a bytestring
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
     Returns:
         a mapping from player string ids to bytestring secrets
         that are reconstructed based on the shares verified by that player
     '''
+    # verifiers who authenticated the same set of players reconstruct the same secret,
+    # so only interpolate once for each distinct candidate quorum
+    quorums = _invert_and_combine_by_value(verifies_map)
+
     secret_map = {}
-    for verifier, players in verifies_map.items():
+    for players, verifiers in quorums.items():
         if len(players) >= reconstruction_threshold:
-            secret_map[verifier] = _get_bytestring_secret([shares_map[player] for player in players], num_players, max_secret_length)
+            secret = _get_quorum_secret(players, shares_map, num_players, reconstruction_threshold, max_secret_length, stats)
+            if secret is not None:  # verifiers of an inconsistent set of shares abstain
+                for verifier in verifiers:
+                    secret_map[verifier] = secret
     return secret_map
 
 
+def _get_lazy_player_to_secret_map(shares_map, keys_for_players, vectors_from_players, num_players, reconstruction_threshold,
+                                   max_secret_length, verification_cache=None, stats=None):
+    '''
+    Authenticates shares one verifier at a time, reconstructing each new candidate quorum as soon as it appears,
+    and stops once the votes of the remaining verifiers can no longer change the result of _vote
+    Args:
+        see _get_player_to_verifies_map and _get_player_to_secret_map
+    Returns:
+        a tuple of (verifies_map, secret_map) as returned by _get_player_to_verifies_map and _get_player_to_secret_map
+        restricted to the verifiers that were consulted before the vote was settled
+    '''
+    verifies_map, secret_map, quorum_secrets = {}, {}, {}
+    verifiers = sorted(shares_map.keys())
+    for index, verifier in enumerate(verifiers):
+        verified = _get_verified_players(verifier, shares_map, keys_for_players, vectors_from_players, max_secret_length,
+                                         verification_cache, stats)
+        if verified:
+            verifies_map[verifier] = verified
+        if len(verified) >= reconstruction_threshold:
+            if verified not in quorum_secrets:
+                quorum_secrets[verified] = _get_quorum_secret(verified, shares_map, num_players, reconstruction_threshold,
+                                                              max_secret_length, stats)
+            if quorum_secrets[verified] is not None:  # verifiers of an inconsistent set of shares abstain
+                secret_map[verifier] = quorum_secrets[verified]
+
+        num_remaining = len(verifiers) - index - 1
+        if _is_vote_settled(_invert_and_combine_by_value(secret_map), num_remaining, reconstruction_threshold):
+            break
+    return verifies_map, secret_map
+
+
 def _invert_and_combine_by_value(original_dict):
     '''
     Args:
@@ -280,13 +922,48 @@ def _vote(voting_blocks, reconstruction_threshold):
     return authorized
 
 
-def reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_secret_length, serialized_map):
+def _is_vote_settled(voting_blocks, num_remaining, reconstruction_threshold):
+    '''
+    Args:
+        voting_blocks, a dictionary of reconstructed bytestring secrets to
+            the list of players who reconstructed that secret from their authenticated shares
+        num_remaining, the number of verifiers whose votes have not been counted yet
+        reconstruction_threshold, the number of honest players required for reconstruction
+    Returns:
+        True if the result of _vote is decided regardless of how the remaining verifiers vote, False otherwise
+    '''
+    counts = sorted([len(verifiers) for verifiers in voting_blocks.values()], reverse=True) + [0, 0]
+    if counts[1] >= reconstruction_threshold:  # at least two secrets are already authorized, so reconstruction fails
+        return True
+
+    # neither the runner-up nor a secret without votes may still reach the threshold,
+    # and the leading secret must either be authorized already or be unable to become authorized
+    return counts[1] + num_remaining < reconstruction_threshold and \
+        (counts[0] >= reconstruction_threshold or counts[0] + num_remaining < reconstruction_threshold)
+
+
+def reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_secret_length, serialized_map,
+                                     verification_cache=None, lazy=False, stats=None):
     '''
     Args:
         num_players, the length of the list of players passed to share_authenticated_secret
         reconstruction_threshold, the number of shares needed for reconstruction
         max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
         serialized_map, a map of valid player string ids to serialized robust share strings dispersed from share_authenticated_secret
+        verification_cache, an optional crypto_tools.caching.LRUCache or crypto_tools.caching.SQLiteCache
+            that remembers which players each verifier authenticated, so that reconstructing an unchanged
+            set of shares again skips the authentication checks
+        lazy, if True, authenticate shares one verifier at a time and stop as soon as the vote is settled
+            the secret (or failure) is the same as in the default mode, but fewer verifiers may be consulted
+        stats, an optional dictionary that is updated with the counts of the work performed:
+            "mac_checks" (authentication checks), "interpolations" (reconstructions of candidate secrets),
+            "inversions" (modular inversions), "bytes_parsed"
+            and "candidate_secrets" (the distinct secrets voted on)
+            if stats is a tracing.Tracer, the wall time of the phases "deserialize", "validate", "verify",
+            "reconstruct" (or "verify_and_reconstruct" when lazy) and "vote" is also recorded in stats.timings
+            if stats is a ReconstructionBudget, the bytes parsed, authentication checks and interpolations are capped
+    Any share holding an integer beyond the size of the sharing or authentication fields is rejected
+    before that integer is converted, as a structural error
     Returns:
         if the number of dishonest players was less than reconstruction_threshold,
         a successful return contains a tuple of
@@ -295,26 +972,95 @@ def reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_
             a non-exhaustive list of dishonest players (specifically those whose shares caused structural errors)
     Raises:
         FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+        BudgetExceeded, a FatalReconstructionFailure raised when stats is a ReconstructionBudget that was exceeded
     '''
     invalid_players = set()
     robust_shares_map = {}
-    for player, robust_share in serialized_map.items():
-        try:
-            robust_shares_map[player] = _deserialize_robust_share(robust_share)
-        except ValueError:
-            invalid_players.add(player)
+    max_digits = _get_field_bounds(num_players, max_secret_length)[1]
+    with tracing.phase(stats, "deserialize"):
+        for player, robust_share in serialized_map.items():
+            try:
+                _charge_bytes(stats, robust_share)
+                robust_shares_map[player] = _deserialize_robust_share(robust_share, max_digits)
+            except (ValueError, AssertionError):
+                invalid_players.add(player)
+
+    return _reconstruct_from_robust_shares(num_players, reconstruction_threshold, max_secret_length, robust_shares_map,
+                                           invalid_players, verification_cache, lazy, stats)
+
+
+def _reconstruct_from_robust_shares(num_players, reconstruction_threshold, max_secret_length, robust_shares_map,
+                                    invalid_players, verification_cache=None, lazy=False, stats=None):
+    '''
+    Args:
+        see reconstruct_authenticated_secret
+        robust_shares_map, a map of player string ids to deserialized robust share dictionaries
+        invalid_players, a growing set of players whose shares cause structural errors
+    Returns:
+        see reconstruct_authenticated_secret
+    Raises:
+        FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+    '''
+    inversions = polynomials.get_inversion_count()
+    try:
+        return _reconstruct_from_attributes(num_players, reconstruction_threshold, max_secret_length, robust_shares_map,
+                                            invalid_players, verification_cache, lazy, stats)
+    finally:
+        _count(stats, "inversions", polynomials.get_inversion_count() - inversions)
+
+
+def _reconstruct_from_attributes(num_players, reconstruction_threshold, max_secret_length, robust_shares_map,
+                                 invalid_players, verification_cache, lazy, stats):
+    '''
+    Args:
+        see _reconstruct_from_robust_shares
+    Returns:
+        see reconstruct_authenticated_secret
+    Raises:
+        FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+    '''
+    with tracing.phase(stats, "validate"):
+        shares_map, keys_for_players, vectors_from_players = _map_player_to_attributes(robust_shares_map, invalid_players)
+        players = list(shares_map.keys())
+        _validate_attributes(players, shares_map, keys_for_players, vectors_from_players, invalid_players,
+                             _get_field_bounds(num_players, max_secret_length)[0])
+
+        # now that the set of invalid_players has been finalized, remove these players from the working dictionaries
+        _clean_map(players, shares_map, keys_for_players, vectors_from_players, invalid_players)
 
-    shares_map, keys_for_players, vectors_from_players = _map_player_to_attributes(robust_shares_map, invalid_players)
-    players = shares_map.keys()
-    _validate_attributes(players, shares_map, keys_for_players, vectors_from_players, invalid_players)
+    if lazy:
+        with tracing.phase(stats, "verify_and_reconstruct"):
+            verifies_map, secret_map = _get_lazy_player_to_secret_map(shares_map, keys_for_players, vectors_from_players,
+                                                                      num_players, reconstruction_threshold,
+                                                                      max_secret_length, verification_cache, stats)
+    else:
+        with tracing.phase(stats, "verify"):
+            verifies_map = _get_player_to_verifies_map(shares_map, keys_for_players, vectors_from_players,
+                                                       max_secret_length, verification_cache, stats)
+        with tracing.phase(stats, "reconstruct"):
+            secret_map = _get_player_to_secret_map(verifies_map, shares_map, num_players, reconstruction_threshold,
+                                                   max_secret_length, stats)
 
-    # now that the set of invalid_players has been finalized, remove these players from the working dictionaries
-    _clean_map(players, shares_map, keys_for_players, vectors_from_players, invalid_players)
+    return _settle_vote(verifies_map, secret_map, reconstruction_threshold, invalid_players, stats)
 
-    verifies_map = _get_player_to_verifies_map(shares_map, keys_for_players, vectors_from_players, max_secret_length)
-    secret_map = _get_player_to_secret_map(verifies_map, shares_map, num_players, reconstruction_threshold, max_secret_length)
-    voting_blocks = _invert_and_combine_by_value(secret_map)
-    authorized = _vote(voting_blocks, reconstruction_threshold)
+
+def _settle_vote(verifies_map, secret_map, reconstruction_threshold, invalid_players, stats=None):
+    '''
+    Args:
+        verifies_map, a mapping from player string id (verifier) to a tuple of players verified by the verifier
+        secret_map, a mapping from player string ids to the bytestring secrets they reconstructed
+        reconstruction_threshold, the number of honest players required for reconstruction
+        invalid_players, the finalized set of players whose shares cause structural errors
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+    Returns:
+        see reconstruct_authenticated_secret
+    Raises:
+        FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+    '''
+    with tracing.phase(stats, "vote"):
+        voting_blocks = _invert_and_combine_by_value(secret_map)
+        authorized = _vote(voting_blocks, reconstruction_threshold)
+    _count(stats, "candidate_secrets", len(voting_blocks))
 
     if len(authorized) != 1:  # authenticated reconstruction cannot be guaranteed
         raise FatalReconstructionFailure
@@ -325,6 +1071,406 @@ def reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_
     return secret, list(verified_players), list(invalid_players)
 
 
+def _get_agreed_length(lengths, reconstruction_threshold):
+    '''
+    Args:
+        lengths, a list of the lengths of the bundles of every player
+        reconstruction_threshold, the number of honest players required for reconstruction
+    Returns:
+        the only length shared by at least reconstruction_threshold bundles
+    Raises:
+        FatalReconstructionFailure, no single length is shared by reconstruction_threshold bundles
+    '''
+    agreed = [length for length in set(lengths) if lengths.count(length) >= reconstruction_threshold]
+    if len(agreed) != 1:
+        raise FatalReconstructionFailure
+    return agreed[0]
+
+
+def reconstruct_authenticated_secrets(num_players, reconstruction_threshold, max_secret_length, bundle_map,
+                                      verification_cache=None, lazy=False, stats=None, num_secrets=None):
+    '''
+    Batch form of reconstruct_authenticated_secret for the bundles dispersed from share_authenticated_secrets
+    Each bundle is deserialized once, and the Lagrange weights and parity checks of the committee
+    are computed for the first secret and served from their caches for the rest of the batch
+    Args:
+        num_players, the length of the list of players passed to share_authenticated_secrets
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of any secret represented as a bytestring (ie, len(secret))
+        bundle_map, a map of valid player string ids to serialized bundles dispersed from share_authenticated_secrets
+            a player whose bundle cannot be parsed or does not hold num_secrets shares is treated as dishonest for every secret
+        verification_cache, lazy, stats, see reconstruct_authenticated_secret (shared by the whole batch)
+        num_secrets, the number of secrets passed to share_authenticated_secrets, or None for the length
+            of at least reconstruction_threshold of the bundles
+    Returns:
+        a list with one entry per secret, in the order the secrets were passed to share_authenticated_secrets, of either
+            the tuple returned by reconstruct_authenticated_secret for that secret
+            or the FatalReconstructionFailure raised for that secret
+    Raises:
+        FatalReconstructionFailure, num_secrets was not given and no reconstruction_threshold bundles agree on a length
+    '''
+    broken_players = set()
+    bundles = {}
+    max_digits = _get_field_bounds(num_players, max_secret_length)[1]
+    for player, serialized_bundle in bundle_map.items():
+        try:
+            _charge_bytes(stats, serialized_bundle)
+            bundle = _deserialize_robust_bundle(serialized_bundle, max_digits)
+            assert isinstance(bundle, list)
+        except (ValueError, AssertionError):
+            broken_players.add(player)
+        else:
+            bundles[player] = bundle
+
+    if num_secrets is None:
+        num_secrets = _get_agreed_length([len(bundle) for bundle in bundles.values()], reconstruction_threshold)
+    for player in list(bundles.keys()):
+        if len(bundles[player]) != num_secrets:  # so that no player can make the batch longer or shift its secrets
+            broken_players.add(player)
+            del bundles[player]
+
+    results = []
+    for index in range(num_secrets):
+        robust_shares_map = {player: bundle[index] for player, bundle in bundles.items()}
+        try:
+            results.append(_reconstruct_from_robust_shares(num_players, reconstruction_threshold, max_secret_length,
+                                                           robust_shares_map, set(broken_players),
+                                                           verification_cache, lazy, stats))
+        except FatalReconstructionFailure as failure:
+            results.append(failure)
+    return results
+
+
+class Reconstructor(object):
+    '''
+    Incremental robust reconstruction of a secret from robust shares that arrive one at a time
+    Each new share adds one row (the players it verifies) and one column (the verifiers of its share)
+    to the verification matrix, and only the candidate secrets of verifiers whose verified set changed
+    are reconstructed again. The secret is decided as soon as the shares still missing cannot change the vote.
+    '''
+
+    def __init__(self, players, reconstruction_threshold, max_secret_length, stats=None):
+        '''
+        Args:
+            players, the list of unique string ids for all players passed to share_authenticated_secret
+            reconstruction_threshold, the number of shares needed for reconstruction
+            max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+            stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+        '''
+        self.players = list(players)
+        self.reconstruction_threshold = reconstruction_threshold
+        self.max_secret_length = max_secret_length
+        self.stats = stats
+        self.invalid_players = set()
+        self._share_bound, self._max_digits = _get_field_bounds(len(self.players), max_secret_length)
+        self._shares_map, self._keys_for_players, self._vectors_from_players = {}, {}, {}
+        self._verifies = {}  # verifier to the set of players it authenticated
+        self._quorum_secrets = {}  # sorted tuple of players to their candidate secret (or None if inconsistent)
+        self._secret_map = {}  # verifier to the candidate secret of its verified set
+        self._outcome = None
+
+    @property
+    def num_remaining(self):
+        '''
+        Returns:
+            the number of players whose shares have not been added yet
+        '''
+        return len(self.players) - len(self._shares_map) - len(self.invalid_players)
+
+    @property
+    def decided(self):
+        '''
+        Returns:
+            True once result will return or raise without waiting for more shares, False otherwise
+        '''
+        return self._outcome is not None
+
+    def add_share(self, player, serialized_share):
+        '''
+        Args:
+            player, the string id of the player who holds the share
+            serialized_share, the robust share string dispersed to that player from share_authenticated_secret
+                a share with structural errors marks its player as dishonest
+        Returns:
+            True if the secret has been decided (see result), False otherwise
+            shares added after the decision are ignored
+        Raises:
+            ValueError, player is not one of the players or has already added a share
+        '''
+        if player not in self.players:
+            raise ValueError("unknown player")
+        if player in self._shares_map or player in self.invalid_players:
+            raise ValueError("player has already added a share")
+        if self.decided:
+            return True
+
+        try:
+            _charge_bytes(self.stats, serialized_share)
+            robust_share = _deserialize_robust_share(serialized_share, self._max_digits)
+            share, keys, vectors = robust_share["share"], robust_share["keys"], robust_share["vectors"]
+            _assert_valid_share(share, self._share_bound)
+            _assert_valid_keys(self.players, keys)  # the other shares may still arrive, so expect every player
+            _assert_valid_vectors(self.players, vectors)
+        except (ValueError, KeyError, TypeError, AssertionError):
+            self.invalid_players.add(player)
+        else:
+            try:
+                self._add_valid_share(player, share, keys, vectors)
+            except BudgetExceeded as failure:
+                self._outcome = failure
+                return True
+
+        self._decide(self.num_remaining == 0)
+        return self.decided
+
+    def finish(self):
+        '''
+        Decides the secret from the shares added so far, treating the shares still missing as never arriving
+        The result is then the same as that of reconstruct_authenticated_secret on the shares added so far
+        '''
+        self._decide(True)
+
+    def result(self):
+        '''
+        Returns:
+            the tuple returned by reconstruct_authenticated_secret
+            if fewer than reconstruction_threshold players are dishonest, an early decision agrees with the decision
+            on all shares, since an honest verifier only authenticates honest shares and never changes its vote
+        Raises:
+            FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+            ValueError, the secret has not been decided yet (add more shares or call finish)
+        '''
+        if not self.decided:
+            raise ValueError("the secret has not been decided yet")
+        if isinstance(self._outcome, FatalReconstructionFailure):
+            raise self._outcome
+        return self._outcome
+
+    def _add_valid_share(self, player, share, keys, vectors):
+        '''
+        Extends the verification matrix with the row and column of a structurally valid share
+        and updates the candidate secrets of the verifiers whose verified set changed
+        '''
+        self._shares_map[player] = share
+        self._keys_for_players[player] = keys
+        self._vectors_from_players[player] = vectors
+
+        # the new column: which earlier verifiers authenticate the new share
+        changed = [player]
+        _count(self.stats, "mac_checks", len(self._verifies))
+        for verifier, verified in self._verifies.items():
+            if authentication.validate(self._keys_for_players[verifier][player],
+                                       vectors[verifier], share, self.max_secret_length + 1):
+                verified.add(player)
+                changed.append(verifier)
+
+        # the new row: which shares the keys of the new player authenticate
+        self._verifies[player] = set(_authenticate_players(player, self._shares_map, self._keys_for_players,
+                                                           self._vectors_from_players, self.max_secret_length, self.stats))
+
+        for verifier in changed:
+            verified = tuple(sorted(self._verifies[verifier]))
+            self._secret_map.pop(verifier, None)
+            if len(verified) >= self.reconstruction_threshold:
+                if verified not in self._quorum_secrets:
+                    self._quorum_secrets[verified] = _get_quorum_secret(verified, self._shares_map, len(self.players),
+                                                                        self.reconstruction_threshold,
+                                                                        self.max_secret_length, self.stats)
+                if self._quorum_secrets[verified] is not None:  # verifiers of an inconsistent set of shares abstain
+                    self._secret_map[verifier] = self._quorum_secrets[verified]
+
+    def _decide(self, final):
+        '''
+        Args:
+            final, True if no more shares will be added
+        Records the outcome once the vote can no longer change
+        '''
+        if self.decided:
+            return
+        voting_blocks = _invert_and_combine_by_value(self._secret_map)
+        authorized = _vote(voting_blocks, self.reconstruction_threshold)
+        if not final:
+            # a failure is only decided once every share is in, since a dishonest verifier may still change its vote,
+            # and verifiers who abstain so far may still vote once more shares arrive
+            num_abstaining = len(self._verifies) - len(self._secret_map)
+            if len(authorized) != 1 or \
+                    not _is_vote_settled(voting_blocks, self.num_remaining + num_abstaining, self.reconstruction_threshold):
+                return
+
+        if len(authorized) != 1:  # authenticated reconstruction cannot be guaranteed
+            self._outcome = FatalReconstructionFailure()
+            return
+
+        secret, voting_players = authorized[0]
+        verified_players = {player for voter in voting_players for player in self._verifies[voter]}
+        self._outcome = (secret, list(verified_players), list(self.invalid_players))
+
+
+def _get_share_digest(player, share, max_secret_length):
+    '''
+    Args:
+        player, a player string id
+        share, the integer share of player
+        max_secret_length, the max length of the share if it were represented as a bytestring
+    Returns:
+        a short hex string digest that binds the share to the player
+    '''
+    player_id = player.encode('utf-8')
+    values = (max_secret_length, len(player_id), share)
+    digest = hashlib.sha256((':'.join(format(value, 'x') for value in values) + ':').encode('ascii') + player_id)
+    return digest.hexdigest()[:SHARE_DIGEST_LENGTH]
+
+
+def _serialize_verification(bitmap, digests):
+    '''
+    Args:
+        bitmap, an integer whose bit i is set if the i-th of the sorted players was verified
+        digests, a list of the digests (see _get_share_digest) of the verified shares, in the order of their bits
+    Returns:
+        a serialized verification string that encodes the arguments in a dictionary with keys: verified, digests
+    '''
+    return json.dumps({'verified': bitmap, 'digests': digests})
+
+
+def _deserialize_verification(serialized_verification, players):
+    '''
+    Args:
+        serialized_verification, a string created by _serialize_verification
+        players, the sorted list of players that the bits of the bitmap refer to
+    Returns:
+        a dictionary of the verified players to the digests of their shares
+    Raises:
+        ValueError, the verification is malformed
+    '''
+    verification = _loads(serialized_verification, len(players) * 30103 // 100000 + 1)
+    try:
+        bitmap, digests = verification["verified"], verification["digests"]
+        assert isinstance(bitmap, _INTEGER_TYPES) and 0 <= bitmap and not bitmap >> len(players)
+        verified = [player for index, player in enumerate(players) if bitmap >> index & 1]
+        assert isinstance(digests, list) and len(digests) == len(verified)
+    except (KeyError, TypeError, AssertionError):
+        raise ValueError("malformed verification")
+    return dict(zip(verified, digests))
+
+
+def verify_peers(players, max_secret_length, verifier, serialized_share, serialized_map, stats=None):
+    '''
+    Authenticates the shares of the other players with the keys of a single verifier, on the verifier's own machine
+    Only the share of each player and its vector for verifier are read from serialized_map, so players may send
+    each verifier just those, and the verifier's keys never leave it
+    Args:
+        players, the list of players passed to share_authenticated_secret
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        verifier, the string id of the player running the verification
+        serialized_share, the serialized robust share of verifier
+        serialized_map, a map of other player string ids to their serialized robust shares
+            players whose shares are malformed or fail authentication are not verified
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+    Returns:
+        a serialized verification string for reconstruct_from_verifications, which holds a bitmap of the verified
+        players (bit i for the i-th of the sorted players, including verifier itself) and a short digest of each
+        of their shares
+    Raises:
+        ValueError, verifier is not one of players or its own robust share is malformed
+    '''
+    ordered = sorted(players)
+    if verifier not in ordered:
+        raise ValueError("the verifier is not one of the players")
+    share_bound, max_digits = _get_field_bounds(len(ordered), max_secret_length)
+    try:
+        own = _deserialize_robust_share(serialized_share, max_digits)
+        keys, shares_map, vectors_map = own["keys"], {verifier: own["share"]}, {verifier: own["vectors"]}
+        _assert_valid_share(shares_map[verifier], share_bound)
+        _assert_valid_keys(ordered, keys)
+        _assert_valid_vectors([verifier], vectors_map[verifier])
+    except (ValueError, KeyError, TypeError, AssertionError):
+        raise ValueError("malformed robust share for the verifier")
+
+    for player, robust_share in serialized_map.items():
+        if player == verifier or player not in ordered:
+            continue
+        try:
+            _charge_bytes(stats, robust_share)
+            robust_share = _deserialize_robust_share(robust_share, max_digits)
+            share, vectors = robust_share["share"], robust_share["vectors"]
+            _assert_valid_share(share, share_bound)
+            _assert_valid_vectors([verifier], vectors)
+        except (ValueError, KeyError, TypeError, AssertionError):
+            continue  # players who cause structural errors are not verified
+        shares_map[player], vectors_map[player] = share, vectors
+
+    verified = _authenticate_players(verifier, shares_map, {verifier: keys}, vectors_map, max_secret_length, stats)
+    bitmap = sum(1 << index for index, player in enumerate(ordered) if player in verified)
+    return _serialize_verification(bitmap, [_get_share_digest(player, shares_map[player], max_secret_length)
+                                            for player in verified])
+
+
+def reconstruct_from_verifications(players, reconstruction_threshold, max_secret_length, serialized_map,
+                                   verifications_map, stats=None):
+    '''
+    Votes on the secret with the verifications each player computed locally by verify_peers,
+    so that no authentication keys or vectors need to reach the combiner
+    A verifier only vouches for the shares in serialized_map that are the ones it authenticated, so a player who sends
+    different shares to the verifiers and to the combiner is left out of the verified sets, as a corrupt share would be
+    Args:
+        players, the list of players passed to share_authenticated_secret
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        serialized_map, a map of valid player string ids to serialized robust shares dispersed from share_authenticated_secret
+            robust shares may omit their keys and vectors entirely
+        verifications_map, a map of player string ids to the serialized verifications returned by verify_peers
+        stats, an optional dictionary of counters (see reconstruct_authenticated_secret)
+    Returns:
+        see reconstruct_authenticated_secret
+        (the dishonest players are those whose shares or verifications caused structural errors,
+        and their shares are not used even when other players verified them)
+    Raises:
+        FatalReconstructionFailure, authenticated reconstruction could not be guaranteed
+    '''
+    ordered = sorted(players)
+    invalid_players = set()
+    shares_map, digests_map = {}, {}
+    share_bound, max_digits = _get_field_bounds(len(ordered), max_secret_length)
+    with tracing.phase(stats, "deserialize"):
+        for player, robust_share in serialized_map.items():
+            try:
+                _charge_bytes(stats, robust_share)
+                share = _deserialize_robust_share(robust_share, max_digits)["share"]
+                _assert_valid_share(share, share_bound)
+            except (ValueError, KeyError, TypeError, AssertionError):
+                invalid_players.add(player)
+            else:
+                shares_map[player] = share
+        for player, verification in verifications_map.items():
+            try:
+                assert player in ordered
+                _charge_bytes(stats, verification)
+                digests_map[player] = _deserialize_verification(verification, ordered)
+            except (ValueError, AssertionError):
+                invalid_players.add(player)
+
+    with tracing.phase(stats, "validate"):
+        # a dishonest player takes no further part: it does not vote, and its share is left out of every verified set
+        for player in invalid_players:
+            shares_map.pop(player, None)
+            digests_map.pop(player, None)
+        verifies_map = {}
+        for verifier, digests in digests_map.items():
+            verified = tuple(player for player in sorted(digests) if player in shares_map and
+                             _get_share_digest(player, shares_map[player], max_secret_length) == digests[player])
+            if verified:
+                verifies_map[verifier] = verified
+
+    inversions = polynomials.get_inversion_count()
+    try:
+        with tracing.phase(stats, "reconstruct"):
+            secret_map = _get_player_to_secret_map(verifies_map, shares_map, len(ordered), reconstruction_threshold,
+                                                   max_secret_length, stats)
+        return _settle_vote(verifies_map, secret_map, reconstruction_threshold, invalid_players, stats)
+    finally:
+        _count(stats, "inversions", polynomials.get_inversion_count() - inversions)
+
+
 def reconstruct_unauthenticated_secret(num_players, max_secret_length, serialized_map):
     '''
     Args:
@@ -336,13 +1482,57 @@ def reconstruct_unauthenticated_secret(num_players, max_secret_length, serialize
         otherwise, no guarantees are made about the value of the bytestring returned
     '''
     shares = []
+    share_bound, max_digits = _get_field_bounds(num_players, max_secret_length)
     for player, robust_share in serialized_map.items():
         try:
-            share = _deserialize_robust_share(robust_share)["share"]
-            _assert_valid_share(share)
-        except (ValueError, KeyError, AssertionError):
+            share = _deserialize_robust_share(robust_share, max_digits)["share"]
+            _assert_valid_share(share, share_bound)
+        except (ValueError, KeyError, TypeError, AssertionError):
             pass  # ignore players who cause structural share errors
         else:
             shares.append(share)
 
     return _get_bytestring_secret(shares, num_players, max_secret_length)
+
+
+def reconstruct_error_corrected_secret(num_players, reconstruction_threshold, max_secret_length, serialized_map):
+    '''
+    Robust reconstruction by Reed-Solomon decoding of the shares alone, without any authentication keys or vectors
+    Robust shares may therefore omit their keys and vectors entirely
+    Args:
+        num_players, the length of the list of players passed to share_authenticated_secret
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        serialized_map, a map of valid player string ids to serialized robust shares dispersed from share_authenticated_secret
+    Returns:
+        if at most (m - reconstruction_threshold) / 2 of the m well-formed shares were corrupted
+        (always the case for fewer than reconstruction_threshold dishonest players when num_players >= 3 * reconstruction_threshold - 2),
+        a successful return contains a tuple of
+            the original bytestring that was shared by share_authenticated_secret
+            a list of players whose shares lie on the sharing polynomial
+            a list of dishonest players (those whose shares caused structural errors or were corrupted)
+    Raises:
+        FatalReconstructionFailure, too many shares were corrupted to recover the secret
+    '''
+    invalid_players = set()
+    points_map = {}
+    share_bound, max_digits = _get_field_bounds(num_players, max_secret_length)
+    for player, robust_share in serialized_map.items():
+        try:
+            share = _deserialize_robust_share(robust_share, max_digits)["share"]
+            _assert_valid_share(share, share_bound)
+        except (ValueError, KeyError, TypeError, AssertionError):
+            invalid_players.add(player)  # players who cause structural share errors
+        else:
+            points_map[player] = pairing.elegant_unpair(share)
+
+    try:
+        secret_int, corrupted_points = sss._decode_secret_int(num_players, reconstruction_threshold, max_secret_length + 1,
+                                                              list(points_map.values()))
+    except ValueError:
+        raise FatalReconstructionFailure
+
+    corrupted_points = set(corrupted_points)
+    valid_players = [player for player, point in points_map.items() if point not in corrupted_points]
+    invalid_players.update(player for player, point in points_map.items() if point in corrupted_points)
+    return serialization.convert_int_to_bytestring(secret_int), valid_players, list(invalid_players)
@@ -1,4 +1,4 @@
-from robustsecretsharing.crypto_tools import random, primes
+from robustsecretsharing.crypto_tools import arithmetic, random, primes
 
 PRIME_EXP = 107  # default to sufficiently large Mersenne prime
 
@@ -28,7 +28,20 @@ def generate_check_vector(message, max_length):
     b = random.get_random_positive_int_in_field(prime)
     y = random.get_random_int_in_field(prime)
 
-    return y, (b, (message + b * y) % prime)
+    return _make_check_vector(message, b, y, prime)
+
+
+def _make_check_vector(message, b, y, prime):
+    '''
+    Args:
+        message, the integer to be authenticated
+        b, a positive random integer in the field
+        y, a random integer in the field
+        prime, the prime returned by get_large_prime
+    Returns:
+        (key, vector) as returned by generate_check_vector
+    '''
+    return y, (b, int((arithmetic.BACKEND.integer(message) + b * y) % prime))
 
 
 def validate(key, vector, message, max_length):
@@ -42,7 +55,7 @@ def validate(key, vector, message, max_length):
         True if the provided key and vector validate the given message,
         False otherwise
     '''
-    return (message + vector[0] * key) % get_large_prime(max_length) == vector[1]
+    return (arithmetic.BACKEND.integer(message) + vector[0] * key) % get_large_prime(max_length) == vector[1]
 
 
 def generate_batch(num_macs, message, max_length):
@@ -55,4 +68,63 @@ def generate_batch(num_macs, message, max_length):
         a tuple of two parallel lists, which hold keys (integers) and vectors (tuples)
             such that each keys[i], vectors[i] pair authenticate the given message
     '''
-    return zip(*[generate_check_vector(message, max_length) for _ in xrange(num_macs)])
+    return list(zip(*[generate_check_vector(message, max_length) for _ in range(num_macs)]))
+
+
+def generate_batches(num_macs, messages, max_length):
+    '''
+    Args:
+        num_macs, the number of (key, vector) pairs to return for each message
+        messages, a list of integers to be authenticated
+        max_length, a value greater than or equal to len(str(message)) for every message
+    Return:
+        a list parallel to messages of the tuples that generate_batch returns for each message
+        all random values are drawn with a single read from the source of entropy
+    '''
+    prime = get_large_prime(max_length)
+    random_values = random.get_random_ints_in_field(2 * num_macs * len(messages), prime)
+
+    batches = []
+    for index, message in enumerate(messages):
+        keys, vectors = [], []
+        for offset in range(2 * num_macs * index, 2 * num_macs * (index + 1), 2):
+            b = random_values[offset] or random.get_random_positive_int_in_field(prime)
+            key, vector = _make_check_vector(message, b, random_values[offset + 1], prime)
+            keys.append(key)
+            vectors.append(vector)
+        batches.append((keys, vectors))
+    return batches
+
+
+def precompute_check_vectors(num_macs, max_length):
+    '''
+    Args:
+        num_macs, the number of check vectors to prepare
+        max_length, a value greater than or equal to len(str(message)) for the messages to be authenticated
+    Returns:
+        a list of num_macs tuples of (key, b, b * key mod prime), drawn with a single read from the source of entropy,
+        that complete_check_vector turns into a (key, vector) pair for any message
+        each tuple must be used for at most one message
+    '''
+    prime = get_large_prime(max_length)
+    random_values = random.get_random_ints_in_field(2 * num_macs, prime)
+
+    masks = []
+    for offset in range(0, 2 * num_macs, 2):
+        b = random_values[offset] or random.get_random_positive_int_in_field(prime)
+        key = random_values[offset + 1]
+        masks.append((key, b, int((arithmetic.BACKEND.integer(b) * key) % prime)))
+    return masks
+
+
+def complete_check_vector(message, mask, prime):
+    '''
+    Args:
+        message, the integer to be authenticated, which may already be reduced mod prime
+        mask, a tuple as returned by precompute_check_vectors
+        prime, the prime returned by get_large_prime for the max_length passed to precompute_check_vectors
+    Returns:
+        (key, vector) as returned by generate_check_vector, at the cost of a single modular addition
+    '''
+    key, b, product = mask
+    return key, (b, (message + product) % prime)
@@ -1,24 +1,4 @@
-import decimal
-
-
-def _set_precision(precision):
-    '''
-    Args:
-        precision, the digit-length precision to be used in Decimal computations
-    Returns:
-        None
-    '''
-    decimal.getcontext().prec = precision
-
-
-def _floored_sqrt(dec_val):
-    '''
-    Args:
-        dec_val, a Decimal value
-    Returns:
-        the Decimal value of floor(sqrt(dec_val)) with precision determined by _set_precision
-    '''
-    return dec_val.sqrt().to_integral_value(rounding=decimal.ROUND_FLOOR)
+from robustsecretsharing.crypto_tools import arithmetic
 
 
 def _validate_pair(x, y):
@@ -61,13 +41,10 @@ def elegant_unpair(z):
         pair: a tuple holding the nonnegative integers x and y that are uniquely associated with z
         these were the integers passed to elegant_pair
     '''
-    _set_precision(len(str(z)))  # need sufficient precision for computations on z
-    z = decimal.Decimal(z)
-
-    root = _floored_sqrt(z)
+    root = arithmetic.BACKEND.isqrt(z)
     difference = z - root**2
 
     if difference < root:
-        return long(difference), long(root)
+        return difference, root
     else:
-        return long(root), long(difference - root)
+        return root, difference - root
@@ -1,5 +1,12 @@
-from robustsecretsharing.crypto_tools import random, polynomials, primes, serialization
+from robustsecretsharing.crypto_tools import random, polynomials, primes, serialization, reed_solomon
 from robustsecretsharing.schemes import pairing
+try:
+    from itertools import zip_longest
+except ImportError:  # Python 2
+    from itertools import izip_longest as zip_longest
+
+AGGREGATION_REDUCE_INTERVAL = 1024  # shares summed between reductions of the running aggregate
+_MISSING = object()  # marks the end of the shorter of the shares and weights being aggregated
 
 
 def _verify_parameters(num_players, reconstruction_threshold, secret, prime):
@@ -35,14 +42,44 @@ def _share_secret_int(num_players, reconstruction_threshold, max_secret_length,
         raise ValueError("invalid secret sharing parameters")
 
     # fix n distinct points, alpha_1,...,alpha_n in Z_ps  (public)
-    alphas = [i for i in xrange(1, num_players + 1)]
+    alphas = [i for i in range(1, num_players + 1)]
 
     # choose at random t points, a_1,...,a_t in Z_ps (private)
     #   we will use the a_i values as our coefficients to define the polynomial f(x) = (a_t x^t) + ... + (a_1 x) + s
     coefficients = [secret] + random.get_distinct_positive_random_ints_in_field(reconstruction_threshold - 1, prime)
 
     # for values of i from 1 to n, calculate f(alpha_i)
-    return polynomials.evaluate(coefficients, alphas, prime)
+    return polynomials.evaluate_many([coefficients], alphas, prime)[0]
+
+
+def _share_secrets_int(num_players, reconstruction_threshold, max_secret_length, secrets, alphas=None):
+    '''
+    Args:
+        num_players, the number of shares to be distributed for each secret
+        reconstruction_threshold, the number of shares needed for reconstruction
+            any collection of fewer shares will reveal no information about the secret
+        max_secret_length, the maximum length of any secret represented as a bytestring (ie, len(secret))
+        secrets, a list of integers to be Shamir secret shared
+        alphas, an optional list of num_players distinct positive x values to share at (1 to num_players by default)
+    Returns:
+        a list parallel to secrets of the lists of tuples of (x, f(x)) values that _share_secret_int returns
+        the prime and the alphas are selected once, the random coefficients are drawn together for all secrets
+        and every polynomial is evaluated with the same cached Vandermonde matrix (see polynomials.evaluate_many)
+    Raises:
+        ValueError, the input parameters are invalid
+    '''
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+
+    for secret in secrets:
+        if not _verify_parameters(num_players, reconstruction_threshold, secret, prime):
+            raise ValueError("invalid secret sharing parameters")
+
+    if alphas is None:
+        alphas = [i for i in range(1, num_players + 1)]
+    random_coefficients = random.get_distinct_positive_random_int_lists_in_field(len(secrets), reconstruction_threshold - 1, prime)
+    return polynomials.evaluate_many([[secret] + coefficients for secret, coefficients in zip(secrets, random_coefficients)],
+                                     alphas, prime)
 
 
 def share_secret(num_players, reconstruction_threshold, max_secret_length, secret):
@@ -63,31 +100,326 @@ def share_secret(num_players, reconstruction_threshold, max_secret_length, secre
     return [str(pairing.elegant_pair(*tup)) for tup in points]
 
 
-def _reconstruct_secret_int(num_players, max_secret_length, shares):
+def share_secrets(num_players, reconstruction_threshold, max_secret_length, secrets):
+    '''
+    Args:
+        num_players, the number of shares to be distributed for each secret
+        reconstruction_threshold, the number of shares needed for reconstruction
+            any collection of fewer shares will reveal no information about the secret
+        max_secret_length, the maximum length of any secret represented as a bytestring (ie, len(secret))
+        secrets, a list of bytestrings to be Shamir secret shared
+    Returns:
+        a list parallel to secrets of the lists of strings that share_secret returns for each secret
+    Raises:
+        ValueError, the input arguments fail validation for any of the secrets
+    '''
+    secret_ints = [serialization.convert_bytestring_to_int(secret) for secret in secrets]
+    points_list = _share_secrets_int(num_players, reconstruction_threshold, max_secret_length + 1, secret_ints)
+    return [[str(pairing.elegant_pair(*tup)) for tup in points] for points in points_list]
+
+
+def _select_shares(shares, reconstruction_threshold):
+    '''
+    Args:
+        shares, a list of tuples representing (x, f(x)) values
+        reconstruction_threshold, the number of shares to select, or None to select all shares
+    Returns:
+        the reconstruction_threshold shares with the smallest x values, so that reconstructions from
+        overlapping sets of players tend to use the same x values (and therefore cached Lagrange weights)
+    '''
+    if reconstruction_threshold is None or len(shares) <= reconstruction_threshold:
+        return shares
+    return sorted(shares)[:reconstruction_threshold]
+
+
+def _reconstruct_secret_int(num_players, max_secret_length, shares, reconstruction_threshold=None, check_consistency=False):
     '''
     Args:
         num_players, the total number of players (can be greater than or equal to the number of shares)
         max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
         shares, a list of tuples representing (x, f(x)) values
+        reconstruction_threshold, if given, the threshold used by _share_secret_int
+            only that many shares are interpolated, otherwise every share given is
+        check_consistency, if True, the surplus shares beyond reconstruction_threshold
+            are used to check that all shares lie on the same polynomial
     Returns:
         the integer that was shared by _share_secret_int if all shares are valid
         otherwise, no guarantees are made about the value of the integer returned
+    Lagrange weights for a repeated set of x values are reused from polynomials.WEIGHT_CACHE
+    Raises:
+        ValueError, check_consistency was requested and the shares are inconsistent
     '''
     bitlength = max(num_players.bit_length(), max_secret_length * 8)
     prime = primes.get_prime_by_bitlength(bitlength)
-    return polynomials.interpolate(shares, prime)(0)
+    if check_consistency and reconstruction_threshold is not None \
+            and not reed_solomon.is_consistent(shares, reconstruction_threshold, prime):
+        raise ValueError("shares do not lie on a single polynomial")
+    return polynomials.interpolate_at_zero(_select_shares(shares, reconstruction_threshold), prime)
 
 
-def reconstruct_secret(num_players, max_secret_length, shares):
+def reconstruct_secret(num_players, max_secret_length, shares, reconstruction_threshold=None, check_consistency=False):
     '''
     Args:
         num_players, the total number of players (can be greater than or equal to the number of shares)
         max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
         shares, a list of strings - each representing an integer value
+        reconstruction_threshold, if given, the threshold used by share_secret
+            only that many shares are interpolated, otherwise every share given is
+        check_consistency, if True, the surplus shares beyond reconstruction_threshold
+            are used to check that all shares lie on the same polynomial
     Returns:
         the original secret as passed to share_authenticated_secret if all shares are valid
         otherwise, no guarantees are made about the value of the bytestring returned
+    Raises:
+        ValueError, check_consistency was requested and the shares are inconsistent
     '''
     points = [pairing.elegant_unpair(int(share)) for share in shares]
-    secret_int = _reconstruct_secret_int(num_players, max_secret_length + 1, points)
+    secret_int = _reconstruct_secret_int(num_players, max_secret_length + 1, points, reconstruction_threshold, check_consistency)
     return serialization.convert_int_to_bytestring(secret_int)
+
+
+def _decode_secret_int(num_players, reconstruction_threshold, max_secret_length, shares):
+    '''
+    Args:
+        num_players, the total number of players (can be greater than or equal to the number of shares)
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        shares, a list of tuples representing (x, f(x)) values, some of which may be corrupted
+    Returns:
+        a tuple of
+            the integer that was shared by _share_secret_int
+            the list of shares that do not lie on the polynomial used by _share_secret_int
+        recovery is guaranteed when at most (len(shares) - reconstruction_threshold) / 2 shares are corrupted
+    Raises:
+        ValueError, too many shares are corrupted to recover the secret
+    '''
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+    coefficients, corrupted = reed_solomon.decode(shares, reconstruction_threshold, prime)
+    return coefficients[0], corrupted
+
+
+def decode_secret(num_players, reconstruction_threshold, max_secret_length, shares):
+    '''
+    Error-correcting reconstruction: unlike reconstruct_secret, shares may be corrupted as well as missing
+    Args:
+        num_players, the total number of players (can be greater than or equal to the number of shares)
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        shares, a list of strings - each representing an integer value
+    Returns:
+        a tuple of
+            the original secret as passed to share_secret
+            the list of shares that were found to be corrupted
+        recovery is guaranteed when at most (len(shares) - reconstruction_threshold) / 2 shares are corrupted
+        (for example, any reconstruction_threshold - 1 corrupted shares when num_players >= 3 * reconstruction_threshold - 2)
+    Raises:
+        ValueError, too many shares are corrupted to recover the secret
+    '''
+    points = [pairing.elegant_unpair(int(share)) for share in shares]
+    secret_int, corrupted_points = _decode_secret_int(num_players, reconstruction_threshold, max_secret_length + 1, points)
+    corrupted = [share for share, point in zip(shares, points) if point in corrupted_points]
+    return serialization.convert_int_to_bytestring(secret_int), corrupted
+
+
+def _shares_are_consistent_int(num_players, reconstruction_threshold, max_secret_length, shares):
+    '''
+    Args:
+        num_players, the total number of players (can be greater than or equal to the number of shares)
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        shares, a list of tuples representing (x, f(x)) values
+    Returns:
+        True if all shares lie on a single polynomial of the degree used by _share_secret_int, False otherwise
+    '''
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+    return reed_solomon.is_consistent(shares, reconstruction_threshold, prime)
+
+
+def shares_are_consistent(num_players, reconstruction_threshold, max_secret_length, shares):
+    '''
+    Args:
+        num_players, the total number of players (can be greater than or equal to the number of shares)
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        shares, a list of strings - each representing an integer value
+    Returns:
+        True if all shares could have been produced by a single call to share_secret, False otherwise
+        any reconstruction_threshold of a consistent set of shares reconstruct the same secret
+    '''
+    points = [pairing.elegant_unpair(int(share)) for share in shares]
+    return _shares_are_consistent_int(num_players, reconstruction_threshold, max_secret_length + 1, points)
+
+
+def _add_shares_int(num_players, max_secret_length, share, other):
+    '''
+    Args:
+        num_players, the number of shares that were distributed
+        max_secret_length, the maximum length of the secrets represented as a bytestring (ie, len(secret))
+        share, a tuple of (x, f(x)) as returned by _share_secret_int
+        other, a tuple of (x, g(x)) at the same x, for a polynomial g shared with the same parameters
+    Returns:
+        the tuple (x, f(x) + g(x)), a share of the secret f(0) + g(0)
+        adding a share of a polynomial with g(0) = 0 re-randomizes a share without changing its secret
+    Raises:
+        ValueError, the shares are not at the same x
+    '''
+    if share[0] != other[0]:
+        raise ValueError("shares must be evaluated at the same x")
+
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+    return share[0], (share[1] + other[1]) % prime
+
+
+def _scale_share_int(num_players, max_secret_length, share, scalar):
+    '''
+    Args:
+        num_players, the number of shares that were distributed
+        max_secret_length, the maximum length of the secrets represented as a bytestring (ie, len(secret))
+        share, a tuple of (x, f(x)) as returned by _share_secret_int
+        scalar, an integer
+    Returns:
+        the tuple (x, scalar * f(x)), a share of the secret scalar * f(0)
+    '''
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+    return share[0], (scalar * share[1]) % prime
+
+
+def _aggregate_shares_int(num_players, max_secret_length, shares, weights=None):
+    '''
+    Args:
+        num_players, the number of shares that were distributed
+        max_secret_length, the maximum length of the secrets represented as a bytestring (ie, len(secret))
+        shares, a nonempty iterable of tuples of (x, f_i(x)) at the same x, for polynomials shared with the same parameters
+            the shares are consumed once, so a player can aggregate a stream without holding it in memory
+        weights, an optional iterable of integers parallel to shares (1 for every share by default)
+    Returns:
+        the tuple (x, sum of weight_i * f_i(x)), a share of the weighted sum of the secrets f_i(0)
+    Raises:
+        ValueError, no shares were given, the shares are not at the same x, or weights is not as long as shares
+    '''
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+
+    x, total = None, 0
+    pairs = ((share, 1) for share in shares) if weights is None else zip_longest(shares, weights, fillvalue=_MISSING)
+    for count, (share, weight) in enumerate(pairs, 1):
+        if share is _MISSING or weight is _MISSING:
+            raise ValueError("there must be exactly one weight for each share")
+        if x is None:
+            x = share[0]
+        elif share[0] != x:
+            raise ValueError("shares must be evaluated at the same x")
+        total += weight * share[1]
+        if count % AGGREGATION_REDUCE_INTERVAL == 0:  # keep the running sum near the size of the field
+            total %= prime
+    if x is None:
+        raise ValueError("at least one share is needed for aggregation")
+    return x, total % prime
+
+
+def _extend_shares_int(num_players, reconstruction_threshold, max_secret_length, shares, alpha):
+    '''
+    Args:
+        num_players, the number of shares that were distributed
+        reconstruction_threshold, the threshold used for sharing
+        max_secret_length, the maximum length of the secret represented as a bytestring (ie, len(secret))
+        shares, a list of at least reconstruction_threshold valid tuples of (x, f(x))
+        alpha, a positive x value that none of the distributed shares use
+    Returns:
+        the tuple (alpha, f(alpha)), a new share of the same secret
+    Raises:
+        ValueError, too few shares were given or alpha is already in use
+    '''
+    if len(shares) < reconstruction_threshold:
+        raise ValueError("too few shares to extend the sharing")
+    if alpha <= 0 or alpha in [x for x, _ in shares]:
+        raise ValueError("the new share must be at an unused positive x")
+
+    bitlength = max(num_players.bit_length(), max_secret_length * 8)
+    prime = primes.get_prime_by_bitlength(bitlength)
+    return alpha, polynomials.interpolate(_select_shares(shares, reconstruction_threshold), prime)(alpha)
+
+
+def share_integers(num_players, reconstruction_threshold, max_secret_length, values):
+    '''
+    Shares integers rather than bytestrings, so that the shares can be aggregated into shares of sums of the integers
+    Args:
+        num_players, the number of shares to be distributed for each value
+        reconstruction_threshold, the number of shares needed for reconstruction
+        max_secret_length, the number of bytes that any value or aggregate of values fits in
+        values, a list of integers in the range [0, 256**max_secret_length)
+    Returns:
+        a list parallel to values of the lists of strings that share_secret returns for each value
+    Raises:
+        ValueError, the input arguments fail validation for any of the values
+    '''
+    if any(not 0 <= value < 256**max_secret_length for value in values):
+        raise ValueError("values must be nonnegative and fit in max_secret_length bytes")
+    points_list = _share_secrets_int(num_players, reconstruction_threshold, max_secret_length, values)
+    return [[str(pairing.elegant_pair(*tup)) for tup in points] for points in points_list]
+
+
+def add_shares(num_players, max_secret_length, share, other):
+    '''
+    Args:
+        num_players, the number of shares that were distributed
+        max_secret_length, the max_secret_length passed to share_integers
+        share, other, strings that share_integers returned to the same player for two values
+    Returns:
+        a string share of the sum of the two values
+    Raises:
+        ValueError, the shares do not belong to the same player
+    '''
+    return aggregate_shares(num_players, max_secret_length, [share, other])
+
+
+def scale_share(num_players, max_secret_length, share, scalar):
+    '''
+    Args:
+        num_players, the number of shares that were distributed
+        max_secret_length, the max_secret_length passed to share_integers
+        share, a string that share_integers returned
+        scalar, a nonnegative integer
+    Returns:
+        a string share of the value multiplied by scalar
+    '''
+    return aggregate_shares(num_players, max_secret_length, [share], [scalar])
+
+
+def aggregate_shares(num_players, max_secret_length, shares, weights=None):
+    '''
+    Sums the shares one player holds for many values, so that only the aggregate is ever reconstructed
+    Args:
+        num_players, the number of shares that were distributed
+        max_secret_length, the max_secret_length passed to share_integers
+        shares, a nonempty iterable of strings that share_integers returned to the same player, consumed once
+        weights, an optional iterable of nonnegative integers parallel to shares (1 for every share by default)
+    Returns:
+        a string share of the weighted sum of the values, which reconstruct_integer recovers from any
+        reconstruction_threshold players' aggregates, provided every player aggregated the same values with the same weights
+        the sum is exact while it is below 256**max_secret_length
+    Raises:
+        ValueError, no shares were given, the shares do not belong to the same player, or weights is not as long as shares
+    '''
+    points = (pairing.elegant_unpair(int(share)) for share in shares)
+    return str(pairing.elegant_pair(*_aggregate_shares_int(num_players, max_secret_length, points, weights)))
+
+
+def reconstruct_integer(num_players, max_secret_length, shares, reconstruction_threshold=None):
+    '''
+    Args:
+        num_players, the total number of players (can be greater than or equal to the number of shares)
+        max_secret_length, the max_secret_length passed to share_integers
+        shares, a list of strings returned by share_integers or aggregate_shares, one per player
+        reconstruction_threshold, if given, the threshold used by share_integers
+            only that many shares are interpolated, otherwise every share given is
+    Returns:
+        the integer value (or aggregate) that the shares hold if all shares are valid
+        otherwise, no guarantees are made about the value of the integer returned
+    '''
+    points = [pairing.elegant_unpair(int(share)) for share in shares]
+    return _reconstruct_secret_int(num_players, max_secret_length, points, reconstruction_threshold)
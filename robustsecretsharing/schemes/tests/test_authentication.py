@@ -65,3 +65,30 @@ def test_generate_batch_validate_single():
     keys, vectors = authentication.generate_batch(num_macs, message, max_length)
     for key, vector in zip(keys, vectors):
         assert authentication.validate(key, vector, message, max_length) is True
+
+
+def test_generate_batches():
+    messages = [112358132134, 0, 42]
+    max_length = len(str(messages[0]))
+    num_macs = 4
+    batches = authentication.generate_batches(num_macs, messages, max_length)
+    assert len(batches) == len(messages)
+    for message, (keys, vectors) in zip(messages, batches):
+        assert len(keys) == len(vectors) == num_macs
+        for key, vector in zip(keys, vectors):
+            assert authentication.validate(key, vector, message, max_length) is True
+            assert authentication.validate(key, vector, message + 1, max_length) is False
+
+
+def test_precomputed_check_vectors():
+    message = 112358132134
+    max_length = len(str(message))
+    prime = authentication.get_large_prime(max_length)
+
+    masks = authentication.precompute_check_vectors(8, max_length)
+    assert len(masks) == 8
+    for mask in masks:
+        key, vector = authentication.complete_check_vector(message, mask, prime)
+        assert vector[0] > 0
+        assert authentication.validate(key, vector, message, max_length) is True
+        assert authentication.validate(key, vector, message + 1, max_length) is False
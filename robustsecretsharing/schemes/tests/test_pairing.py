@@ -19,69 +19,69 @@ def test_medium():
 
 
 def test_large_ish():
-    x = long('123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890')
-    y = long('987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210')
+    x = int('123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890')
+    y = int('987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210')
 
     assert run_pair_unpair((x, y)) is True
 
 
 def test_large():
-    x = long('123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890')
-    y = long('987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210')
+    x = int('123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890')
+    y = int('987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210')
 
     assert run_pair_unpair((x, y)) is True
 
 
 def test_very_large():
-    x = long('123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890'
-             '123456789012345678901234567890123456789012345678901234567890')
-    y = long('987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210')
+    x = int('123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890'
+            '123456789012345678901234567890123456789012345678901234567890')
+    y = int('987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210')
 
     assert run_pair_unpair((x, y)) is True
 
 
 def test_size_mix():
     x = 4444
-    y = long('987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210'
-             '987654321098765432109876543210987654321098765432109876543210')
+    y = int('987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210'
+            '987654321098765432109876543210987654321098765432109876543210')
 
     assert run_pair_unpair((x, y)) is True
 
@@ -128,3 +128,8 @@ def test_negative():
     y = -987654321
     with pytest.raises(ValueError):
         run_pair_unpair((x, y)) is True
+
+
+def test_just_below_perfect_square():
+    # the pair is one less than a perfect square (elegant_pair(x, x - 1) = (x + 1)**2 - 2), where a rounded root fails
+    assert run_pair_unpair((2**4423 - 1, 2**4423 - 2)) is True
@@ -1,8 +1,9 @@
 from robustsecretsharing.schemes import sss
+from robustsecretsharing.crypto_tools import polynomials
 import pytest
 
-secret = 'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
-alt_secret = 'c4bbcb1fbec99d65bf59d85c8cb62ee2db963f0fe106f483d9afa73bd4e39a8a'
+secret = b'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
+alt_secret = b'c4bbcb1fbec99d65bf59d85c8cb62ee2db963f0fe106f483d9afa73bd4e39a8a'
 
 
 def share_and_recover(num_players, reconstruction_threshold, secret, end):
@@ -49,7 +50,7 @@ def test_secret_leading_zeroes():
     end = 2
 
     # Create secret
-    leading_zero_secret = '\x00\x00e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
+    leading_zero_secret = b'\x00\x00e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
 
     recovered_secret = share_and_recover(num_players, reconstruction_threshold, leading_zero_secret, end)
     assert recovered_secret == leading_zero_secret
@@ -59,7 +60,7 @@ def test_many_players():
     num_players = 40
     reconstruction_threshold = 2
 
-    secret = '\x0A'
+    secret = b'\x0A'
 
     recovered_secret = share_and_recover(num_players, reconstruction_threshold, secret, reconstruction_threshold)
     assert recovered_secret == secret
@@ -119,6 +120,91 @@ def test_int_players():
     assert recovered_secret == secret
 
 
+def test_int_recover_reuses_weights():
+    num_players = 5
+    reconstruction_threshold = 3
+
+    max_secret_length = 4
+    polynomials.WEIGHT_CACHE.clear()
+    for secret in [1234, 5678]:
+        shares = sss._share_secret_int(num_players, reconstruction_threshold, max_secret_length, secret)
+        assert sss._reconstruct_secret_int(num_players, max_secret_length, shares[:reconstruction_threshold]) == secret
+    assert polynomials.WEIGHT_CACHE.misses == 1 and polynomials.WEIGHT_CACHE.hits == 1
+
+
+def test_int_share_many_secrets():
+    num_players = 5
+    reconstruction_threshold = 3
+    max_secret_length = 4
+    secrets = [0, 1, 4294967295, 112358]
+
+    shares_list = sss._share_secrets_int(num_players, reconstruction_threshold, max_secret_length, secrets)
+    assert len(shares_list) == len(secrets)
+    for original, shares in zip(secrets, shares_list):
+        assert [x for x, _ in shares] == list(range(1, num_players + 1))
+        assert sss._reconstruct_secret_int(num_players, max_secret_length, shares[1:4]) == original
+
+
+def test_share_secrets():
+    num_players = 5
+    reconstruction_threshold = 3
+    secrets = [secret, alt_secret[:len(secret)], b'\x00' * len(secret)]
+
+    shares_list = sss.share_secrets(num_players, reconstruction_threshold, len(secret), secrets)
+    assert len(shares_list) == len(secrets)
+    for original, shares in zip(secrets, shares_list):
+        assert len(shares) == num_players
+        assert sss.reconstruct_secret(num_players, len(secret), shares[2:]) == original
+
+
+def test_share_secrets_bad_secret():
+    with pytest.raises(ValueError):
+        sss.share_secrets(5, 3, 2, [b'ok', b'too long'])
+
+
+def test_int_share_many_secrets_bad_secret():
+    with pytest.raises(ValueError):
+        sss._share_secrets_int(5, 3, 1, [1, 2**16])
+
+
+def test_threshold_max_shares():
+    num_players = 9
+    reconstruction_threshold = 4
+
+    max_secret_length = len(secret)
+    shares = sss.share_secret(num_players, reconstruction_threshold, max_secret_length, secret)
+    assert sss.reconstruct_secret(num_players, max_secret_length, shares, reconstruction_threshold) == secret
+
+
+def test_threshold_int_uses_lowest_shares():
+    num_players = 9
+    reconstruction_threshold = 4
+
+    secret = 123456789
+    max_secret_length = len(str(secret))
+    shares = sss._share_secret_int(num_players, reconstruction_threshold, max_secret_length, secret)
+    broken_shares = [(x, y + 1) for x, y in shares[reconstruction_threshold:]]  # never interpolated
+
+    polynomials.WEIGHT_CACHE.clear()
+    for subset in [shares[:reconstruction_threshold] + broken_shares, (shares[:reconstruction_threshold] + broken_shares)[::-1]]:
+        assert sss._reconstruct_secret_int(num_players, max_secret_length, subset, reconstruction_threshold) == secret
+    assert polynomials.WEIGHT_CACHE.misses == 1 and polynomials.WEIGHT_CACHE.hits == 1
+
+
+def test_threshold_check_consistency():
+    num_players = 9
+    reconstruction_threshold = 4
+
+    max_secret_length = len(secret)
+    shares = sss.share_secret(num_players, reconstruction_threshold, max_secret_length, secret)
+    assert sss.reconstruct_secret(num_players, max_secret_length, shares, reconstruction_threshold,
+                                  check_consistency=True) == secret
+
+    broken_shares = shares[:-1] + [str(int(shares[-1]) + 1)]
+    with pytest.raises(ValueError):
+        sss.reconstruct_secret(num_players, max_secret_length, broken_shares, reconstruction_threshold, check_consistency=True)
+
+
 def test_too_few_shares():
     num_players = 9
     reconstruction_threshold = 5
@@ -142,6 +228,67 @@ def test_min_shares_some_bad():
     share_and_break(num_players, reconstruction_threshold, secret, reconstruction_threshold, num_bad)
 
 
+def test_decode_no_errors():
+    num_players = 7
+    reconstruction_threshold = 3
+
+    max_secret_length = len(secret)
+    shares = sss.share_secret(num_players, reconstruction_threshold, max_secret_length, secret)
+    assert sss.decode_secret(num_players, reconstruction_threshold, max_secret_length, shares) == (secret, [])
+
+
+def test_decode_some_bad():
+    num_players = 7
+    reconstruction_threshold = 3
+    num_bad = reconstruction_threshold - 1  # 7 >= 3 * 3 - 2 shares tolerate any 2 corrupted shares
+
+    max_secret_length = len(secret)
+    shares = sss.share_secret(num_players, reconstruction_threshold, max_secret_length, secret)
+    broken_shares = [str(int(share) + 1) for share in shares[:num_bad]]
+
+    recovered_secret, corrupted = sss.decode_secret(num_players, reconstruction_threshold, max_secret_length,
+                                                    broken_shares + shares[num_bad:])
+    assert recovered_secret == secret
+    assert sorted(corrupted) == sorted(broken_shares)
+
+
+def test_decode_int_some_bad():
+    num_players = 10
+    reconstruction_threshold = 4
+
+    secret = 123456789
+    max_secret_length = len(str(secret))
+    shares = sss._share_secret_int(num_players, reconstruction_threshold, max_secret_length, secret)
+    broken_shares = [(x, y + 1) for x, y in shares[:3]]
+    recovered_secret, corrupted = sss._decode_secret_int(num_players, reconstruction_threshold, max_secret_length,
+                                                         broken_shares + shares[3:])
+    assert recovered_secret == secret and sorted(corrupted) == sorted(broken_shares)
+
+
+def test_decode_too_many_bad():
+    num_players = 7
+    reconstruction_threshold = 3
+    num_bad = reconstruction_threshold
+
+    max_secret_length = len(secret)
+    shares = sss.share_secret(num_players, reconstruction_threshold, max_secret_length, secret)
+    broken_shares = [str(int(share) + 1) for share in shares[:num_bad]]
+
+    with pytest.raises(ValueError):
+        sss.decode_secret(num_players, reconstruction_threshold, max_secret_length, broken_shares + shares[num_bad:])
+
+
+def test_shares_consistent():
+    num_players = 7
+    reconstruction_threshold = 3
+
+    max_secret_length = len(secret)
+    shares = sss.share_secret(num_players, reconstruction_threshold, max_secret_length, secret)
+    assert sss.shares_are_consistent(num_players, reconstruction_threshold, max_secret_length, shares) is True
+    assert sss.shares_are_consistent(num_players, reconstruction_threshold, max_secret_length,
+                                     [str(int(shares[0]) + 1)] + shares[1:]) is False
+
+
 def test_bad_configuration_threshold():
     num_players = 2
     reconstruction_threshold = 5
@@ -156,7 +303,7 @@ def test_bad_configuration_prime_small_secret():
     num_players = 5
     reconstruction_threshold = 2
 
-    bad_secret = '\xFF\xFF'
+    bad_secret = b'\xFF\xFF'
     max_secret_length = len(bad_secret) - 1
 
     with pytest.raises(ValueError):
@@ -169,3 +316,105 @@ def test_bad_configuration_prime_none():
 
     with pytest.raises(ValueError):
         sss.share_secret(num_players, reconstruction_threshold, 5000, secret)
+
+
+def test_add_zero_shares():
+    num_players = 5
+    max_secret_length = 4
+    shares = sss._share_secret_int(num_players, 3, max_secret_length, 112358)
+    zeros = sss._share_secret_int(num_players, 3, max_secret_length, 0)
+
+    refreshed = [sss._add_shares_int(num_players, max_secret_length, share, zero) for share, zero in zip(shares, zeros)]
+    assert refreshed != shares
+    assert sss._reconstruct_secret_int(num_players, max_secret_length, refreshed[2:]) == 112358
+
+
+def test_add_shares_different_x():
+    shares = sss._share_secret_int(3, 2, 4, 1)
+    with pytest.raises(ValueError):
+        sss._add_shares_int(3, 4, shares[0], shares[1])
+
+
+def test_scale_and_aggregate_shares_int():
+    num_players = 5
+    max_secret_length = 4
+    shares_list = sss._share_secrets_int(num_players, 3, max_secret_length, [3, 5, 7])
+    scaled = [sss._scale_share_int(num_players, max_secret_length, share, 10) for share in shares_list[0]]
+    assert sss._reconstruct_secret_int(num_players, max_secret_length, scaled[:3]) == 30
+
+    aggregates = [sss._aggregate_shares_int(num_players, max_secret_length, iter(column), iter([1, 2, 3]))
+                  for column in zip(*shares_list)]
+    assert sss._reconstruct_secret_int(num_players, max_secret_length, aggregates[2:]) == 3 + 10 + 21
+
+
+def test_aggregate_shares_bad_input():
+    shares = sss._share_secret_int(3, 2, 4, 1)
+    with pytest.raises(ValueError):
+        sss._aggregate_shares_int(3, 4, shares[:2])
+    with pytest.raises(ValueError):
+        sss._aggregate_shares_int(3, 4, [])
+    with pytest.raises(ValueError):
+        sss._aggregate_shares_int(3, 4, [shares[0], shares[0], shares[0]], [1])
+    with pytest.raises(ValueError):
+        sss._aggregate_shares_int(3, 4, [shares[0]], [1, 2])
+
+
+def test_aggregate_many_integers(monkeypatch):
+    monkeypatch.setattr(sss, "AGGREGATION_REDUCE_INTERVAL", 7)
+    num_players = 5
+    reconstruction_threshold = 3
+    max_secret_length = 8
+    values = list(range(1000, 1100))
+    shares_list = sss.share_integers(num_players, reconstruction_threshold, max_secret_length, values)
+
+    # each player sums its own shares, and only the totals are reconstructed
+    totals = [sss.aggregate_shares(num_players, max_secret_length, (shares[player] for shares in shares_list))
+              for player in range(num_players)]
+    assert sss.reconstruct_integer(num_players, max_secret_length, totals[1:4]) == sum(values)
+    assert sss.reconstruct_integer(num_players, max_secret_length, totals, reconstruction_threshold) == sum(values)
+
+    weights = [value % 3 for value in values]
+    weighted = [sss.aggregate_shares(num_players, max_secret_length, [shares[player] for shares in shares_list], weights)
+                for player in range(num_players)]
+    assert sss.reconstruct_integer(num_players, max_secret_length, weighted[:3]) == \
+        sum(value * weight for value, weight in zip(values, weights))
+
+
+def test_add_and_scale_shares():
+    num_players = 4
+    max_secret_length = 4
+    first, second = sss.share_integers(num_players, 2, max_secret_length, [40, 2])
+    sums = [sss.add_shares(num_players, max_secret_length, a, b) for a, b in zip(first, second)]
+    assert sss.reconstruct_integer(num_players, max_secret_length, sums[:2]) == 42
+    scaled = [sss.scale_share(num_players, max_secret_length, share, 3) for share in second]
+    assert sss.reconstruct_integer(num_players, max_secret_length, scaled[2:]) == 6
+
+    with pytest.raises(ValueError):
+        sss.add_shares(num_players, max_secret_length, first[0], second[1])
+    with pytest.raises(ValueError):
+        sss.aggregate_shares(num_players, max_secret_length, [first[0], second[0], first[0]], [1])
+    with pytest.raises(ValueError):
+        sss.share_integers(num_players, 2, max_secret_length, [-1])
+    with pytest.raises(ValueError):
+        sss.share_integers(num_players, 2, max_secret_length, [2**40])
+
+
+def test_extend_shares():
+    num_players = 4
+    max_secret_length = 4
+    shares = sss._share_secret_int(num_players, 3, max_secret_length, 112358)
+    new_share = sss._extend_shares_int(num_players, 3, max_secret_length, shares[:3], 7)
+
+    assert new_share[0] == 7
+    assert sss._reconstruct_secret_int(num_players, max_secret_length, [new_share, shares[3], shares[0]]) == 112358
+    with pytest.raises(ValueError):
+        sss._extend_shares_int(num_players, 3, max_secret_length, shares[:3], 2)
+    with pytest.raises(ValueError):
+        sss._extend_shares_int(num_players, 3, max_secret_length, shares[:2], 7)
+
+
+def test_share_at_alphas():
+    shares_list = sss._share_secrets_int(3, 2, 4, [5, 6], [2, 9, 4])
+    for shares, original in zip(shares_list, [5, 6]):
+        assert [x for x, _ in shares] == [2, 9, 4]
+        assert sss._reconstruct_secret_int(3, 4, shares[1:]) == original
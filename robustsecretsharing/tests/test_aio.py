@@ -0,0 +1,91 @@
+from robustsecretsharing import rss
+import pytest
+import sys
+
+if sys.version_info < (3, 7):
+    pytest.skip('aio needs asyncio.get_running_loop, added in Python 3.7', allow_module_level=True)
+asyncio = pytest.importorskip('asyncio')
+from robustsecretsharing import aio  # noqa: E402 (asyncio is not available on every supported version)
+
+secret = b'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
+
+
+def get_fetches(loop, shares_map, delays, cancelled):
+    '''
+    Args:
+        loop, the event loop to run the fetches in
+        shares_map, a map of player ids to serialized robust shares
+        delays, a map of player ids to the number of seconds that player takes to respond
+        cancelled, a growing list of players whose fetches were cancelled
+    Returns:
+        a map of player ids to awaitables that produce each player's share after its delay
+    '''
+    def fetch(player):
+        future = loop.create_task(asyncio.sleep(delays[player], shares_map[player]))
+        future.add_done_callback(lambda f: cancelled.append(player) if f.cancelled() else None)
+        return future
+    return {player: fetch(player) for player in shares_map}
+
+
+def run(players, reconstruction_threshold, shares_map, delays, timeout=None, cancel_after=None):
+    '''
+    Returns:
+        a tuple of the result of aio.reconstruct_authenticated_secret (or the exception it raised)
+        and the list of players whose fetches were cancelled
+    '''
+    loop = asyncio.new_event_loop()
+    cancelled = []
+    try:
+        reconstruction = loop.create_task(aio.reconstruct_authenticated_secret(
+            players, reconstruction_threshold, len(secret), get_fetches(loop, shares_map, delays, cancelled), timeout))
+        if cancel_after is not None:
+            loop.call_later(cancel_after, reconstruction.cancel)
+        try:
+            result = loop.run_until_complete(reconstruction)
+        except (rss.FatalReconstructionFailure, asyncio.CancelledError) as failure:
+            result = failure
+        loop.run_until_complete(asyncio.sleep(0))  # let the cancellations complete
+        return result, cancelled
+    finally:
+        loop.close()
+
+
+def test_fastest_quorum_cancels_stragglers():
+    players = ['a', 'b', 'c', 'd', 'e']
+    shares_map = rss.share_authenticated_secret(players, 3, len(secret), secret)
+    delays = {'a': 0, 'b': 0.01, 'c': 0.02, 'd': 30, 'e': 30}
+
+    (recovered_secret, valid_players, invalid_players), cancelled = run(players, 3, shares_map, delays)
+    assert recovered_secret == secret
+    assert sorted(valid_players) == ['a', 'b', 'c'] and invalid_players == []
+    assert sorted(cancelled) == ['d', 'e']
+
+
+def test_timeouts_are_missing_shares():
+    players = ['a', 'b', 'c', 'd', 'e']
+    shares_map = rss.share_authenticated_secret(players, 3, len(secret), secret)
+    shares_map['a'] = 'corrupt'
+    delays = {'a': 0, 'b': 0, 'c': 0, 'd': 30, 'e': 30}
+
+    result, cancelled = run(players, 3, shares_map, delays, timeout=0.05)
+    assert isinstance(result, rss.FatalReconstructionFailure)
+    assert sorted(cancelled) == ['d', 'e']
+
+
+def test_cancelled_reconstruction_cancels_fetches():
+    players = ['a', 'b', 'c', 'd', 'e']
+    shares_map = rss.share_authenticated_secret(players, 3, len(secret), secret)
+    delays = {'a': 0, 'b': 0, 'c': 30, 'd': 30, 'e': 30}
+
+    result, cancelled = run(players, 3, shares_map, delays, cancel_after=0.05)
+    assert isinstance(result, asyncio.CancelledError)
+    assert sorted(cancelled) == ['c', 'd', 'e']
+
+
+def test_unknown_player():
+    loop = asyncio.new_event_loop()
+    try:
+        with pytest.raises(ValueError):
+            loop.run_until_complete(aio.reconstruct_authenticated_secret(['a', 'b'], 2, len(secret), {'c': None}))
+    finally:
+        loop.close()
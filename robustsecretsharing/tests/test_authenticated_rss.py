@@ -1,10 +1,11 @@
-from robustsecretsharing import rss
-from robustsecretsharing.schemes import authentication
-from robustsecretsharing.crypto_tools import random
+from robustsecretsharing import rss, tracing
+from robustsecretsharing.schemes import authentication, sss, pairing
+from robustsecretsharing.crypto_tools import random, caching
 import pytest
+import json
 
-secret = 'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
-alt_secret = 'c4bbcb1fbec99d65bf59d85c8cb62ee2db963f0fe106f483d9afa73bd4e39a8a'
+secret = b'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
+alt_secret = b'c4bbcb1fbec99d65bf59d85c8cb62ee2db963f0fe106f483d9afa73bd4e39a8a'
 PRIME = 2**13 - 1  # arbitary prime for generating random ids
 
 
@@ -33,7 +34,7 @@ def get_shares_subset(players, reconstruction_threshold, secret, end):
     '''
     max_secret_length = len(secret)
     shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
-    return {player: shares_map[player] for player in shares_map.keys()[:end]}
+    return {player: shares_map[player] for player in list(shares_map.keys())[:end]}
 
 
 def jsonify_dict(shares):
@@ -92,11 +93,11 @@ def corrupt_share_and_recover(num_players, reconstruction_threshold, max_secret_
     Returns:
         the result of robust reconstruction
     '''
-    corrupters = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_corrupt]}
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_corrupt]}
 
     # corrupt share data
     for player, share_dict in corrupters.items():
-        share_dict["share"] /= 4
+        share_dict["share"] //= 4
 
     shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
     return rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_secret_length, shares)
@@ -114,14 +115,14 @@ def corrupt_vectors_and_recover(num_players, reconstruction_threshold, max_secre
     Returns:
         the result of robust reconstruction
     '''
-    corrupters = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_corrupt]}
-    verifiers = [player for player in shares_subset.keys()[:degree_of_corruption]]
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_corrupt]}
+    verifiers = [player for player in list(shares_subset.keys())[:degree_of_corruption]]
 
     # corrupt vector data
     for player, share_dict in corrupters.items():
         for verifier in verifiers:
-            share_dict["vectors"][verifier][0] /= 4
-            share_dict["vectors"][verifier][1] /= 4
+            share_dict["vectors"][verifier][0] //= 4
+            share_dict["vectors"][verifier][1] //= 4
 
     shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
     return rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_secret_length, shares)
@@ -139,13 +140,13 @@ def corrupt_keys_and_recover(num_players, reconstruction_threshold, max_secret_l
     Returns:
         the result of robust reconstruction
     '''
-    corrupters = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_corrupt]}
-    verifiers = [player for player in shares_subset.keys()[:degree_of_corruption]]
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_corrupt]}
+    verifiers = [player for player in list(shares_subset.keys())[:degree_of_corruption]]
 
     # corrupt key data
     for player, share_dict in corrupters.items():
         for verifier in verifiers:
-            share_dict["keys"][verifier] /= 4
+            share_dict["keys"][verifier] //= 4
 
     shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
     return rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_secret_length, shares)
@@ -164,10 +165,10 @@ def collude_and_recover(num_players, reconstruction_threshold, max_secret_length
     '''
     max_secret_length = len(secret)
 
-    colluders = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_collude]}
+    colluders = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_collude]}
 
     for player, player_dict in colluders.items():
-        player_dict["share"] /= 2
+        player_dict["share"] //= 2
         for verifier, verifier_dict in colluders.items():
             new_key, new_vector = authentication.generate_check_vector(player_dict["share"], max_secret_length)
             verifier_dict["keys"][player] = new_key
@@ -232,7 +233,7 @@ def test_robust_secret_with_leading_zeroes():
     players = get_ids(num_players)
 
     # Create secret
-    trailing_zero_secret = '\x00\x00e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
+    trailing_zero_secret = b'\x00\x00e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'
 
     recovered_secret, valid_players, invalid_players = \
         share_and_recover(players, reconstruction_threshold, trailing_zero_secret, end)
@@ -245,7 +246,7 @@ def test_robust_many_players():
 
     players = get_ids(num_players)
 
-    secret = '\x0A'
+    secret = b'\x0A'
 
     recovered_secret, valid_players, invalid_players = \
         share_and_recover(players, reconstruction_threshold, secret, reconstruction_threshold)
@@ -314,7 +315,7 @@ def test_robust_bad_configuration_prime_small_secret():
 
     players = get_ids(num_players)
 
-    bad_secret = '\xFF\xFF'
+    bad_secret = b'\xFF\xFF'
     max_secret_length = len(bad_secret) - 1
 
     with pytest.raises(ValueError):
@@ -356,7 +357,7 @@ def test_honest_less_dishonest_greater_corrupt_some_vectors_failure():
     reconstruction_threshold = 10
     num_corrupt = reconstruction_threshold
     end = 15
-    degree_of_corruption = num_players / 2
+    degree_of_corruption = num_players // 2
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
@@ -377,7 +378,7 @@ def test_honest_less_dishonest_greater_corrupt_some_keys_failure():
     reconstruction_threshold = 10
     num_corrupt = reconstruction_threshold
     end = 15
-    degree_of_corruption = num_players / 2
+    degree_of_corruption = num_players // 2
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
@@ -410,7 +411,7 @@ def test_honest_less_dishonest_equal_corrupt_some_vectors_failure():
     reconstruction_threshold = 7
     num_corrupt = reconstruction_threshold - 1
     end = 10   # 6 are dishonest so only 4 are left honest
-    degree_of_corruption = num_players / 2
+    degree_of_corruption = num_players // 2
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
@@ -430,7 +431,7 @@ def test_honest_less_dishonest_less_corrupt_some_keys_failure():
     reconstruction_threshold = 7
     num_corrupt = 4
     end = 10
-    degree_of_corruption = num_players / 2
+    degree_of_corruption = num_players // 2
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
@@ -463,14 +464,14 @@ def test_honest_greater_dishonest_equal_corrupt_share():
     recovered_secret, authorized_players, invalid_players = \
         corrupt_share_and_recover(num_players, reconstruction_threshold, len(secret), shares_subset, dishonest)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[dishonest:],
+                          authorized_players, list(shares_subset.keys())[dishonest:],
                           invalid_players, []) is True
 
 
 def test_honest_greater_dishonest_less_corrupt_share():
     num_players = 20
     reconstruction_threshold = 7
-    dishonest = reconstruction_threshold - reconstruction_threshold / 2
+    dishonest = reconstruction_threshold - reconstruction_threshold // 2
     end = num_players
 
     players = get_ids(num_players)
@@ -479,7 +480,7 @@ def test_honest_greater_dishonest_less_corrupt_share():
     recovered_secret, authorized_players, invalid_players = \
         corrupt_share_and_recover(num_players, reconstruction_threshold, len(secret), shares_subset, dishonest)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[dishonest:],
+                          authorized_players, list(shares_subset.keys())[dishonest:],
                           invalid_players, []) is True
 
 
@@ -496,7 +497,7 @@ def test_greater_honest_less_dishonest_corrupt_half_vectors():
     num_corrupt = 1
     num_players = reconstruction_threshold + num_corrupt
     end = num_players
-    degree_of_corruption = num_players / 2
+    degree_of_corruption = num_players // 2
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
@@ -528,7 +529,7 @@ def test_greater_honest_equal_dishonest_corrupt_all_vectors():
     recovered_secret, authorized_players, invalid_players = \
         corrupt_vectors_and_recover(num_players, reconstruction_threshold, len(secret), shares_subset, num_corrupt, degree_of_corruption)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_corrupt:],
+                          authorized_players, list(shares_subset.keys())[num_corrupt:],
                           invalid_players, []) is True
 
 
@@ -699,7 +700,7 @@ def test_collusion():
         collude_and_recover(num_players, reconstruction_threshold, len(secret), shares_subset, num_collude)
 
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_collude:],
+                          authorized_players, list(shares_subset.keys())[num_collude:],
                           invalid_players, []) is True
 
 
@@ -713,7 +714,7 @@ def test_json_bracket_parse_error():
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
 
     broken_shares = {}
-    for player, share in shares_subset.items()[:num_broken]:
+    for player, share in list(shares_subset.items())[:num_broken]:
         broken_shares[player] = share[1:]  # remove opening JSON bracket
 
     shares = combine_testing_dictionaries(shares_subset, broken_shares)
@@ -721,8 +722,8 @@ def test_json_bracket_parse_error():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_list_parse_error():
@@ -735,7 +736,7 @@ def test_json_list_parse_error():
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
 
     broken_shares = {}
-    for player, share in shares_subset.items()[:num_broken]:
+    for player, share in list(shares_subset.items())[:num_broken]:
         list_index = share.index("[")
         broken_shares[player] = share[:list_index] + share[list_index + 1:]
 
@@ -744,8 +745,8 @@ def test_json_list_parse_error():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_key_error():
@@ -758,7 +759,7 @@ def test_json_key_error():
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
 
     broken_shares = {}
-    for player, share in shares_subset.items()[:num_broken]:
+    for player, share in list(shares_subset.items())[:num_broken]:
         keys_index = share.index("keys")
         share = share[:keys_index] + "pown" + share[keys_index + len("keys"):]
         broken_shares[player] = share
@@ -768,8 +769,8 @@ def test_json_key_error():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_parse_make_share_string():
@@ -780,7 +781,7 @@ def test_json_parse_make_share_string():
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
-    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_broken]}
+    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_broken]}
 
     for player, share in unjsonify_shares.items():
         share["share"] = str(share["share"])
@@ -790,8 +791,8 @@ def test_json_parse_make_share_string():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_parse_remove_vectors():
@@ -802,10 +803,10 @@ def test_json_parse_remove_vectors():
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
-    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_broken]}
+    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_broken]}
 
     for player, share in unjsonify_shares.items():
-        for vector in share["vectors"].keys()[:num_players / 2]:
+        for vector in list(share["vectors"].keys())[:num_players // 2]:
             del share["vectors"][vector]
 
     shares = combine_testing_dictionaries(shares_subset, jsonify_dict(unjsonify_shares))
@@ -813,8 +814,8 @@ def test_json_parse_remove_vectors():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_parse_remove_keys():
@@ -825,10 +826,10 @@ def test_json_parse_remove_keys():
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
-    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_broken]}
+    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_broken]}
 
     for player, share in unjsonify_shares.items():
-        for key in share["keys"].keys()[:num_players / 2]:
+        for key in list(share["keys"].keys())[:num_players // 2]:
             del share["keys"][key]
 
     shares = combine_testing_dictionaries(shares_subset, jsonify_dict(unjsonify_shares))
@@ -836,8 +837,8 @@ def test_json_parse_remove_keys():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_parse_make_vector_dict_string():
@@ -848,7 +849,7 @@ def test_json_parse_make_vector_dict_string():
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
-    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_broken]}
+    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_broken]}
 
     for player, share in unjsonify_shares.items():
         share["vectors"] = str(share["vectors"])
@@ -858,8 +859,8 @@ def test_json_parse_make_vector_dict_string():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_parse_make_some_vectors_string():
@@ -870,10 +871,10 @@ def test_json_parse_make_some_vectors_string():
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
-    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_broken]}
+    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_broken]}
 
     for player, share in unjsonify_shares.items():
-        for victim in share["vectors"].keys()[:num_players / 2]:
+        for victim in list(share["vectors"].keys())[:num_players // 2]:
             share["vectors"][victim] = str(share["vectors"][victim])
 
     shares = combine_testing_dictionaries(shares_subset, jsonify_dict(unjsonify_shares))
@@ -881,8 +882,8 @@ def test_json_parse_make_some_vectors_string():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_json_parse_make_key_dict_string():
@@ -893,7 +894,7 @@ def test_json_parse_make_key_dict_string():
 
     players = get_ids(num_players)
     shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
-    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in shares_subset.items()[:num_broken]}
+    unjsonify_shares = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_broken]}
 
     for player, share in unjsonify_shares.items():
         share["keys"] = str(share["keys"])
@@ -903,8 +904,8 @@ def test_json_parse_make_key_dict_string():
     recovered_secret, authorized_players, invalid_players = \
         rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares)
     assert verify_results(recovered_secret, secret,
-                          authorized_players, shares_subset.keys()[num_broken:],
-                          invalid_players, shares_subset.keys()[:num_broken]) is True
+                          authorized_players, list(shares_subset.keys())[num_broken:],
+                          invalid_players, list(shares_subset.keys())[:num_broken]) is True
 
 
 def test_various_parse_errors():
@@ -920,11 +921,11 @@ def test_various_parse_errors():
 
     remove_vectors_player = players[0]
     remove_vectors_share = unjsonify_shares[remove_vectors_player]
-    unjsonify_shares[remove_vectors_player]["vectors"] = {player: vector for player, vector in remove_vectors_share["vectors"].items()[:4]}
+    unjsonify_shares[remove_vectors_player]["vectors"] = {player: vector for player, vector in list(remove_vectors_share["vectors"].items())[:4]}
 
     remove_keys_player = players[1]
     remove_keys_share = unjsonify_shares[remove_keys_player]
-    unjsonify_shares[remove_keys_player]["keys"] = {player: key for player, key in remove_keys_share["keys"].items()[:4]}
+    unjsonify_shares[remove_keys_player]["keys"] = {player: key for player, key in list(remove_keys_share["keys"].items())[:4]}
 
     make_share_string_player = players[2]
     unjsonify_shares[make_share_string_player]["share"] = str(unjsonify_shares[make_share_string_player]["share"])
@@ -945,3 +946,819 @@ def test_various_parse_errors():
     assert verify_results(recovered_secret, secret,
                           authorized_players, list(set(players) - set(dishonest_players)),
                           invalid_players, dishonest_players) is True
+
+
+def test_one_interpolation_per_distinct_verified_set(monkeypatch):
+    num_players = 9
+    reconstruction_threshold = 5
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    interpolated = []
+    reconstruct_secret_int = sss._reconstruct_secret_int
+
+    def counting_reconstruct_secret_int(num_players, max_secret_length, shares, reconstruction_threshold=None):
+        interpolated.append(tuple(shares))
+        return reconstruct_secret_int(num_players, max_secret_length, shares, reconstruction_threshold)
+
+    monkeypatch.setattr(sss, "_reconstruct_secret_int", counting_reconstruct_secret_int)
+
+    recovered_secret, authorized_players, invalid_players = \
+        rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset)
+    assert verify_results(recovered_secret, secret, authorized_players, players, invalid_players, []) is True
+    assert len(interpolated) == 1
+
+
+def verification_cache_and_recover(monkeypatch, verification_cache):
+    num_players = 7
+    reconstruction_threshold = 4
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    validated = []
+    validate = authentication.validate
+
+    def counting_validate(key, vector, message, max_length):
+        validated.append(message)
+        return validate(key, vector, message, max_length)
+
+    monkeypatch.setattr(authentication, "validate", counting_validate)
+
+    for _ in range(2):
+        recovered_secret, authorized_players, invalid_players = \
+            rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset,
+                                                 verification_cache=verification_cache)
+        assert verify_results(recovered_secret, secret, authorized_players, players, invalid_players, []) is True
+
+    # only the first reconstruction performs authentication checks
+    assert len(validated) == num_players ** 2
+    assert verification_cache.misses == num_players and verification_cache.hits == num_players
+
+
+def test_memory_verification_cache(monkeypatch):
+    verification_cache_and_recover(monkeypatch, caching.LRUCache(100))
+
+
+def test_disk_verification_cache(monkeypatch, tmpdir):
+    verification_cache_and_recover(monkeypatch, caching.SQLiteCache(str(tmpdir.join("verifications.db")), 100))
+
+
+def test_verification_cache_corrupted_share():
+    num_players = 8
+    reconstruction_threshold = 4
+    dishonest = 2
+    end = num_players
+
+    verification_cache = caching.LRUCache(100)
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+    rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset,
+                                         verification_cache=verification_cache)
+
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:dishonest]}
+    for player, share_dict in corrupters.items():
+        share_dict["share"] //= 4
+    shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
+
+    recovered_secret, authorized_players, invalid_players = \
+        rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares,
+                                             verification_cache=verification_cache)
+    assert verify_results(recovered_secret, secret,
+                          authorized_players, list(shares_subset.keys())[dishonest:],
+                          invalid_players, []) is True
+
+
+def reconstruct_eager_and_lazy(num_players, reconstruction_threshold, max_secret_length, shares):
+    '''
+    Args:
+        num_players, the number of players that were shared across
+        reconstruction_threshold, the threshold for reconstruction
+        max_secret_length, the maximum length of the secret that was shared
+        shares, a dictionary of players to json robust shares
+    Returns:
+        a tuple of the secrets recovered (or exception types raised) by default and lazy robust reconstruction
+    '''
+    results = []
+    for lazy in [False, True]:
+        try:
+            results.append(rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, max_secret_length,
+                                                                shares, lazy=lazy)[0])
+        except rss.FatalReconstructionFailure:
+            results.append(rss.FatalReconstructionFailure)
+    return results
+
+
+def test_lazy_honest_majority_work():
+    num_players = 9
+    reconstruction_threshold = 5
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    stats = {}
+    recovered_secret, authorized_players, invalid_players = \
+        rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset,
+                                             lazy=True, stats=stats)
+    assert verify_results(recovered_secret, secret, authorized_players, players, invalid_players, []) is True
+
+    # once reconstruction_threshold verifiers agree, the remaining verifiers cannot form another voting block
+    assert stats["mac_checks"] == reconstruction_threshold * num_players
+    assert stats["interpolations"] == 1
+
+
+def test_eager_work():
+    num_players = 9
+    reconstruction_threshold = 5
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    stats = {}
+    rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset, stats=stats)
+    assert stats["mac_checks"] == num_players ** 2
+    assert stats["interpolations"] == 1
+    assert stats["candidate_secrets"] == 1
+    assert stats["bytes_parsed"] == sum(len(share) for share in shares_subset.values())
+    assert "inversions" in stats  # zero when the Lagrange weights are already cached
+
+
+def test_traced_reconstruction():
+    num_players = 5
+    reconstruction_threshold = 3
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    tracer = tracing.Tracer()
+    recovered_secret, authorized_players, invalid_players = \
+        rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset,
+                                             stats=tracer)
+    assert verify_results(recovered_secret, secret, authorized_players, players, invalid_players, []) is True
+    assert sorted(tracer.timings) == ["deserialize", "reconstruct", "validate", "verify", "vote"]
+    assert tracer["mac_checks"] == num_players ** 2
+
+    tracer = tracing.Tracer()
+    rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset,
+                                         lazy=True, stats=tracer)
+    assert sorted(tracer.timings) == ["deserialize", "validate", "verify_and_reconstruct", "vote"]
+
+
+def test_traced_failure():
+    num_players = 5
+    reconstruction_threshold = 3
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, reconstruction_threshold - 1)
+
+    tracer = tracing.Tracer()
+    with pytest.raises(rss.FatalReconstructionFailure):
+        rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares_subset,
+                                             stats=tracer)
+    assert "vote" in tracer.timings
+    assert tracer["candidate_secrets"] == 0
+
+
+def test_traced_sharing():
+    num_players = 5
+    reconstruction_threshold = 3
+
+    players = get_ids(num_players)
+    tracer = tracing.Tracer()
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret, tracer)
+    assert sorted(tracer.timings) == ["authenticate", "serialize", "share"]
+    assert tracer["mac_generations"] == num_players ** 2
+    assert tracer["bytes_serialized"] == sum(len(share) for share in shares_map.values())
+
+
+def test_lazy_matches_eager_corrupt_shares():
+    num_players = 20
+    reconstruction_threshold = 7
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    for dishonest in [0, reconstruction_threshold - 1, 2 * reconstruction_threshold]:
+        corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:dishonest]}
+        for player, share_dict in corrupters.items():
+            share_dict["share"] //= 4
+        shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
+
+        eager, lazy = reconstruct_eager_and_lazy(num_players, reconstruction_threshold, len(secret), shares)
+        assert eager == lazy
+
+
+def test_lazy_matches_eager_corrupt_keys():
+    reconstruction_threshold = 7
+    num_corrupt = reconstruction_threshold - 1
+    num_players = reconstruction_threshold + num_corrupt
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_corrupt]}
+    for player, share_dict in corrupters.items():
+        for verifier in shares_subset.keys():
+            share_dict["keys"][verifier] //= 4
+    shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
+
+    eager, lazy = reconstruct_eager_and_lazy(num_players, reconstruction_threshold, len(secret), shares)
+    assert eager == lazy == secret
+
+
+def test_lazy_failure():
+    num_players = 8
+    reconstruction_threshold = 4
+    dishonest = 6
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:dishonest]}
+    for player, share_dict in corrupters.items():
+        share_dict["share"] //= 4
+    shares = combine_testing_dictionaries(shares_subset, jsonify_dict(corrupters))
+
+    with pytest.raises(rss.FatalReconstructionFailure):
+        rss.reconstruct_authenticated_secret(num_players, reconstruction_threshold, len(secret), shares, lazy=True)
+
+
+def test_vote_settled():
+    reconstruction_threshold = 3
+    assert rss._is_vote_settled({"a": [1, 2, 3]}, 2, reconstruction_threshold) is True
+    assert rss._is_vote_settled({"a": [1, 2, 3]}, 3, reconstruction_threshold) is False
+    assert rss._is_vote_settled({"a": [1, 2, 3], "b": [4]}, 2, reconstruction_threshold) is False
+    assert rss._is_vote_settled({"a": [1, 2, 3], "b": [4, 5, 6]}, 5, reconstruction_threshold) is True
+    assert rss._is_vote_settled({"a": [1]}, 1, reconstruction_threshold) is True
+    assert rss._is_vote_settled({}, 3, reconstruction_threshold) is False
+
+
+def test_inconsistent_verified_set_abstains():
+    num_players = 7
+    reconstruction_threshold = 3
+    end = num_players
+
+    players = get_ids(num_players)
+    shares_subset = get_shares_subset(players, reconstruction_threshold, secret, end)
+    shares_map = {player: rss._deserialize_robust_share(share)["share"] for player, share in shares_subset.items()}
+
+    # the first player corrupts their share and claims to verify every share, including their own
+    cheater = players[0]
+    shares_map[cheater] //= 4
+    honest = tuple(sorted(players[1:]))
+    verifies_map = {player: honest for player in players[1:]}
+    verifies_map[cheater] = tuple(sorted(players))
+
+    stats = {}
+    secret_map = rss._get_player_to_secret_map(verifies_map, shares_map, num_players, reconstruction_threshold,
+                                               len(secret), stats)
+    assert secret_map == {player: secret for player in players[1:]}
+    assert stats["interpolations"] == 1
+
+
+def test_share_many_secrets():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    secrets = [secret, alt_secret[:max_secret_length], b'\x00' * max_secret_length]
+
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets)
+    assert sorted(bundles.keys()) == sorted(players)
+    for index, original in enumerate(secrets):
+        shares_map = {player: json.dumps(json.loads(bundle)[index]) for player, bundle in bundles.items()}
+        recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+            len(players), reconstruction_threshold, max_secret_length, shares_map)
+        assert recovered_secret == original
+        assert sorted(valid_players) == sorted(players) and invalid_players == []
+
+
+def test_share_many_secrets_empty():
+    players = get_ids(3)
+    assert rss.share_authenticated_secrets(players, 2, 4, []) == {player: '[]' for player in players}
+
+
+def test_reconstruct_many_secrets():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    secrets = [secret, alt_secret[:max_secret_length], b'\x00' * max_secret_length]
+
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets)
+    results = rss.reconstruct_authenticated_secrets(len(players), reconstruction_threshold, max_secret_length, bundles)
+    assert len(results) == len(secrets)
+    for (recovered_secret, valid_players, invalid_players), original in zip(results, secrets):
+        assert verify_results(recovered_secret, original, valid_players, players, invalid_players, [])
+
+
+def test_reconstruct_many_secrets_broken_bundle():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    secrets = [secret, alt_secret[:max_secret_length]]
+
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets)
+    dishonest = players[0]
+    bundles[dishonest] = bundles[dishonest][1:]
+    results = rss.reconstruct_authenticated_secrets(len(players), reconstruction_threshold, max_secret_length, bundles)
+    for (recovered_secret, valid_players, invalid_players), original in zip(results, secrets):
+        assert verify_results(recovered_secret, original, valid_players, players[1:], invalid_players, [dishonest])
+
+
+def test_reconstruct_many_secrets_padded_bundle():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    secrets = [secret, alt_secret[:max_secret_length]]
+
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets)
+    dishonest = players[0]
+    padded = json.loads(bundles[dishonest])
+    bundles[dishonest] = json.dumps(padded + padded * 50)
+
+    stats = {}
+    results = rss.reconstruct_authenticated_secrets(len(players), reconstruction_threshold, max_secret_length, bundles,
+                                                    stats=stats)
+    assert len(results) == len(secrets) and stats["interpolations"] == len(secrets)
+    for (recovered_secret, valid_players, invalid_players), original in zip(results, secrets):
+        assert verify_results(recovered_secret, original, valid_players, players[1:], invalid_players, [dishonest])
+
+    results = rss.reconstruct_authenticated_secrets(len(players), reconstruction_threshold, max_secret_length, bundles,
+                                                    num_secrets=len(secrets))
+    assert [result[0] for result in results] == secrets
+
+
+def test_reconstruct_many_secrets_no_agreed_length():
+    players = get_ids(3)
+    bundles = rss.share_authenticated_secrets(players, 2, len(secret), [secret, secret])
+    bundles[players[0]] = json.dumps(json.loads(bundles[players[0]])[:1])
+    bundles[players[1]] = '[]'
+    with pytest.raises(rss.FatalReconstructionFailure):
+        rss.reconstruct_authenticated_secrets(len(players), 2, len(secret), bundles)
+
+
+def test_reconstruct_many_secrets_individual_failure():
+    players = get_ids(4)
+    reconstruction_threshold = 2
+    max_secret_length = len(secret)
+    secrets = [secret, alt_secret[:max_secret_length]]
+
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets)
+    # two colluding players swap in shares of another secret for the second secret only
+    fake = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets[:1])
+    for player in players[:2]:
+        bundle = json.loads(bundles[player])
+        bundle[1] = json.loads(fake[player])[0]
+        bundles[player] = json.dumps(bundle)
+
+    results = rss.reconstruct_authenticated_secrets(len(players), reconstruction_threshold, max_secret_length, bundles)
+    assert results[0][0] == secrets[0]
+    assert isinstance(results[1], rss.FatalReconstructionFailure)
+
+
+def test_reconstructor_decides_at_quorum():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    reconstructor = rss.Reconstructor(players, reconstruction_threshold, max_secret_length)
+    assert reconstructor.add_share(players[0], shares_map[players[0]]) is False
+    assert reconstructor.add_share(players[1], shares_map[players[1]]) is False
+    with pytest.raises(ValueError):
+        reconstructor.result()
+    assert reconstructor.add_share(players[2], shares_map[players[2]]) is True
+
+    recovered_secret, valid_players, invalid_players = reconstructor.result()
+    assert verify_results(recovered_secret, secret, valid_players, players[:3], invalid_players, [])
+    assert reconstructor.add_share(players[3], shares_map[players[3]]) is True  # ignored after the decision
+
+
+def test_reconstructor_waits_out_corrupt_shares():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    reconstructor = rss.Reconstructor(players, reconstruction_threshold, max_secret_length)
+    assert reconstructor.add_share(players[0], "not a share") is False
+    for player in players[1:3]:
+        assert reconstructor.add_share(player, shares_map[player]) is False
+    assert reconstructor.add_share(players[3], shares_map[players[3]]) is True
+
+    recovered_secret, valid_players, invalid_players = reconstructor.result()
+    assert verify_results(recovered_secret, secret, valid_players, players[1:4], invalid_players, [players[0]])
+
+
+def test_reconstructor_matches_batch():
+    players = get_ids(6)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+    shares_map[players[0]] = shares_map[players[1]]  # a dishonest player replays another player's share
+
+    reconstructor = rss.Reconstructor(players, reconstruction_threshold, max_secret_length)
+    for player in players:
+        if reconstructor.add_share(player, shares_map[player]):
+            break
+    assert reconstructor.result()[0] == \
+        rss.reconstruct_authenticated_secret(len(players), reconstruction_threshold, max_secret_length, shares_map)[0]
+
+
+def test_reconstructor_finish_failure():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    reconstructor = rss.Reconstructor(players, reconstruction_threshold, max_secret_length)
+    for player in players[:2]:
+        reconstructor.add_share(player, shares_map[player])
+    reconstructor.finish()
+    assert reconstructor.decided
+    with pytest.raises(rss.FatalReconstructionFailure):
+        reconstructor.result()
+
+
+def test_reconstructor_repeated_player():
+    players = get_ids(3)
+    shares_map = rss.share_authenticated_secret(players, 2, len(secret), secret)
+
+    reconstructor = rss.Reconstructor(players, 2, len(secret))
+    reconstructor.add_share(players[0], shares_map[players[0]])
+    with pytest.raises(ValueError):
+        reconstructor.add_share(players[0], shares_map[players[0]])
+    with pytest.raises(ValueError):
+        reconstructor.add_share("stranger", shares_map[players[1]])
+
+
+def test_iter_shares_recover():
+    players = get_ids(6)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+
+    stream = rss.iter_authenticated_shares(players, reconstruction_threshold, max_secret_length, secret)
+    emitted = list(stream)
+    assert [player for player, _ in emitted] == players
+
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+        len(players), reconstruction_threshold, max_secret_length, dict(emitted))
+    assert verify_results(recovered_secret, secret, valid_players, players, invalid_players, [])
+
+
+def test_iter_shares_all_macs_verify():
+    players = get_ids(4)
+    max_secret_length = len(secret)
+    robust_shares = {player: json.loads(share) for player, share in
+                     rss.iter_authenticated_shares(players, 2, max_secret_length, secret)}
+    for verifier in players:
+        for player in players:
+            assert authentication.validate(robust_shares[verifier]['keys'][player],
+                                           robust_shares[player]['vectors'][verifier],
+                                           robust_shares[player]['share'], max_secret_length + 1)
+
+
+def test_iter_shares_bad_configuration():
+    players = get_ids(3)
+    with pytest.raises(ValueError):
+        rss.iter_authenticated_shares(players, 4, len(secret), secret)  # raised before any share is requested
+
+
+def get_attributes(serialized_map):
+    '''
+    Returns:
+        the tuple of (shares_map, keys_for_players, vectors_from_players) for the given serialized robust shares
+    '''
+    robust_shares_map = {player: json.loads(share) for player, share in serialized_map.items()}
+    return rss._map_player_to_attributes(robust_shares_map, set())
+
+
+def test_refresh_recover():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    updates = rss.generate_refresh(players, reconstruction_threshold, max_secret_length)
+    refreshed_map = {player: rss.apply_refresh(len(players), max_secret_length, shares_map[player], updates[player])
+                     for player in players}
+    for player in players:
+        assert json.loads(refreshed_map[player])['share'] != json.loads(shares_map[player])['share']
+
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+        len(players), reconstruction_threshold, max_secret_length, refreshed_map)
+    assert verify_results(recovered_secret, secret, valid_players, players, invalid_players, [])
+
+
+def test_refresh_mixed_epochs():
+    players = get_ids(4)
+    reconstruction_threshold = 2
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    # refreshed shares authenticate each other but not shares from before the refresh,
+    # and each group reconstructs the same secret
+    updates = rss.generate_refresh(players, reconstruction_threshold, max_secret_length)
+    mixed_map = dict(shares_map)
+    for player in players[:2]:
+        mixed_map[player] = rss.apply_refresh(len(players), max_secret_length, shares_map[player], updates[player])
+
+    verified_sets = {rss._authenticate_players(verifier, *attributes, max_secret_length=max_secret_length)
+                     for verifier, attributes in [(player, get_attributes(mixed_map)) for player in players]}
+    assert verified_sets == {tuple(sorted(players[:2])), tuple(sorted(players[2:]))}
+    assert rss.reconstruct_authenticated_secret(len(players), reconstruction_threshold, max_secret_length, mixed_map)[0] == secret
+
+
+def test_refresh_wrong_player():
+    players = get_ids(3)
+    shares_map = rss.share_authenticated_secret(players, 2, len(secret), secret)
+    updates = rss.generate_refresh(players, 2, len(secret))
+    with pytest.raises(ValueError):
+        rss.apply_refresh(len(players), len(secret), shares_map[players[0]], updates[players[1]])
+    with pytest.raises(ValueError):
+        rss.apply_refresh(len(players), len(secret), shares_map[players[0]], '{}')
+
+
+def test_refresh_vault(monkeypatch):
+    monkeypatch.setattr(rss, "REFRESH_CHUNK_SIZE", 2)
+    players = get_ids(4)
+    reconstruction_threshold = 2
+    max_secret_length = len(secret)
+    secrets = [secret, alt_secret[:max_secret_length], b'\x00' * max_secret_length]
+    bundles = rss.share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets)
+
+    updates = list(rss.iter_refresh_updates(players, reconstruction_threshold, max_secret_length, len(secrets)))
+    assert len(updates) == len(secrets)
+    refreshed_bundles = {}
+    for player in players:
+        vault = [json.dumps(robust_share) for robust_share in json.loads(bundles[player])]
+        refreshed = rss.refresh_vault(len(players), max_secret_length, vault, (update[player] for update in updates))
+        refreshed_bundles[player] = json.dumps([json.loads(share) for share in refreshed])
+
+    results = rss.reconstruct_authenticated_secrets(len(players), reconstruction_threshold, max_secret_length,
+                                                    refreshed_bundles)
+    assert [result[0] for result in results] == secrets
+
+
+def test_refresh_vault_length_mismatch():
+    players = get_ids(3)
+    shares_map = rss.share_authenticated_secret(players, 2, len(secret), secret)
+    updates = rss.iter_refresh_updates(players, 2, len(secret), 2)
+    with pytest.raises(ValueError):
+        list(rss.refresh_vault(len(players), len(secret), [shares_map[players[0]]],
+                               (update[players[0]] for update in updates)))
+
+
+def get_subset(shares_map, players):
+    '''
+    Returns:
+        the entries of shares_map for the given players
+    '''
+    return {player: shares_map[player] for player in players}
+
+
+def apply_membership_updates(shares_map, updates, max_secret_length):
+    '''
+    Returns:
+        a copy of shares_map in which every player with an update has applied it
+    '''
+    return {player: rss.apply_membership_update(max_secret_length, share, updates[player]) if player in updates else share
+            for player, share in shares_map.items()}
+
+
+def test_enroll_player():
+    players = get_ids(4)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    new_share, updates = rss.enroll_player(players, reconstruction_threshold, max_secret_length,
+                                           get_subset(shares_map, players[:3]), 'newcomer')
+    assert sorted(updates.keys()) == sorted(players)
+    assert list(json.loads(updates[players[0]])['keys'].keys()) == ['newcomer']
+
+    enrolled_map = apply_membership_updates(shares_map, updates, max_secret_length)
+    enrolled_map['newcomer'] = new_share
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+        len(players) + 1, reconstruction_threshold, max_secret_length, enrolled_map)
+    assert verify_results(recovered_secret, secret, valid_players, players + ['newcomer'], invalid_players, [])
+
+    # the new share can stand in for an old one
+    subset = get_subset(enrolled_map, ['newcomer'] + players[:2])
+    assert rss.reconstruct_authenticated_secret(len(players) + 1, reconstruction_threshold, max_secret_length, subset)[0] == secret
+
+
+def test_enroll_existing_player():
+    players = get_ids(3)
+    shares_map = rss.share_authenticated_secret(players, 2, len(secret), secret)
+    with pytest.raises(ValueError):
+        rss.enroll_player(players, 2, len(secret), shares_map, players[0])
+    with pytest.raises(ValueError):
+        rss.enroll_player(players, 2, len(secret), shares_map, 'newcomer', alpha=2)
+
+
+def test_revoke_player_then_refresh():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+    new_share, updates = rss.enroll_player(players, reconstruction_threshold, max_secret_length, shares_map, 'newcomer')
+    shares_map = apply_membership_updates(shares_map, updates, max_secret_length)
+    shares_map['newcomer'] = new_share
+    players = players + ['newcomer']
+
+    revoked = players[1]
+    updates = rss.revoke_player(players, revoked)
+    assert revoked not in updates
+    remaining = [player for player in players if player != revoked]
+    shares_map = apply_membership_updates(get_subset(shares_map, remaining), updates, max_secret_length)
+    for player in remaining:
+        assert revoked not in json.loads(shares_map[player])['keys']
+
+    # the remaining shares sit at x values 1, 3, 4, 5 and 6 after the revocation
+    alphas = [pairing.elegant_unpair(json.loads(shares_map[player])['share'])[0] for player in remaining]
+    refreshes = rss.generate_refresh(remaining, reconstruction_threshold, max_secret_length, alphas)
+    refreshed_map = {player: rss.apply_refresh(len(remaining), max_secret_length, shares_map[player], refreshes[player])
+                     for player in remaining}
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+        len(remaining), reconstruction_threshold, max_secret_length, refreshed_map)
+    assert verify_results(recovered_secret, secret, valid_players, remaining, invalid_players, [])
+
+
+def verify_everywhere(players, max_secret_length, shares_map):
+    '''
+    Returns:
+        a dictionary of players to the verifications each computes locally from the shares in shares_map
+    '''
+    return {player: rss.verify_peers(players, max_secret_length, player, shares_map[player], shares_map)
+            for player in shares_map}
+
+
+def strip_shares(shares_map):
+    '''
+    Returns:
+        a dictionary of players to robust shares without their keys and vectors
+    '''
+    return {player: json.dumps({"share": json.loads(share)["share"]}) for player, share in shares_map.items()}
+
+
+def test_decentralized_verification():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+    verifications = verify_everywhere(players, len(secret), shares_map)
+    assert all(json.loads(verification)["verified"] == 2**5 - 1 for verification in verifications.values())
+
+    stats = {}
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_from_verifications(
+        players, reconstruction_threshold, len(secret), strip_shares(shares_map), verifications, stats)
+    assert verify_results(recovered_secret, secret, valid_players, players, invalid_players, [])
+    assert stats["interpolations"] == 1 and "mac_checks" not in stats
+
+
+def test_decentralized_verification_corrupt_share():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+    cheater = players[0]
+    robust_share = json.loads(shares_map[cheater])
+    robust_share["share"] //= 4
+    shares_map[cheater] = json.dumps(robust_share)
+
+    verifications = verify_everywhere(players, len(secret), shares_map)
+    honest_bitmap = sum(1 << index for index, player in enumerate(sorted(players)) if player != cheater)
+    assert all(json.loads(verifications[player])["verified"] == honest_bitmap for player in players[1:])
+
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_from_verifications(
+        players, reconstruction_threshold, len(secret), strip_shares(shares_map), verifications)
+    assert verify_results(recovered_secret, secret, valid_players, players[1:], invalid_players, [])
+
+
+def test_decentralized_verification_equivocation():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+    verifications = verify_everywhere(players, len(secret), shares_map)
+
+    # the cheater shows the verifiers an authentic share, but sends the combiner another one,
+    # which the verifiers do not vouch for
+    combined = strip_shares(shares_map)
+    cheater = players[0]
+    combined[cheater] = json.dumps({"share": json.loads(combined[cheater])["share"] // 4})
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_from_verifications(
+        players, reconstruction_threshold, len(secret), combined, verifications)
+    assert verify_results(recovered_secret, secret, valid_players, players[1:], invalid_players, [])
+
+    # verifications of shares the combiner never received are not counted either
+    del combined[players[1]]
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_from_verifications(
+        players, reconstruction_threshold, len(secret), combined, verifications)
+    assert verify_results(recovered_secret, secret, valid_players, players[2:], invalid_players, [])
+
+
+def test_decentralized_verification_malformed():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+    with pytest.raises(ValueError):
+        rss.verify_peers(players, len(secret), players[0], '{"share": 1}', shares_map)
+    with pytest.raises(ValueError):
+        rss.verify_peers(players, len(secret), 'stranger', shares_map[players[0]], shares_map)
+
+    verifications = verify_everywhere(players, len(secret), shares_map)
+    verifications[players[0]] = '{"verified": -1, "digests": []}'
+    verifications[players[1]] = json.dumps({"verified": 2**5, "digests": [""]})
+    verifications['stranger'] = verifications[players[2]]
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_from_verifications(
+        players, reconstruction_threshold, len(secret), strip_shares(shares_map), verifications)
+    assert verify_results(recovered_secret, secret, valid_players, players[2:], invalid_players,
+                          [players[0], players[1], 'stranger'])
+
+
+def test_oversized_integers_are_rejected_before_conversion():
+    players = get_ids(7)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+
+    huge = shares_map[players[0]].replace('"share": ', '"share": 1%s' % ('0' * 200000))
+    out_of_field = json.loads(shares_map[players[1]])
+    out_of_field["share"] = -out_of_field["share"]
+    deep = '[' * 100000
+    shares_map.update({players[0]: huge, players[1]: json.dumps(out_of_field), players[2]: deep})
+
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+        len(players), reconstruction_threshold, len(secret), shares_map)
+    assert verify_results(recovered_secret, secret, valid_players, players[3:], invalid_players, players[:3])
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_error_corrected_secret(
+        len(players), reconstruction_threshold, len(secret), shares_map)
+    assert recovered_secret == secret and sorted(invalid_players) == sorted(players[:3])
+
+
+def test_integer_parser_bounds():
+    share_bound, max_digits = rss._get_field_bounds(5, len(secret))
+    assert len(str(share_bound)) <= max_digits
+    assert rss._deserialize_robust_share('{"share": %d}' % (share_bound - 1), max_digits)["share"] == share_bound - 1
+    with pytest.raises(ValueError):
+        rss._deserialize_robust_share('{"share": %s}' % ('9' * (max_digits + 1)), max_digits)
+    with pytest.raises(ValueError):
+        rss._deserialize_robust_bundle('[{"share": -%s}]' % ('9' * (max_digits + 1)), max_digits)
+
+
+def test_bytes_parsed_budget():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+    share_length = max(len(share) for share in shares_map.values())
+
+    budget = rss.ReconstructionBudget(bytes_parsed=4 * share_length)
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(
+        len(players), reconstruction_threshold, len(secret), shares_map, stats=budget)
+    assert recovered_secret == secret and len(invalid_players) == 1 and len(valid_players) == 4
+    assert budget["bytes_parsed"] <= 4 * share_length
+
+    budget = rss.ReconstructionBudget(bytes_parsed=2 * share_length)
+    with pytest.raises(rss.FatalReconstructionFailure):
+        rss.reconstruct_authenticated_secret(len(players), reconstruction_threshold, len(secret), shares_map, stats=budget)
+    assert "bytes_parsed" not in budget or budget["bytes_parsed"] <= 2 * share_length
+
+    with pytest.raises(ValueError):
+        rss._charge_bytes(rss.ReconstructionBudget(bytes_parsed=10), shares_map[players[0]])
+
+
+def test_operation_budgets():
+    players = get_ids(5)
+    reconstruction_threshold = 3
+    shares_map = rss.share_authenticated_secret(players, reconstruction_threshold, len(secret), secret)
+
+    budget = rss.ReconstructionBudget(mac_checks=25, interpolations=1)
+    assert rss.reconstruct_authenticated_secret(len(players), reconstruction_threshold, len(secret), shares_map,
+                                                stats=budget)[0] == secret
+    assert budget["mac_checks"] == 25 and "deserialize" in budget.timings
+
+    with pytest.raises(rss.BudgetExceeded):
+        rss.reconstruct_authenticated_secret(len(players), reconstruction_threshold, len(secret), shares_map,
+                                             stats=rss.ReconstructionBudget(mac_checks=24))
+
+    # corrupt vectors split the verified sets, so that each verifier needs an interpolation of its own
+    corrupted = {player: json.loads(share) for player, share in shares_map.items()}
+    for verifier in players[:2]:
+        corrupted[players[4]]["vectors"][verifier][1] += 1
+    with pytest.raises(rss.BudgetExceeded):
+        rss.reconstruct_authenticated_secret(len(players), reconstruction_threshold, len(secret), jsonify_dict(corrupted),
+                                             stats=rss.ReconstructionBudget(interpolations=1))
+
+    reconstructor = rss.Reconstructor(players, reconstruction_threshold, len(secret),
+                                      stats=rss.ReconstructionBudget(mac_checks=5))
+    for player in players:
+        reconstructor.add_share(player, shares_map[player])
+    assert reconstructor.decided
+    with pytest.raises(rss.BudgetExceeded):
+        reconstructor.result()
@@ -0,0 +1,154 @@
+from robustsecretsharing import cli, rss
+import json
+import os
+import pytest
+import stat
+import sys
+
+PLAYERS = ["alice", "bob", "carol", "dave", "erin"]
+
+
+def share_file(tmpdir, data, workers=1):
+    '''
+    Args:
+        tmpdir, the pytest temporary directory
+        data, the bytestring contents of the file to share
+        workers, the number of worker processes to share with
+    Returns:
+        a tuple of the exit status of the share command and a dictionary of player ids to their share file paths
+    '''
+    tmpdir.join("input").write(data, mode="wb")
+    out_dir = str(tmpdir.join("shares"))
+    status = cli.main(["share", str(tmpdir.join("input")), "--players", ",".join(PLAYERS), "--threshold", "3",
+                       "--out-dir", out_dir, "--chunk-size", "16", "--batch-size", "4", "--workers", str(workers)])
+    return status, {player: os.path.join(out_dir, player + cli.SHARE_FILE_SUFFIX) for player in PLAYERS}
+
+
+def reconstruct_file(tmpdir, paths, workers=1):
+    '''
+    Returns:
+        a tuple of the exit status of the reconstruct command and the contents of the reconstructed file
+    '''
+    output = tmpdir.join("output")
+    status = cli.main(["reconstruct"] + paths + ["--output", str(output), "--workers", str(workers)])
+    return status, output.read(mode="rb")
+
+
+def test_share_reconstruct(tmpdir):
+    data = os.urandom(100)
+    status, paths = share_file(tmpdir, data)
+    assert status == 0
+    assert len(open(paths["alice"]).readlines()) == 1 + 7  # the header and one line per 16-byte chunk
+
+    assert reconstruct_file(tmpdir, sorted(paths.values())) == (0, data)
+
+
+def tamper_header(path, **changes):
+    '''
+    Rewrites the header of the share file at path with the given fields changed
+    '''
+    lines = open(path).readlines()
+    header = json.loads(lines[0])
+    header.update(changes)
+    lines[0] = json.dumps(header) + "\n"
+    with open(path, "w") as stream:
+        stream.writelines(lines)
+
+
+def test_reconstruct_tampered_header(tmpdir, capsys):
+    data = os.urandom(200)
+    _, paths = share_file(tmpdir, data)
+    tamper_header(paths["alice"], chunk_size=17)  # sorts first
+
+    assert reconstruct_file(tmpdir, sorted(paths.values())) == (0, data)
+    assert "skipping share file %s: header differs" % paths["alice"] in capsys.readouterr().err
+
+
+def test_reconstruct_claimed_player_ids(tmpdir, capsys):
+    data = os.urandom(200)
+    _, paths = share_file(tmpdir, data)
+    tamper_header(paths["alice"], player="bob")
+    tamper_header(paths["carol"], player="mallory")
+
+    assert reconstruct_file(tmpdir, sorted(paths.values())) == (1, b"")
+    err = capsys.readouterr().err
+    assert "skipping share file %s: player id bob is claimed by several files" % paths["alice"] in err
+    assert "skipping share file %s: player id bob is claimed by several files" % paths["bob"] in err
+    assert "skipping share file %s: unknown player id mallory" % paths["carol"] in err
+
+
+def test_reconstruct_no_agreed_header(tmpdir):
+    _, paths = share_file(tmpdir, os.urandom(32))
+    for player, chunk_size in zip(PLAYERS, [1, 1, 2, 2, 3]):
+        tamper_header(paths[player], chunk_size=chunk_size)
+    assert cli.main(["verify"] + sorted(paths.values())) == 2
+
+
+def test_reconstruct_with_workers(tmpdir):
+    data = os.urandom(200)
+    status, paths = share_file(tmpdir, data, workers=2)
+    assert status == 0
+    assert reconstruct_file(tmpdir, [paths[player] for player in PLAYERS[:3]], workers=2) == (0, data)
+
+
+def test_reconstruct_corrupt_share_file(tmpdir):
+    data = os.urandom(64)
+    _, paths = share_file(tmpdir, data)
+
+    lines = open(paths["bob"]).readlines()
+    robust_share = json.loads(lines[2])
+    robust_share["share"] += 1
+    lines[2] = json.dumps(robust_share) + "\n"
+    with open(paths["bob"], "w") as stream:
+        stream.writelines(lines)
+
+    assert reconstruct_file(tmpdir, sorted(paths.values())) == (0, data)
+
+
+def test_verify_too_few_shares(tmpdir):
+    _, paths = share_file(tmpdir, os.urandom(32))
+    assert cli.main(["verify"] + sorted(paths.values())) == 0
+    assert cli.main(["verify", paths["alice"], paths["bob"]]) == 2  # fewer files than the threshold share a header
+
+
+def test_bad_share_arguments(tmpdir):
+    tmpdir.join("input").write("data")
+    assert cli.main(["share", str(tmpdir.join("input")), "--players", "alice,alice", "--threshold", "1",
+                     "--out-dir", str(tmpdir.join("shares"))]) == 2
+    assert cli.main(["verify", str(tmpdir.join("input"))]) == 2
+
+
+def test_bench():
+    assert cli.main(["bench", "--size", "256"]) == 0
+
+
+def test_bench_with_workers():
+    assert cli.main(["bench", "--size", "256", "--chunk-size", "16", "--batch-size", "4", "--workers", "2"]) == 0
+
+
+def test_no_command():
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main([])
+    assert excinfo.value.code == 2
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX file modes")
+def test_share_file_mode(tmpdir):
+    tmpdir.mkdir("shares").join("alice" + cli.SHARE_FILE_SUFFIX).write("stale")
+    tmpdir.join("shares", "alice" + cli.SHARE_FILE_SUFFIX).chmod(0o644)
+    status, paths = share_file(tmpdir, os.urandom(32))
+    assert status == 0
+    for path in paths.values():
+        assert stat.S_IMODE(os.stat(path).st_mode) == cli.SHARE_FILE_MODE
+
+
+def test_share_undealt_chunks(tmpdir, monkeypatch):
+    share_authenticated_secrets = rss.share_authenticated_secrets
+
+    def drop_last_chunk(players, reconstruction_threshold, max_secret_length, secrets):
+        return share_authenticated_secrets(players, reconstruction_threshold, max_secret_length, secrets[:-1])
+    monkeypatch.setattr(rss, "share_authenticated_secrets", drop_last_chunk)
+
+    status, paths = share_file(tmpdir, os.urandom(100))
+    assert status == 2
+    assert not any(os.path.exists(path) for path in paths.values())
@@ -0,0 +1,90 @@
+from robustsecretsharing import dealing, rss
+import pytest
+import time
+
+secret = b'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
+players = ['alice', 'bob', 'carol', 'dave', 'erin']
+
+
+def test_deal_and_reconstruct():
+    with dealing.DealingPool(len(players), 3, len(secret), capacity=4, background=False) as pool:
+        pool.refill()
+        shares_map = pool.deal(players, secret)
+
+    assert sorted(shares_map.keys()) == sorted(players)
+    recovered_secret, valid_players, invalid_players = rss.reconstruct_authenticated_secret(len(players), 3, len(secret),
+                                                                                           shares_map)
+    assert recovered_secret == secret
+    assert sorted(valid_players) == sorted(players) and not invalid_players
+
+    subset = {player: shares_map[player] for player in players[2:]}
+    assert rss.reconstruct_authenticated_secret(len(players), 3, len(secret), subset)[0] == secret
+
+
+def test_deals_are_used_once():
+    with dealing.DealingPool(len(players), 3, len(secret), capacity=4, background=False) as pool:
+        pool.refill()
+        assert len(pool) == 4
+        first, second = pool.deal(players, secret), pool.deal(players, secret)
+        assert len(pool) == 2
+    assert all(first[player] != second[player] for player in players)
+
+
+def test_empty_pool_deals_on_demand():
+    with dealing.DealingPool(len(players), 3, len(secret), capacity=2, background=False) as pool:
+        shares_map = pool.deal(players, secret)
+        assert len(pool) == 0
+    assert rss.reconstruct_authenticated_secret(len(players), 3, len(secret), shares_map)[0] == secret
+
+
+def test_background_refill():
+    with dealing.DealingPool(len(players), 3, len(secret), capacity=8, low_water=2) as pool:
+        deadline = time.time() + 10
+        while len(pool) < 8 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(pool) == 8
+
+        for _ in range(6):  # down to the low water mark, which wakes the refill thread
+            pool.deal(players, secret)
+        deadline = time.time() + 10
+        while len(pool) < 8 and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(pool) == 8
+
+
+def test_forked_pool_discards_deals(monkeypatch):
+    pool = dealing.DealingPool(len(players), 3, len(secret), capacity=4, background=False)
+    pool.refill()
+    monkeypatch.setattr(dealing.os, "getpid", lambda: -1)  # as seen from a forked child
+    assert len(pool) == 0
+    shares_map = pool.deal(players, secret)
+    assert rss.reconstruct_authenticated_secret(len(players), 3, len(secret), shares_map)[0] == secret
+
+
+def test_closed_pool():
+    pool = dealing.DealingPool(len(players), 3, len(secret), capacity=4)
+    pool.close()
+    assert len(pool) == 0
+    with pytest.raises(ValueError):
+        pool.deal(players, secret)
+    with pytest.raises(ValueError):
+        pool.refill()
+
+
+def test_bad_parameters():
+    with pytest.raises(ValueError):
+        dealing.DealingPool(3, 4, len(secret), background=False)
+    with pytest.raises(ValueError):
+        dealing.DealingPool(3, 1, len(secret), background=False)
+    with pytest.raises(ValueError):
+        dealing.DealingPool(3, 2, len(secret), capacity=4, low_water=4, background=False)
+
+
+def test_bad_deal():
+    with dealing.DealingPool(len(players), 3, len(secret), capacity=2, background=False) as pool:
+        with pytest.raises(ValueError):
+            pool.deal(players[:4], secret)
+        with pytest.raises(ValueError):
+            pool.deal(players[:4] + players[:1], secret)
+        with pytest.raises(ValueError):
+            pool.deal(players, secret * 4)
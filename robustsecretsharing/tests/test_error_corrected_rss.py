@@ -0,0 +1,107 @@
+from robustsecretsharing import rss
+from robustsecretsharing.schemes import pairing
+from robustsecretsharing.tests import test_authenticated_rss
+import pytest
+
+secret = b'x\x02e\x9c\x9e\x16\xe9\xea\x15+\xbf]\xebx;o\xef\xc9X1c\xaepj\xebj\x12\xe3r\xcd\xeaM'  # An example key
+
+
+def share_corrupt_and_recover(num_players, reconstruction_threshold, end, num_corrupt):
+    '''
+    Args:
+        num_players, the number of players to share across
+        reconstruction_threshold, the threshold for reconstruction
+        end, the number of shares to use in reconstruction
+        num_corrupt, the number of players that will corrupt their shares
+    Returns:
+        a tuple of the result of error-corrected reconstruction, the honest players and the corrupt players
+    '''
+    max_secret_length = len(secret)
+    players = test_authenticated_rss.get_ids(num_players)
+    robust_shares = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+
+    shares_subset = {player: share for (player, share) in list(robust_shares.items())[:end]}
+    corrupters = {player: rss._deserialize_robust_share(share) for player, share in list(shares_subset.items())[:num_corrupt]}
+    for player, share_dict in corrupters.items():
+        x, y = pairing.elegant_unpair(share_dict["share"])
+        share_dict["share"] = pairing.elegant_pair(x, y + 1)  # keep x so that the corruption is an error, not an erasure
+
+    shares = test_authenticated_rss.combine_testing_dictionaries(shares_subset, test_authenticated_rss.jsonify_dict(corrupters))
+    result = rss.reconstruct_error_corrected_secret(num_players, reconstruction_threshold, max_secret_length, shares)
+    return result, list(shares_subset.keys())[num_corrupt:], list(shares_subset.keys())[:num_corrupt]
+
+
+def test_all_honest():
+    num_players = 5
+    reconstruction_threshold = 3
+
+    (recovered_secret, valid_players, invalid_players), honest, dishonest = \
+        share_corrupt_and_recover(num_players, reconstruction_threshold, num_players, 0)
+    assert test_authenticated_rss.verify_results(recovered_secret, secret, valid_players, honest, invalid_players, dishonest)
+
+
+def test_min_shares():
+    num_players = 5
+    reconstruction_threshold = 3
+
+    (recovered_secret, valid_players, invalid_players), honest, dishonest = \
+        share_corrupt_and_recover(num_players, reconstruction_threshold, reconstruction_threshold, 0)
+    assert test_authenticated_rss.verify_results(recovered_secret, secret, valid_players, honest, invalid_players, dishonest)
+
+
+def test_dishonest_less_than_threshold():
+    reconstruction_threshold = 5
+    num_players = 3 * reconstruction_threshold - 2
+    num_corrupt = reconstruction_threshold - 1
+
+    (recovered_secret, valid_players, invalid_players), honest, dishonest = \
+        share_corrupt_and_recover(num_players, reconstruction_threshold, num_players, num_corrupt)
+    assert test_authenticated_rss.verify_results(recovered_secret, secret, valid_players, honest, invalid_players, dishonest)
+
+
+def test_large_committee():
+    reconstruction_threshold = 10
+    num_players = 3 * reconstruction_threshold + 1
+    num_corrupt = reconstruction_threshold
+
+    (recovered_secret, valid_players, invalid_players), honest, dishonest = \
+        share_corrupt_and_recover(num_players, reconstruction_threshold, num_players, num_corrupt)
+    assert test_authenticated_rss.verify_results(recovered_secret, secret, valid_players, honest, invalid_players, dishonest)
+
+
+def test_shares_without_authentication():
+    num_players = 7
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+
+    players = test_authenticated_rss.get_ids(num_players)
+    robust_shares = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+    shares = {player: '{"share": %d}' % rss._deserialize_robust_share(share)["share"] for player, share in robust_shares.items()}
+
+    recovered_secret, valid_players, invalid_players = \
+        rss.reconstruct_error_corrected_secret(num_players, reconstruction_threshold, max_secret_length, shares)
+    assert test_authenticated_rss.verify_results(recovered_secret, secret, valid_players, players, invalid_players, [])
+
+
+def test_structural_errors():
+    num_players = 7
+    reconstruction_threshold = 3
+    max_secret_length = len(secret)
+
+    players = test_authenticated_rss.get_ids(num_players)
+    shares = rss.share_authenticated_secret(players, reconstruction_threshold, max_secret_length, secret)
+    shares[players[0]] = shares[players[0]][1:]
+    shares[players[1]] = '{"share": -1}'
+    shares[players[2]] = '[1, 2]'
+
+    recovered_secret, valid_players, invalid_players = \
+        rss.reconstruct_error_corrected_secret(num_players, reconstruction_threshold, max_secret_length, shares)
+    assert test_authenticated_rss.verify_results(recovered_secret, secret, valid_players, players[3:], invalid_players, players[:3])
+
+
+def test_too_many_corrupt():
+    num_players = 7
+    reconstruction_threshold = 3
+
+    with pytest.raises(rss.FatalReconstructionFailure):
+        share_corrupt_and_recover(num_players, reconstruction_threshold, num_players, reconstruction_threshold)
@@ -0,0 +1,60 @@
+from timeit import default_timer
+
+
+class Tracer(dict):
+    '''
+    Records the work done by robust dealing and reconstruction when passed as their stats argument
+    Counters are held as the entries of the dictionary itself, exactly as in a plain stats dictionary,
+    and the wall time spent in each phase is accumulated in timings
+    '''
+
+    def __init__(self):
+        dict.__init__(self)
+        self.timings = {}
+
+    def phase(self, name):
+        '''
+        Args:
+            name, the name of the phase
+        Returns:
+            a context manager that adds the wall time spent inside it to timings[name]
+        '''
+        return _Phase(self, name)
+
+
+class _Phase(object):
+    def __init__(self, tracer, name):
+        self._tracer, self._name = tracer, name
+
+    def __enter__(self):
+        self._start = default_timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        timings = self._tracer.timings
+        timings[self._name] = timings.get(self._name, 0.0) + default_timer() - self._start
+        return False
+
+
+class _NullPhase(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()  # shared, so that tracing costs a single check when it is disabled
+
+
+def phase(stats, name):
+    '''
+    Args:
+        stats, None, a plain dictionary of counters or a Tracer
+        name, the name of the phase
+    Returns:
+        a context manager that times the phase if stats is a Tracer, and does nothing otherwise
+    '''
+    if isinstance(stats, Tracer):
+        return stats.phase(name)
+    return _NULL_PHASE
@@ -3,5 +3,11 @@ from setuptools import setup, find_packages
 setup(
     name="robustsecretsharing",
     version="0.1",
-    packages=find_packages()
+    packages=find_packages(),
+    extras_require={
+        "gmp": ["gmpy2"]
+    },
+    entry_points={
+        "console_scripts": ["rss = robustsecretsharing.cli:main"]
+    }
 )